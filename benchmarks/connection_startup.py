@@ -0,0 +1,60 @@
+"""
+Startup time of DBConnector.init with 1, 5 and 20 databases, till first query
+to one of them, eager (all clients created on init, or also connected with
+warm up) and lazy (client created on first use).
+
+    python -m benchmarks.connection_startup [repeat]
+
+Databases are sqlite files, connection cost of network databases is higher.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+
+from tortoise import connections
+
+from fastapi_manager import setup
+from fastapi_manager.conf import settings
+from fastapi_manager.db.connection import DBConnector
+from fastapi_manager.db.connection.clients import close_connections
+from fastapi_manager.db.connection.pool import warm_up_pools
+
+ALIASES = (1, 5, 20)
+MODES = ("eager", "eager + warm up", "lazy")
+
+
+async def startup(mode: str) -> float:
+    start = time.perf_counter()
+    await DBConnector.init(lazy=mode == "lazy")
+    if mode == "eager + warm up":
+        await warm_up_pools()
+    await connections.get("db0").execute_query("SELECT 1")
+    elapsed = time.perf_counter() - start
+
+    await close_connections()
+    connections._db_config = None
+    DBConnector._inited = False
+    return elapsed
+
+
+async def main(repeat: int) -> None:
+    await setup()
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'aliases':>8} " + " ".join(f"{mode:>16}" for mode in MODES))
+        for count in ALIASES:
+            settings.set(
+                "DATABASES",
+                {f"db{i}": f"sqlite://{directory}/db{i}.sqlite3" for i in range(count)},
+                merge=False,
+            )
+            timings = []
+            for mode in MODES:
+                best = min([await startup(mode) for _ in range(repeat)])
+                timings.append(f"{best * 1000:>13.2f} ms")
+            print(f"{count:>8} " + " ".join(timings))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,75 @@
+"""
+Get and update by primary key, queryset built for every call
+vs compiled statements of fastapi_manager.db.models.compiled.
+
+    python -m benchmarks.crud_queries [calls]
+"""
+
+import asyncio
+import sys
+import time
+
+from tortoise import Tortoise, connections
+
+from fastapi_manager.db import fields, models
+from fastapi_manager.db.returning import update_returning, update_returning_by_pk
+
+
+class Row(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField()
+
+    class Meta:
+        app = "benchmarks"
+        table = "row"
+
+
+async def init_orm() -> None:
+    await connections._init(
+        {
+            "default": {
+                "engine": "tortoise.backends.sqlite",
+                "credentials": {"file_path": ":memory:"},
+            }
+        },
+        False,
+    )
+    Tortoise._init_routers(None)
+    Tortoise.apps = {"benchmarks": {"Row": Row}}
+    Row._meta.default_connection = "default"
+    Tortoise._init_relations()
+    Tortoise._build_initial_querysets()
+    Tortoise._inited = True
+    await Tortoise.generate_schemas()
+
+
+async def measure(name: str, calls: int, action) -> None:
+    start = time.perf_counter()
+    for i in range(calls):
+        await action(i % 100 + 1)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>20}: {elapsed / calls * 1e6:8.1f} us/call")
+
+
+async def main(calls: int) -> None:
+    await init_orm()
+    try:
+        await Row.bulk_create([Row(name=f"row{i}", qty=i) for i in range(100)])
+        await measure("get queryset", calls, lambda pk: Row.filter(pk=pk).get())
+        await measure("get compiled", calls, lambda pk: Row.get(pk=pk))
+        await measure(
+            "update queryset",
+            calls,
+            lambda pk: update_returning(Row.filter(pk=pk), {"qty": pk}),
+        )
+        await measure(
+            "update compiled",
+            calls,
+            lambda pk: update_returning_by_pk(Row, pk, {"qty": pk}),
+        )
+    finally:
+        await connections.close_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
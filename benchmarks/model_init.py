@@ -0,0 +1,53 @@
+"""
+Time to construct model instances with Model.__init__.
+
+    python -m benchmarks.model_init [instances]
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi_manager.db import fields, models
+from benchmarks.model_memory import CompactRow, Row
+
+
+async def now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AsyncDefaultRow(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField(default=0)
+    price = fields.FloatField(default=0.0)
+    created_at = fields.DatetimeField(default=now)
+
+    class Meta:
+        app = "benchmarks"
+        table = "async_default_row"
+
+
+def measure(model, instances: int, **kwargs) -> float:
+    started = time.perf_counter()
+    for _ in range(instances):
+        model(**kwargs)
+    return time.perf_counter() - started
+
+
+def main(instances: int) -> None:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    cases = [
+        ("all fields", Row, {"qty": 1, "price": 1.0, "created_at": created_at}),
+        ("compact", CompactRow, {"qty": 1, "price": 1.0, "created_at": created_at}),
+        ("defaults", AsyncDefaultRow, {}),
+    ]
+    for label, model, kwargs in cases:
+        elapsed = measure(model, instances, id=1, name="name", **kwargs)
+        print(
+            f"{model.__name__:<16} {label:<10} {instances} instances: "
+            f"{elapsed:6.2f}s, {elapsed / instances * 1e6:5.2f} us/instance"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,92 @@
+"""
+Memory of model instances loaded from db rows, default and compact layout.
+
+    python -m benchmarks.model_memory [rows]
+"""
+
+import asyncio
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+
+from tortoise import Tortoise, connections
+
+from fastapi_manager.db import fields, models
+
+
+class Row(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField()
+    price = fields.FloatField()
+    created_at = fields.DatetimeField()
+
+    class Meta:
+        app = "benchmarks"
+        table = "row"
+
+
+class CompactRow(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField()
+    price = fields.FloatField()
+    created_at = fields.DatetimeField()
+
+    class Meta:
+        app = "benchmarks"
+        table = "compact_row"
+        compact = True
+
+
+MODELS = [Row, CompactRow]
+
+
+async def init_orm() -> None:
+    await connections._init(
+        {
+            "default": {
+                "engine": "tortoise.backends.sqlite",
+                "credentials": {"file_path": ":memory:"},
+            }
+        },
+        False,
+    )
+    Tortoise._init_routers(None)
+    Tortoise.apps = {"benchmarks": {model.__name__: model for model in MODELS}}
+    for model in MODELS:
+        model._meta.default_connection = "default"
+    Tortoise._init_relations()
+    Tortoise._build_initial_querysets()
+
+
+def measure(model, rows: int) -> int:
+    # values are shared between rows, so only instances are measured
+    row = {
+        "id": 1,
+        "name": "name",
+        "qty": 1,
+        "price": 1.0,
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+    tracemalloc.start()
+    instances = [model._init_from_db(**row) for _ in range(rows)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+async def main(rows: int) -> None:
+    await init_orm()
+    try:
+        for model in MODELS:
+            size = measure(model, rows)
+            print(
+                f"{model.__name__:<12} {rows} rows: {size / 2**20:8.2f} MiB, "
+                f"{size / rows:6.1f} B/row"
+            )
+    finally:
+        await connections.close_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,27 @@
+from .base import DEFAULT_TIMEOUT, BaseCache
+from .handler import CacheHandler, caches
+from .locmem import LocMemCache
+from .models import (
+    cache_key,
+    count_generation_key,
+    get_model_cache,
+    has_cached_counts,
+    invalidate,
+    invalidate_counts,
+    track_counts,
+)
+
+__all__ = [
+    "DEFAULT_TIMEOUT",
+    "BaseCache",
+    "CacheHandler",
+    "caches",
+    "LocMemCache",
+    "cache_key",
+    "count_generation_key",
+    "get_model_cache",
+    "has_cached_counts",
+    "invalidate",
+    "invalidate_counts",
+    "track_counts",
+]
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+# set() timeout to use backend default one, None means no expiration
+DEFAULT_TIMEOUT: Any = object()
+
+
+class BaseCache(ABC):
+    """
+    Async cache backend interface, values must be picklable
+    if backend keeps them out of process.
+
+    Backends count hits and misses of get() and entries evicted to respect size bounds.
+    """
+
+    def __init__(self, timeout: Optional[float] = 300, **options: Any):
+        # default time to live in seconds, None keeps entries until evicted
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    async def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,54 @@
+from typing import Dict
+
+from fastapi_manager.conf import settings
+from fastapi_manager.utils.module_loading import import_string
+
+from .base import BaseCache
+
+
+class CacheHandler:
+    """
+    Cache backends by alias from settings.CACHES, created on first access
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(CacheHandler, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "initialized"):
+            return
+        self.initialized = True
+
+        self._caches: Dict[str, BaseCache] = {}
+
+    def __getitem__(self, alias: str) -> BaseCache:
+        try:
+            return self._caches[alias]
+        except KeyError:
+            pass
+        try:
+            config = settings.CACHES[alias]
+        except KeyError:
+            raise KeyError(f"Cache '{alias}' is not configured in CACHES")
+        backend = import_string(config["backend"])
+        cache = self._caches[alias] = backend(**config.get("options", {}))
+        return cache
+
+    def __setitem__(self, alias: str, cache: BaseCache) -> None:
+        self._caches[alias] = cache
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {alias: cache.stats() for alias, cache in self._caches.items()}
+
+    def reset(self) -> None:
+        """
+        Forget created backends, next access builds them from settings again
+        """
+        self._caches.clear()
+
+
+caches = CacheHandler()
@@ -0,0 +1,54 @@
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from .base import DEFAULT_TIMEOUT, BaseCache
+
+
+class LocMemCache(BaseCache):
+    """
+    In process LRU cache with time to live.
+
+    Values are pickled, so every get() returns own copy
+    and cached model instances are not shared between requests.
+    """
+
+    def __init__(
+        self, timeout: Optional[float] = 300, max_size: int = 1000, **options: Any
+    ):
+        super().__init__(timeout, **options)
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return pickle.loads(value)
+
+    async def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        expires = time.monotonic() + timeout if timeout is not None else None
+        self._data[key] = (expires, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Type
+
+from .base import BaseCache
+from .handler import caches
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+def get_model_cache(model: Type["Model"]) -> Optional[BaseCache]:
+    """
+    Cache backend of model opted in with Meta.cache, True means "default" alias
+    """
+    alias = model._meta.cache
+    if not alias:
+        return None
+    return caches["default" if alias is True else alias]
+
+
+def cache_key(model: Type["Model"], pk: Any) -> str:
+    return f"{model.__module__}.{model.__qualname__}:{pk}"
+
+
+# aliases of caches which keep counts of model, see CachedCount
+_counted: Dict[type, Set[str]] = {}
+
+
+def count_generation_key(model: Type["Model"]) -> str:
+    return f"count:{model.__module__}.{model.__qualname__}"
+
+
+def track_counts(model: Type["Model"], alias: str) -> None:
+    _counted.setdefault(model, set()).add(alias)
+
+
+def has_cached_counts(model: Type["Model"]) -> bool:
+    return model in _counted
+
+
+async def invalidate_counts(model: Type["Model"]) -> None:
+    """
+    Replace generation of cached counts of model, e.g. after queryset update
+    or bulk create, which write rows without their pks
+    """
+    for alias in _counted.get(model, ()):
+        await caches[alias].delete(count_generation_key(model))
+
+
+async def invalidate(model: Type["Model"], *pks: Any) -> None:
+    cache = get_model_cache(model)
+    if cache is not None:
+        for pk in pks:
+            await cache.delete(cache_key(model, pk))
+    await invalidate_counts(model)
@@ -12,7 +12,8 @@ PROJECT_ROOT_PATH = ""
 # applications to populate in registry
 INSTALLED_APPS = []
 
-# database dict
+# database dict, connection config may list "replicas": [<url or config>, ...]
+# serving its reads, balanced by "balancer": "round_robin" or "least_outstanding"
 DATABASES = {
     "default": {
         "engine": "tortoise.backends.asyncpg",
@@ -26,5 +27,61 @@ DATABASES = {
     },
 }
 
+# pool of every connection, "pool" key in connection config overrides it,
+# None keeps driver default, options driver doesn't support are ignored with warning
+DATABASE_POOL = {
+    "minsize": 1,
+    "maxsize": 5,
+    # seconds unused connection stays open in pool
+    "max_idle": None,
+    # seconds after which connection is replaced
+    "max_lifetime": None,
+    # prepared statements cached per connection
+    "statement_cache_size": None,
+}
+# open all connections on startup, before app accepts requests
+DATABASE_POOL_WARM_UP = False
+
+# create client of each connection on its first use instead of on startup
+DATABASE_LAZY_CONNECT = False
+
+# connection alias by app label, apps not listed use "default"
+DATABASE_APPS = {}
+
+# routers consulted by Model._choose_db, dotted paths, first returned alias wins
+DATABASE_ROUTERS = ["fastapi_manager.db.routers.ReplicaRouter"]
+
 
 TIMEZONE = "UTC"
+
+# pagination of list endpoints, dotted path to class or None to return all rows
+DEFAULT_PAGINATION_CLASS = "fastapi_manager.pagination.CursorPagination"
+# rows per page if client not set ?limit=, and upper bound for ?limit=
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# total of paginated lists, see fastapi_manager.pagination.counts:
+# HasMore (no total), ExactCount, CachedCount or EstimatedCount
+DEFAULT_COUNT_STRATEGY = "fastapi_manager.pagination.HasMore"
+
+# rows fetched from database per chunk when list is streamed
+STREAM_CHUNK_SIZE = 1000
+
+# dedupe loads by pk in one request, Model.get(pk=...) returns the same instance
+IDENTITY_MAP = True
+
+# with DEBUG, log requests which ran the same statement more times than this, 0 disables
+N_PLUS_ONE_THRESHOLD = 10
+
+# rows per INSERT/UPDATE statement of bulk endpoints
+BULK_BATCH_SIZE = 1000
+
+# batch signal listeners (and instances of each_instance adapter) run at once, 0 no limit
+SIGNAL_CONCURRENCY = 10
+
+# cache backends by alias, models opt in with Meta.cache = True or "<alias>"
+CACHES = {
+    "default": {
+        "backend": "fastapi_manager.cache.LocMemCache",
+        "options": {"max_size": 1000, "timeout": 300},
+    },
+}
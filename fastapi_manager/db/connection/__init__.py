@@ -1,3 +1,4 @@
 from .base import DBConnector, register_orm
+from .pool import pool_stats
 
-__all__ = ["DBConnector", "register_orm"]
+__all__ = ["DBConnector", "register_orm", "pool_stats"]
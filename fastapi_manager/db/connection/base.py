@@ -1,11 +1,19 @@
+import logging
 from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple, Union
 from fastapi import FastAPI
+from pypika import Table
 from tortoise import Tortoise, ConfigurationError, expand_db_url
 from tortoise.contrib.fastapi import RegisterTortoise
 from tortoise.log import logger
 from tortoise.connection import connections
 from fastapi_manager.apps import apps
 from fastapi_manager.conf import settings
+from fastapi_manager.db.querylog import record_queries
+from fastapi_manager.db.routers import ROUND_ROBIN, ReplicaSet, configure_replicas
+from .clients import close_connections, get_client_class, init_lazy
+from .pool import apply_pool_options, pool_stats, warm_up_pools
+from fastapi_manager.schemas import schemas
 
 
 class DBConnector(Tortoise):
@@ -14,63 +22,138 @@ class DBConnector(Tortoise):
     async def init(
         cls,
         _create_db: bool = False,
+        lazy: Optional[bool] = None,
         **kwargs,
     ) -> None:
-
+        """
+        With lazy (DATABASE_LAZY_CONNECT by default) client of each connection
+        is created on its first use, e.g. _choose_db or _meta.db,
+        so startup cost doesn't grow with number of databases
+        """
         if cls._inited:
-            await connections.close_all(discard=True)
+            await close_connections()
 
-        connections_config = {}
-        for conf_key, conf_val in settings.DATABASES.items():
-            if isinstance(conf_val, str):
-                connections_config[conf_key] = expand_db_url(conf_val)
-            elif isinstance(conf_val, dict):
-                connections_config[conf_key] = conf_val
-            else:
-                raise ConfigurationError("Config must be str or dict")
+        connections_config, replicas = cls._get_connections_config(
+            settings.DATABASES, settings.DATABASE_POOL
+        )
 
         timezone = settings.TIMEZONE
         use_tz = bool(timezone)
 
-        # Mask passwords in logs output
-        passwords = []
-        for name, info in connections_config.items():
-            if isinstance(info, str):
-                info = expand_db_url(info)
-            password = info.get("credentials", {}).get("password")
-            if password:
-                passwords.append(password)
-
-        str_connection_config = str(connections_config)
-        for password in passwords:
-            str_connection_config = str_connection_config.replace(
-                password,
-                # Show one third of the password at beginning (may be better for debugging purposes)
-                f"{password[0:len(password) // 3]}***",
+        if logger.isEnabledFor(logging.DEBUG):
+            # Mask passwords in logs output
+            passwords = []
+            for name, info in connections_config.items():
+                if isinstance(info, str):
+                    info = expand_db_url(info)
+                password = info.get("credentials", {}).get("password")
+                if password:
+                    passwords.append(password)
+
+            str_connection_config = str(connections_config)
+            for password in passwords:
+                str_connection_config = str_connection_config.replace(
+                    password,
+                    # Show one third of the password at beginning (may be better for debugging purposes)
+                    f"{password[0:len(password) // 3]}***",
+                )
+
+            logger.debug(
+                "Tortoise-ORM startup\n    connections: %s\n    apps: %s",
+                str_connection_config,
+                str(cls.apps.values()),
             )
 
-        logger.debug(
-            "Tortoise-ORM startup\n    connections: %s\n    apps: %s",
-            str_connection_config,
-            str(cls.apps.values()),
-        )
-
         cls._init_timezone(use_tz, timezone)
-        await connections._init(connections_config, _create_db)
+        lazy = settings.DATABASE_LAZY_CONNECT if lazy is None else lazy
+        if _create_db or not lazy:
+            await connections._init(connections_config, _create_db)
+        else:
+            init_lazy(connections_config)
+        if settings.DEBUG:
+            for alias in connections_config:
+                record_queries(get_client_class(alias))
+        configure_replicas(replicas)
+        cls._init_routers(settings.DATABASE_ROUTERS)
         cls._init_apps()
         cls._inited = True
 
+    @staticmethod
+    def _get_connections_config(
+        databases: Dict[str, Union[str, dict]], pool: Optional[dict] = None
+    ) -> Tuple[Dict[str, dict], Dict[str, ReplicaSet]]:
+        """
+        Tortoise connections config and replica sets by primary alias,
+        replicas of "<alias>" get "<alias>_replica_<n>" aliases.
+        Pool options apply to all connections, "pool" key of connection config
+        overrides them for connection and its replicas.
+        """
+        pool = dict(pool or {})
+        connections_config = {}
+        replicas = {}
+        for conf_key, conf_val in databases.items():
+            if isinstance(conf_val, str):
+                connections_config[conf_key] = expand_db_url(conf_val)
+                apply_pool_options(connections_config[conf_key], pool)
+            elif isinstance(conf_val, dict):
+                conf_val = dict(conf_val)
+                replica_confs = conf_val.pop("replicas", None) or []
+                balancer = conf_val.pop("balancer", ROUND_ROBIN)
+                conf_pool = {**pool, **conf_val.pop("pool", {})}
+                conf_val["credentials"] = dict(conf_val.get("credentials", {}))
+                apply_pool_options(conf_val, conf_pool)
+                connections_config[conf_key] = conf_val
+                if not replica_confs:
+                    continue
+                aliases = []
+                for i, replica_conf in enumerate(replica_confs):
+                    if isinstance(replica_conf, str):
+                        replica_conf = expand_db_url(replica_conf)
+                    elif not isinstance(replica_conf, dict):
+                        raise ConfigurationError("Replica config must be str or dict")
+                    alias = f"{conf_key}_replica_{i}"
+                    replica_conf = dict(replica_conf)
+                    replica_conf["credentials"] = dict(
+                        replica_conf.get("credentials", {})
+                    )
+                    apply_pool_options(replica_conf, conf_pool)
+                    connections_config[alias] = replica_conf
+                    aliases.append(alias)
+                replicas[conf_key] = ReplicaSet(aliases, balancer)
+            else:
+                raise ConfigurationError("Config must be str or dict")
+        return connections_config, replicas
+
     @classmethod
     def _init_apps(cls, *args) -> None:
+        # schemas built before init miss relations
+        schemas.clear()
+        database_apps = settings.DATABASE_APPS
         for app_config in apps.get_app_configs():
             cls.apps[app_config.label] = app_config.models
 
+            connection = database_apps.get(app_config.label, "default")
+            if connection not in connections.db_config:
+                raise ConfigurationError(
+                    f"Unknown connection {connection!r} of app {app_config.label!r}"
+                )
             for model in app_config.get_models():
-                model._meta.default_connection = "default"
+                model._meta.default_connection = connection
 
         cls._init_relations()
         cls._build_initial_querysets()
 
+    @classmethod
+    def _build_initial_querysets(cls) -> None:
+        # query class is taken from client class, so clients aren't created here
+        for app in cls.apps.values():
+            for model in app.values():
+                meta = model._meta
+                meta.finalise_model()
+                meta.basetable = Table(name=meta.db_table, schema=meta.schema)
+                meta.basequery = meta.db_class.query_class.from_(meta.basetable)
+                meta.basequery_all_fields = meta.basequery.select(*meta.db_fields)
+
 
 class RegisterORM(RegisterTortoise):
 
@@ -85,16 +168,25 @@ class RegisterORM(RegisterTortoise):
             logger.info("Tortoise-ORM generating schema")
             await DBConnector.generate_schemas()
 
+    async def warm_up(self) -> None:
+        await warm_up_pools()
+        logger.info("Tortoise-ORM connections opened, pools: %s", pool_stats())
+
     @staticmethod
     async def close_orm() -> None:  # pylint: disable=W0612
-        await connections.close_all()
+        await close_connections()
         logger.info("Tortoise-ORM shutdown")
 
 
 @asynccontextmanager
-async def register_orm(app: FastAPI):
-
+async def register_orm(app: FastAPI, warm_up: Optional[bool] = None):
+    """
+    ORM lifespan, with warm_up (DATABASE_POOL_WARM_UP by default) app is ready
+    only after all connections and their pools' minsize connections are open
+    """
     orm = RegisterORM(app, generate_schemas=False)
     await orm.init_orm()
+    if settings.DATABASE_POOL_WARM_UP if warm_up is None else warm_up:
+        await orm.warm_up()
     yield
     await orm.close_orm()
@@ -0,0 +1,38 @@
+import asyncio
+from typing import Type
+
+from tortoise import expand_db_url
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.connection import connections
+
+
+def get_client_class(alias: str) -> Type[BaseDBAsyncClient]:
+    """
+    Client class of connection alias from its config, without creating the client
+    """
+    db_info = connections._get_db_info(alias)
+    if isinstance(db_info, str):
+        db_info = expand_db_url(db_info)
+    return connections._discover_client_class(db_info.get("engine", ""))
+
+
+def init_lazy(connections_config: dict) -> None:
+    """
+    Set connections config without creating clients, client of each alias
+    is created on its first connections.get(), its pool on first query
+    """
+    if connections._db_config is None:
+        connections._db_config = connections_config
+    else:
+        connections._db_config.update(connections_config)
+    connections._create_db = False
+
+
+async def close_connections() -> None:
+    """
+    Close and discard clients created so far, unlike connections.close_all()
+    which creates client of every alias to close it
+    """
+    storage = connections._get_storage()
+    await asyncio.gather(*(client.close() for client in storage.values()))
+    storage.clear()
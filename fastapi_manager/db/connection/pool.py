@@ -0,0 +1,139 @@
+import asyncio
+from numbers import Real
+from typing import Any, Dict, Optional
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.connection import connections
+from tortoise.exceptions import ConfigurationError
+from tortoise.log import logger
+
+POOL_OPTIONS = (
+    "minsize",
+    "maxsize",
+    "max_idle",
+    "max_lifetime",
+    "statement_cache_size",
+)
+
+# driver argument of each pool option by engine, missing option is not supported
+ENGINE_POOL_ARGUMENTS = {
+    "tortoise.backends.asyncpg": {
+        "minsize": "minsize",
+        "maxsize": "maxsize",
+        "max_idle": "max_inactive_connection_lifetime",
+        "statement_cache_size": "statement_cache_size",
+    },
+    "tortoise.backends.psycopg": {
+        "minsize": "minsize",
+        "maxsize": "maxsize",
+        "max_idle": "max_idle",
+        "max_lifetime": "max_lifetime",
+    },
+    "tortoise.backends.mysql": {
+        "minsize": "minsize",
+        "maxsize": "maxsize",
+        "max_lifetime": "pool_recycle",
+    },
+}
+
+
+def validate_pool_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    unknown = set(options) - set(POOL_OPTIONS)
+    if unknown:
+        raise ConfigurationError(
+            f"Unknown pool options {sorted(unknown)}, expected {POOL_OPTIONS}"
+        )
+    for name, value in options.items():
+        if value is None:
+            continue
+        if name in ("max_idle", "max_lifetime"):
+            if not isinstance(value, Real) or isinstance(value, bool) or value <= 0:
+                raise ConfigurationError(
+                    f"Pool option {name} must be positive number of seconds or None"
+                )
+        elif not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ConfigurationError(
+                f"Pool option {name} must be non negative int or None"
+            )
+    minsize, maxsize = options.get("minsize"), options.get("maxsize")
+    if maxsize is not None and maxsize < 1:
+        raise ConfigurationError("Pool option maxsize must be at least 1")
+    if minsize is not None and maxsize is not None and minsize > maxsize:
+        raise ConfigurationError(
+            f"Pool option minsize ({minsize}) is bigger than maxsize ({maxsize})"
+        )
+    return options
+
+
+def apply_pool_options(config: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """
+    Set validated pool options as driver arguments in connection credentials,
+    arguments already set there (e.g. from db url) are kept
+    """
+    validate_pool_options(options)
+    arguments = ENGINE_POOL_ARGUMENTS.get(config.get("engine"))
+    if arguments is None:
+        # sqlite and others without pool
+        return
+    credentials = config.setdefault("credentials", {})
+    for name, value in options.items():
+        if value is None:
+            continue
+        if name not in arguments:
+            logger.warning(
+                "Pool option %s is not supported by %s, ignored",
+                name,
+                config["engine"],
+            )
+            continue
+        credentials.setdefault(arguments[name], value)
+
+
+async def _open(client: BaseDBAsyncClient) -> None:
+    async with client.acquire_connection():
+        pass
+
+
+async def warm_up_pools() -> None:
+    """
+    Open all connections, pools are created with their minsize connections
+    """
+    await asyncio.gather(*(_open(client) for client in connections.all()))
+
+
+def get_pool_stats(client: BaseDBAsyncClient) -> Optional[Dict[str, int]]:
+    """
+    Size, in use, idle and waiting acquires of client pool,
+    None if it's not created yet or client has no pool
+    """
+    pool = getattr(client, "_pool", None)
+    if pool is None:
+        return None
+    if hasattr(pool, "get_idle_size"):
+        # asyncpg
+        size, idle = pool.get_size(), pool.get_idle_size()
+        waiting = len(getattr(pool._queue, "_getters", ()))
+    elif hasattr(pool, "get_stats"):
+        # psycopg_pool
+        stats = pool.get_stats()
+        size, idle = stats.get("pool_size", 0), stats.get("pool_available", 0)
+        waiting = stats.get("requests_waiting", 0)
+    elif hasattr(pool, "freesize"):
+        # aiomysql, asyncmy
+        size, idle = pool.size, pool.freesize
+        waiting = len(getattr(pool._cond, "_waiters", None) or ())
+    else:
+        return None
+    return {"size": size, "in_use": size - idle, "idle": idle, "waiting": waiting}
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Pool numbers by connection alias, metrics hook for exporters
+    """
+    stats = {}
+    for alias in connections.db_config:
+        pool = get_pool_stats(connections.get(alias))
+        if pool is not None:
+            stats[alias] = pool
+    return stats
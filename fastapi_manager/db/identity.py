@@ -0,0 +1,199 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from tortoise.backends.base.client import BaseTransactionWrapper
+from tortoise.exceptions import DoesNotExist
+from tortoise.queryset import QuerySetSingle
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+_current: ContextVar[Optional["IdentityMap"]] = ContextVar("identity_map", default=None)
+
+
+class IdentityMap:
+    """
+    Instances loaded by primary key during one request.
+
+    Entry is a task while row is loading, so concurrent loads
+    of the same pk await single query.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[type, Any], Union["Model", asyncio.Future]] = {}
+        self.hits = 0
+        self.coalesced = 0
+
+    def add(self, instance: "Model") -> None:
+        self._entries[(type(instance), instance.pk)] = instance
+
+    def discard(self, model: Type["Model"], pk: Any) -> None:
+        self._entries.pop((model, pk), None)
+
+    def discard_model(self, model: Type["Model"]) -> None:
+        for key in [key for key in self._entries if key[0] is model]:
+            del self._entries[key]
+
+    async def load(
+        self, model: Type["Model"], pk: Any, loader: Awaitable["Model"]
+    ) -> "Model":
+        key = (model, pk)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = asyncio.ensure_future(loader)
+        elif isinstance(entry, asyncio.Future):
+            self.coalesced += 1
+        else:
+            self.hits += 1
+            return entry
+
+        try:
+            # shield: cancelled request must not cancel load awaited by others
+            instance = await asyncio.shield(entry)
+        except BaseException:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            raise
+        self._entries[key] = instance
+        return instance
+
+    async def load_bulk(
+        self,
+        model: Type["Model"],
+        pks: Iterable[Any],
+        loader: Callable[[list], Awaitable[Dict[Any, "Model"]]],
+    ) -> Dict[Any, "Model"]:
+        result = {}
+        missing = []
+        for pk in pks:
+            entry = self._entries.get((model, pk))
+            if entry is None:
+                missing.append(pk)
+            elif isinstance(entry, asyncio.Future):
+                self.coalesced += 1
+                try:
+                    result[pk] = await asyncio.shield(entry)
+                except DoesNotExist:
+                    pass
+            else:
+                self.hits += 1
+                result[pk] = entry
+        if missing:
+            loaded = await loader(missing)
+            for instance in loaded.values():
+                self.add(instance)
+            result.update(loaded)
+        return result
+
+
+class IdentityLookup:
+    """
+    Awaitable returned by Model.get(pk=...) while identity map is active,
+    any queryset method called on it returns plain queryset which skips the map,
+    e.g. .select_for_update() or .only()
+    """
+
+    __slots__ = ("queryset", "identity_map", "model", "pk")
+
+    def __init__(
+        self,
+        queryset: QuerySetSingle,
+        identity_map: IdentityMap,
+        model: Type["Model"],
+        pk: Any,
+    ):
+        self.queryset = queryset
+        self.identity_map = identity_map
+        self.model = model
+        self.pk = pk
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.queryset, name)
+
+    def __await__(self):
+        return self.identity_map.load(self.model, self.pk, self.queryset).__await__()
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    return _current.get()
+
+
+def get_identity_map(model: Type["Model"]) -> Optional[IdentityMap]:
+    """
+    Identity map of current request, None outside of request or inside transaction
+    (including select_for_update ones), where rows must be read from database
+    """
+    identity_map = current_identity_map()
+    # not _choose_db(True), write routing marks request as written
+    if identity_map is None or isinstance(model._meta.db, BaseTransactionWrapper):
+        return None
+    return identity_map
+
+
+def get_pk(model: Type["Model"], args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """
+    Primary key value if lookup is by primary key only, None otherwise
+    """
+    if args or len(kwargs) != 1:
+        return None
+    key, value = next(iter(kwargs.items()))
+    meta = model._meta
+    if key not in ("pk", meta.pk_attr) or value is None:
+        return None
+    try:
+        return meta.pk.to_python_value(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def remember(instance: "Model") -> None:
+    """
+    Put saved instance to current map, so next loads by pk return it
+    """
+    identity_map = get_identity_map(type(instance))
+    if identity_map is not None:
+        identity_map.add(instance)
+
+
+def forget(model: Type["Model"], *pks: Any) -> None:
+    """
+    Drop rows changed or deleted without their loaded instance from current map
+    """
+    identity_map = _current.get()
+    if identity_map is not None:
+        for pk in pks:
+            identity_map.discard(model, pk)
+
+
+def forget_all(model: Type["Model"]) -> None:
+    """
+    Drop all rows of model from current map, e.g. after queryset update
+    or delete, whose matched rows are not known without one more query
+    """
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map.discard_model(model)
+
+
+@contextmanager
+def identity_map() -> Iterator[IdentityMap]:
+    token = _current.set(IdentityMap())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
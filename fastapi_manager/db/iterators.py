@@ -0,0 +1,94 @@
+from functools import reduce
+from typing import AsyncIterator, List, Tuple
+
+from tortoise.backends.asyncpg import AsyncpgDBClient
+from tortoise.exceptions import ConfigurationError
+from tortoise.queryset import Q, QuerySet
+
+from fastapi_manager.db.models.meta import MODEL
+
+
+async def iterate_chunks(
+    queryset: QuerySet[MODEL], chunk_size: int
+) -> AsyncIterator[List[MODEL]]:
+    """
+    Iterate over queryset by lists of at most chunk_size instances,
+    without loading the whole result set in memory.
+
+    On asyncpg server side cursor is used, on other backends rows are fetched
+    by keyset windows of queryset ordering (or Meta.ordering) with primary key
+    appended, e.g. WHERE rank < last OR (rank = last AND id < last_id)
+    ORDER BY rank DESC, id DESC LIMIT chunk_size. Both keep queryset ordering,
+    windows need it to be by not nullable fields of the model itself.
+
+    Rows are built with Model._init_from_db, so select_related, prefetch_related
+    and annotations of the queryset are not applied.
+    """
+    db = queryset._choose_db()
+    if isinstance(db, AsyncpgDBClient):
+        iterator = _iterate_cursor(queryset, db, chunk_size)
+    else:
+        iterator = _iterate_windows(queryset, chunk_size)
+    async for chunk in iterator:
+        yield chunk
+
+
+async def _iterate_cursor(
+    queryset: QuerySet[MODEL], db: AsyncpgDBClient, chunk_size: int
+) -> AsyncIterator[List[MODEL]]:
+    init_from_db = queryset.model._init_from_db
+    sql = queryset.sql()
+    async with db.acquire_connection() as connection:
+        # postgres cursors live only inside transaction
+        async with connection.transaction():
+            cursor = await connection.cursor(sql)
+            while chunk := await cursor.fetch(chunk_size):
+                yield [init_from_db(**row) for row in chunk]
+
+
+def keyset_filter(
+    ordering: Tuple[Tuple[str, bool], ...], position: list, reverse: bool = False
+) -> Q:
+    """
+    (a > x) OR (a = x AND b > y) OR ... for every (name, desc) of ordering
+    """
+    conditions = []
+    for idx, (name, desc) in enumerate(ordering):
+        lookup = "lt" if desc is not reverse else "gt"
+        equal = {n: v for (n, _), v in zip(ordering[:idx], position[:idx])}
+        conditions.append(Q(**equal, **{f"{name}__{lookup}": position[idx]}))
+    return reduce(lambda a, b: a | b, conditions)
+
+
+def _window_ordering(queryset: QuerySet) -> Tuple[Tuple[str, bool], ...]:
+    meta = queryset.model._meta
+    ordering = [
+        (meta.pk_attr if name == "pk" else name, order.value.upper() == "DESC")
+        for name, order in queryset._orderings or meta.ordering
+    ]
+    for name, _ in ordering:
+        if name not in meta.fields_map or name in meta.fetch_fields:
+            raise ConfigurationError(
+                f"Can't iterate {meta.full_name} by windows ordered by '{name}', "
+                "only fields of the model itself are supported"
+            )
+    # primary key makes order strict, so window starts right after last row
+    if meta.pk_attr not in {name for name, _ in ordering}:
+        ordering.append((meta.pk_attr, ordering[-1][1] if ordering else False))
+    return tuple(ordering)
+
+
+async def _iterate_windows(
+    queryset: QuerySet[MODEL], chunk_size: int
+) -> AsyncIterator[List[MODEL]]:
+    ordering = _window_ordering(queryset)
+    queryset = queryset.order_by(
+        *(f"-{name}" if desc else name for name, desc in ordering)
+    )
+    window = queryset.limit(chunk_size)
+    while chunk := await window:
+        yield chunk
+        if len(chunk) < chunk_size:
+            break
+        position = [getattr(chunk[-1], name) for name, _ in ordering]
+        window = queryset.filter(keyset_filter(ordering, position)).limit(chunk_size)
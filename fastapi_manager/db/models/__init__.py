@@ -1,5 +1,6 @@
+from .defaults import BatchDefault
 from .model import Model, PK
 from .mixins import *
 
 
-__all__ = ["Model", "TimestampMixin", "PK"]
+__all__ = ["Model", "TimestampMixin", "PK", "BatchDefault"]
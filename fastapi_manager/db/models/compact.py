@@ -0,0 +1,74 @@
+from typing import Any, Dict, Iterable, Tuple
+
+from tortoise.fields.base import Field
+from tortoise.fields.relational import (
+    ForeignKeyFieldInstance,
+    ManyToManyFieldInstance,
+    OneToOneFieldInstance,
+)
+
+# instance bookkeeping kept as bits of single int in compact layout
+FLAGS_ATTR = "_flags"
+FLAGS = {
+    "_partial": 1,
+    "_saved_in_db": 2,
+    "_custom_generated_pk": 4,
+}
+
+
+def flags_value(**values: bool) -> int:
+    return sum(bit for name, bit in FLAGS.items() if values.get(name))
+
+
+def _flag_property(bit: int) -> property:
+    def getter(self: Any) -> bool:
+        return bool(getattr(self, FLAGS_ATTR, 0) & bit)
+
+    def setter(self: Any, value: bool) -> None:
+        flags = getattr(self, FLAGS_ATTR, 0)
+        object.__setattr__(self, FLAGS_ATTR, flags | bit if value else flags & ~bit)
+
+    return property(getter, setter)
+
+
+def get_compact_slots(
+    fields_map: Dict[str, Field], bases: Iterable[type]
+) -> Tuple[str, ...]:
+    """
+    Slots for model fields, relation caches and bookkeeping which are not
+    already declared by bases. Model mixins should declare empty __slots__,
+    otherwise instances get __dict__ from them anyway.
+
+    Relation fields themselves are properties set on ORM init, their values
+    are cached in "_<name>" attribute. __dict__ is kept for attributes unknown
+    on class creation (backward relations, annotations), python allocates it
+    only when such attribute is set.
+    """
+    mro = {klass for base in bases for klass in base.__mro__} - {object}
+    declared = {slot for klass in mro for slot in klass.__dict__.get("__slots__", ())}
+    # any base without __slots__ already gives instances __dict__
+    if any("__slots__" not in klass.__dict__ for klass in mro):
+        declared.add("__dict__")
+
+    slots = [FLAGS_ATTR, "_await_when_save", "__dict__"]
+    for name, field in fields_map.items():
+        if isinstance(field, (ForeignKeyFieldInstance, OneToOneFieldInstance)):
+            # "<name>_id" field is added on ORM init
+            slots += [f"_{name}", f"{name}_id"]
+        elif isinstance(field, ManyToManyFieldInstance):
+            slots.append(f"_{name}")
+        else:
+            slots.append(name)
+    return tuple(slot for slot in slots if slot not in declared)
+
+
+def get_compact_attrs(
+    fields_map: Dict[str, Field], bases: Iterable[type]
+) -> Dict[str, Any]:
+    """
+    Class attributes for Meta.compact models: __slots__ and bookkeeping properties
+    """
+    return {
+        "__slots__": get_compact_slots(fields_map, bases),
+        **{name: _flag_property(bit) for name, bit in FLAGS.items()},
+    }
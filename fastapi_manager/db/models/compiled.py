@@ -0,0 +1,164 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type
+
+from pypika.terms import Function, Term
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import DoesNotExist
+
+if TYPE_CHECKING:
+    from .model import Model
+
+
+class CompiledQueries:
+    """
+    SQL of statements by primary key of one model for one client class,
+    built once from MetaInfo.basequery and field lists. Values are passed
+    as positional parameters, so SQL text is the same for every call and
+    asyncpg reuses prepared statement from statement cache of connection.
+
+    Insert, update and delete of Model.save()/.delete() are cached
+    by tortoise executor already, these are for loads and writes by pk.
+    """
+
+    __slots__ = (
+        "model",
+        "select_by_pk",
+        "delete_by_pk",
+        "column_map",
+        "upserts",
+        "_updates",
+    )
+
+    def __init__(self, model: Type["Model"], db: BaseDBAsyncClient):
+        meta = model._meta
+        executor = db.executor_class(model=model, db=db)
+        self.model = model
+        self.select_by_pk = str(
+            meta.basequery_all_fields.where(
+                meta.basetable[meta.db_pk_column] == executor.parameter(0)
+            )
+        )
+        self.delete_by_pk = executor.delete_query
+        # to_db_value of fields with overrides of db executor
+        self.column_map = executor.column_map
+        self._updates: Dict[Tuple[str, ...], str] = {}
+        # INSERT ... ON CONFLICT of upsert.py by columns, targets and updates
+        self.upserts: Dict[tuple, str] = {}
+
+    def update_by_pk(self, fields: Tuple[str, ...], db: BaseDBAsyncClient) -> str:
+        """
+        UPDATE of given fields, parameters are field values in the same order and pk
+        """
+        try:
+            return self._updates[fields]
+        except KeyError:
+            executor = db.executor_class(model=self.model, db=db)
+            sql = self._updates[fields] = executor.get_update_sql(fields, None)
+            return sql
+
+
+def get_compiled(model: Type["Model"], db: BaseDBAsyncClient) -> CompiledQueries:
+    compiled = model._meta.compiled_queries
+    try:
+        return compiled[db.executor_class]
+    except KeyError:
+        queries = compiled[db.executor_class] = CompiledQueries(model, db)
+        return queries
+
+
+def get_update_fields(
+    model: Type["Model"], data: Dict[str, Any]
+) -> Optional[Tuple[str, ...]]:
+    """
+    Sorted fields of data if all of them are plain db fields with plain values,
+    None if update needs queryset (relations, expressions)
+    """
+    meta = model._meta
+    for key, value in data.items():
+        if (
+            key not in meta.fields_db_projection
+            or key == meta.pk_attr
+            or isinstance(value, (Term, Function))
+        ):
+            return None
+    return tuple(sorted(data))
+
+
+async def get_by_pk(model: Type["Model"], pk: Any, db: BaseDBAsyncClient) -> "Model":
+    meta = model._meta
+    _, rows = await db.execute_query(
+        get_compiled(model, db).select_by_pk, [meta.pk.to_db_value(pk, model)]
+    )
+    if not rows:
+        raise DoesNotExist(model)
+    return model._init_from_db(**rows[0])
+
+
+async def update_by_pk(
+    model: Type["Model"],
+    pk: Any,
+    fields: Tuple[str, ...],
+    data: Dict[str, Any],
+    db: BaseDBAsyncClient,
+    returning: bool = False,
+) -> Any:
+    """
+    Update row by pk, fields are from get_update_fields(model, data).
+    With returning rows of UPDATE ... RETURNING *, otherwise count of updated rows
+    """
+    meta = model._meta
+    compiled = get_compiled(model, db)
+    sql = compiled.update_by_pk(fields, db)
+    values = [compiled.column_map[field](data[field], None) for field in fields]
+    values.append(meta.pk.to_db_value(pk, model))
+    if returning:
+        _, rows = await db.execute_query(f"{sql} RETURNING *", values)
+        return rows
+    count, _ = await db.execute_query(sql, values)
+    return count
+
+
+async def delete_by_pk(
+    model: Type["Model"], pk: Any, db: BaseDBAsyncClient, returning: bool = False
+) -> Any:
+    """
+    Delete row by pk, with returning rows of DELETE ... RETURNING *,
+    otherwise count of deleted rows
+    """
+    sql = get_compiled(model, db).delete_by_pk
+    values = [model._meta.pk.to_db_value(pk, model)]
+    if returning:
+        _, rows = await db.execute_query(f"{sql} RETURNING *", values)
+        return rows
+    count, _ = await db.execute_query(sql, values)
+    return count
+
+
+class PkLookup:
+    """
+    Awaitable returned by Model.get(pk=...), loads row with compiled select,
+    any queryset method called on it returns plain queryset, e.g. .only()
+    """
+
+    __slots__ = ("model", "pk", "using_db", "args", "kwargs")
+
+    def __init__(
+        self,
+        model: Type["Model"],
+        pk: Any,
+        using_db: Optional[BaseDBAsyncClient],
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ):
+        self.model = model
+        self.pk = pk
+        self.using_db = using_db
+        self.args = args
+        self.kwargs = kwargs
+
+    def __getattr__(self, name: str) -> Any:
+        queryset = self.model._db_queryset(self.using_db).get(*self.args, **self.kwargs)
+        return getattr(queryset, name)
+
+    def __await__(self):
+        db = self.model._query_db(self.using_db)
+        return get_by_pk(self.model, self.pk, db).__await__()
@@ -0,0 +1,93 @@
+import asyncio
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from .model import Model
+
+
+class BatchDefault:
+    """
+    Async field default which makes values for many instances in one call,
+    e.g. numbers allocated from a sequence service:
+
+        async def allocate_numbers(count: int) -> List[int]:
+            ...
+
+        number = fields.BigIntField(default=BatchDefault(allocate_numbers))
+
+    Instance saved alone gets value of call with count 1,
+    bulk_create and bulk_update make one call for all their instances.
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[int], Awaitable[Sequence[Any]]]):
+        self.func = func
+
+    async def __call__(self) -> Any:
+        return (await self.many(1))[0]
+
+    async def many(self, count: int) -> Sequence[Any]:
+        values = await self.func(count)
+        if len(values) != count:
+            raise ValueError(
+                f"{self.func.__qualname__} returned {len(values)} values, expected {count}"
+            )
+        return values
+
+
+def is_async_default(default: Any) -> bool:
+    return inspect.iscoroutinefunction(default) or isinstance(default, BatchDefault)
+
+
+async def resolve_async_defaults(instances: Iterable["Model"]) -> None:
+    """
+    Await pending async defaults of instances concurrently,
+    each BatchDefault is called once for all instances waiting for it
+    """
+    pending: List["Model"] = []
+    targets: Dict[Callable, List[Tuple["Model", str]]] = {}
+    for instance in instances:
+        await_when_save = getattr(instance, "_await_when_save", None)
+        if await_when_save is None:
+            continue
+        pending.append(instance)
+        for key, default in await_when_save.items():
+            targets.setdefault(default, []).append((instance, key))
+    if not pending:
+        return
+
+    groups: List[List[Tuple["Model", str]]] = []
+    awaitables: List[Awaitable[Sequence[Any]]] = []
+    for default, group in targets.items():
+        if isinstance(default, BatchDefault):
+            groups.append(group)
+            awaitables.append(default.many(len(group)))
+        else:
+            for target in group:
+                groups.append([target])
+                awaitables.append(_one(default))
+
+    # values are set only when all defaults resolved, failed save can be retried
+    results = await asyncio.gather(*awaitables)
+    for group, values in zip(groups, results):
+        for (instance, key), value in zip(group, values):
+            object.__setattr__(instance, key, value)
+    for instance in pending:
+        del instance._await_when_save
+
+
+async def _one(default: Callable[[], Awaitable[Any]]) -> Tuple[Any]:
+    return (await default(),)
+
@@ -0,0 +1,105 @@
+from types import MemberDescriptorType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Type
+
+from .compact import FLAGS_ATTR, flags_value
+
+if TYPE_CHECKING:
+    from .meta import MetaInfo
+    from .model import Model
+
+
+Hydrator = Callable[[Type["Model"], Dict[str, Any]], "Model"]
+
+NATIVE, DEFAULT, COMPLEX = "native", "default", "complex"
+
+
+def get_field_kinds(meta: "MetaInfo") -> Dict[str, tuple]:
+    """
+    Map db column to (model field, kind, field) from db_native_fields,
+    db_default_fields and db_complex_fields
+    """
+    return {
+        key: (model_field, kind, field)
+        for kind, fields in (
+            (NATIVE, meta.db_native_fields),
+            (DEFAULT, meta.db_default_fields),
+            (COMPLEX, meta.db_complex_fields),
+        )
+        for key, model_field, field in fields
+    }
+
+
+def build_hydrator(meta: "MetaInfo", keys: Optional[Iterable[str]] = None) -> Hydrator:
+    """
+    Build function which create model instance from db row
+    with all instance attributes set in single __dict__ assignment,
+    or straight to slots for Meta.compact models.
+
+    Without keys hydrator expects full row keyed by db columns and raise KeyError
+    if some column is missing. With keys it builds partial instance from given
+    row keys only, keys are model field names (as .only() select them)
+    or db columns, unknown keys are skipped.
+    """
+    kinds = get_field_kinds(meta)
+    namespace: Dict[str, Any] = {"_new": object.__new__, "_setattr": object.__setattr__}
+
+    if keys is None:
+        columns = [(key, *kinds[key]) for key in sorted(kinds)]
+    else:
+        by_model_field = {value[0]: value for value in kinds.values()}
+        columns = []
+        for key in sorted(keys):
+            value = by_model_field.get(key) or kinds.get(key)
+            if value is not None:
+                columns.append((key, *value))
+
+    partial = keys is not None
+    custom_generated_pk = meta.db_pk_column not in meta.generated_db_fields
+    values = []
+    for i, (key, model_field, kind, field) in enumerate(columns):
+        value = f"row[{key!r}]"
+        if kind == DEFAULT:
+            # default to_python_value is just a field_type call
+            namespace[f"_type{i}"] = field.field_type
+            value = f"_type{i}(_v) if (_v := {value}) is not None else None"
+        elif kind == COMPLEX:
+            namespace[f"_convert{i}"] = field.to_python_value
+            value = f"_convert{i}({value})"
+        values.append((model_field, value))
+
+    if meta.compact:
+        # all values are read before instance is created, so missing column
+        # raise KeyError as in __dict__ layout, slots are set by their descriptors
+        flags = flags_value(
+            _partial=partial,
+            _saved_in_db=True,
+            _custom_generated_pk=custom_generated_pk,
+        )
+        lines = [f"_v{i} = {value}" for i, (_, value) in enumerate(values)]
+        lines += ["self = _new(cls)", f"_setattr(self, {FLAGS_ATTR!r}, {flags})"]
+        for i, (model_field, _) in enumerate(values):
+            descriptor = getattr(meta._model, model_field, None)
+            if isinstance(descriptor, MemberDescriptorType):
+                namespace[f"_set{i}"] = descriptor.__set__
+                lines.append(f"_set{i}(self, _v{i})")
+            else:
+                lines.append(f"_setattr(self, {model_field!r}, _v{i})")
+    else:
+        items = [
+            f"'_partial': {partial!r}",
+            "'_saved_in_db': True",
+            f"'_custom_generated_pk': {custom_generated_pk!r}",
+            *(f"{model_field!r}: {value}" for model_field, value in values),
+        ]
+        lines = [
+            "values = {" + ", ".join(items) + "}",
+            "self = _new(cls)",
+            "_setattr(self, '__dict__', values)",
+        ]
+
+    source = "def hydrate(cls, row):\n" + "".join(
+        f"    {line}\n" for line in (*lines, "return self")
+    )
+    name = "partial hydrator" if partial else "hydrator"
+    exec(compile(source, f"<{meta.full_name} {name}>", "exec"), namespace)
+    return namespace["hydrate"]
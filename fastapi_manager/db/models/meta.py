@@ -1,10 +1,16 @@
+import datetime
 import inspect
 from copy import copy, deepcopy
+from decimal import Decimal
+from enum import Enum
 from functools import partial
 from typing import (
     Any,
+    Callable,
     Dict,
+    FrozenSet,
     List,
+    NamedTuple,
     Optional,
     Set,
     Tuple,
@@ -51,7 +57,14 @@ from tortoise.queryset import (
 
 
 from fastapi_manager.apps import apps
+from fastapi_manager.cache.base import DEFAULT_TIMEOUT
 from fastapi_manager.utils.string import convert_to_snake_case
+from fastapi_manager.db.connection.clients import get_client_class
+from fastapi_manager.db.queryset import Manager as DefaultManager
+from fastapi_manager.db.singleflight import SingleFlightManager
+from .compact import get_compact_attrs
+from .defaults import is_async_default
+from .hydration import Hydrator, build_hydrator
 
 
 if TYPE_CHECKING:
@@ -61,6 +74,33 @@ if TYPE_CHECKING:
 MODEL = TypeVar("MODEL", bound="Model")
 EMPTY = object()
 
+# defaults of these types are assigned to instances without copy
+IMMUTABLE_DEFAULTS = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    Decimal,
+    UUID,
+    Enum,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+)
+
+
+class DefaultPlan(NamedTuple):
+    """
+    Field defaults grouped by the way Model.__init__ applies them
+    """
+
+    constant: Tuple[Tuple[str, Any], ...] = ()
+    copy: Tuple[Tuple[str, Any], ...] = ()
+    sync: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+    awaitable: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+
 
 class MetaInfo:
     __slots__ = (
@@ -103,11 +143,29 @@ class MetaInfo:
         "db_complex_fields",
         "_default_ordering",
         "_ordering_validated",
+        "compact",
+        "cache",
+        "cache_timeout",
+        "hydrator",
+        "_partial_hydrators",
+        "compiled_queries",
+        "default_plan",
+        "single_flight",
     )
 
     def __init__(self, meta: "Model.Meta") -> None:
         self.abstract: bool = getattr(meta, "abstract", False)
-        self.manager: Manager = getattr(meta, "manager", Manager())
+        self.compact: bool = getattr(meta, "compact", False)
+        # cache alias for BaseService.get, True for "default", timeout in seconds
+        self.cache: Union[bool, str] = getattr(meta, "cache", False)
+        self.cache_timeout: Optional[float] = getattr(
+            meta, "cache_timeout", DEFAULT_TIMEOUT
+        )
+        # coalesce identical concurrent reads, see fastapi_manager.db.singleflight
+        self.single_flight: bool = getattr(meta, "single_flight", False)
+        self.manager: Manager = getattr(
+            meta, "manager", SingleFlightManager() if self.single_flight else DefaultManager()
+        )
         self.db_table: str = getattr(meta, "table", "")
         self.schema: Optional[str] = getattr(meta, "schema", None)
         self.app: Optional[str] = getattr(meta, "app", None)
@@ -149,6 +207,11 @@ class MetaInfo:
         self.db_native_fields: List[Tuple[str, str, Field]] = []
         self.db_default_fields: List[Tuple[str, str, Field]] = []
         self.db_complex_fields: List[Tuple[str, str, Field]] = []
+        self.hydrator: Optional[Hydrator] = None
+        self._partial_hydrators: Dict[FrozenSet[str], Hydrator] = {}
+        # CompiledQueries by executor class, see .compiled
+        self.compiled_queries: Dict[type, Any] = {}
+        self.default_plan: DefaultPlan = DefaultPlan()
 
     @property
     def full_name(self) -> str:
@@ -185,6 +248,17 @@ class MetaInfo:
             )
         return connections.get(self.default_connection)
 
+    @property
+    def db_class(self) -> Type[BaseDBAsyncClient]:
+        """
+        Client class of model connection, known before the client is created
+        """
+        if self.default_connection is None:
+            raise ConfigurationError(
+                f"default_connection for the model {self._model} cannot be None"
+            )
+        return get_client_class(self.default_connection)
+
     @property
     def ordering(self) -> Tuple[Tuple[str, Order], ...]:
         if not self._ordering_validated:
@@ -234,6 +308,25 @@ class MetaInfo:
                 self._ordering_validated = False
                 break
 
+        self.default_plan = self._generate_default_plan()
+
+    def _generate_default_plan(self) -> DefaultPlan:
+        # relation fields are never set from defaults
+        plan: Dict[str, list] = {name: [] for name in DefaultPlan._fields}
+        for key, field in self.fields_map.items():
+            if key in self.fetch_fields:
+                continue
+            default = field.default
+            if is_async_default(default):
+                plan["awaitable"].append((key, default))
+            elif callable(default):
+                plan["sync"].append((key, default))
+            elif isinstance(default, IMMUTABLE_DEFAULTS):
+                plan["constant"].append((key, default))
+            else:
+                plan["copy"].append((key, default))
+        return DefaultPlan(**{name: tuple(value) for name, value in plan.items()})
+
     def _generate_lazy_fk_m2m_fields(self) -> None:
         # Create lazy FK fields on model.
         for key in self.fk_fields:
@@ -357,7 +450,7 @@ class MetaInfo:
             model_field = self.fields_db_projection_reverse[key]
             field = self.fields_map[model_field]
 
-            is_native_field_type = field.field_type in self.db.executor_class.DB_NATIVE
+            is_native_field_type = field.field_type in self.db_class.executor_class.DB_NATIVE
             default_converter = field.__class__.to_python_value is Field.to_python_value
 
             if is_native_field_type and (
@@ -369,8 +462,24 @@ class MetaInfo:
             else:
                 self.db_complex_fields.append((key, model_field, field))
 
+        self.hydrator = build_hydrator(self)
+        self._partial_hydrators.clear()
+        self.compiled_queries.clear()
+
+    def get_partial_hydrator(self, keys: FrozenSet[str]) -> Hydrator:
+        """
+        Return hydrator for rows with given key set, e.g. from .only()
+        """
+        try:
+            return self._partial_hydrators[keys]
+        except KeyError:
+            hydrator = self._partial_hydrators[keys] = build_hydrator(self, keys)
+            return hydrator
+
     def _generate_filters(self) -> None:
-        get_overridden_filter_func = self.db.executor_class.get_overridden_filter_func
+        get_overridden_filter_func = (
+            self.db_class.executor_class.get_overridden_filter_func
+        )
         for key, filter_info in self._filters.items():
             overridden_operator = get_overridden_filter_func(
                 filter_func=filter_info["operator"]
@@ -381,6 +490,14 @@ class MetaInfo:
             self.filters[key] = filter_info
 
 
+def _async_default_setattr(self: "Model", key: str, value: Any) -> None:
+    # set field value override async default function
+    await_when_save = getattr(self, "_await_when_save", None)
+    if await_when_save:
+        await_when_save.pop(key, None)
+    object.__setattr__(self, key, value)
+
+
 class ModelMeta(type):
     __slots__ = ()
 
@@ -500,6 +617,16 @@ class ModelMeta(type):
         # Clean the class attributes
         for slot in fields_map:
             attrs.pop(slot, None)
+        # only writes to models with async defaults need to drop pending default
+        if "__setattr__" not in attrs and any(
+            is_async_default(field.default) for field in fields_map.values()
+        ):
+            attrs["__setattr__"] = _async_default_setattr
+        if getattr(meta_class, "abstract", None):
+            # instances are never created, keep layout of compact subclasses
+            attrs.setdefault("__slots__", ())
+        elif getattr(meta_class, "compact", False):
+            attrs.update(get_compact_attrs(fields_map, bases))
         attrs["_meta"] = meta = MetaInfo(meta_class)
         # fastapi_manager init
 
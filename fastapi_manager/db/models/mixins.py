@@ -2,5 +2,7 @@ from fastapi_manager.db import fields
 
 
 class TimestampMixin:
+    __slots__ = ()
+
     created_at = fields.DatetimeField(null=True, auto_now_add=True)
     modified_at = fields.DatetimeField(null=True, auto_now=True)
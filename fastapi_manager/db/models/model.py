@@ -42,14 +42,43 @@ from tortoise.queryset import (
     QuerySetSingle,
     RawSQLQuery,
 )
+from tortoise.manager import Manager
 from tortoise.router import router
 from tortoise.signals import Signals
 from tortoise.transactions import in_transaction
 
 
+from fastapi_manager.cache import has_cached_counts, invalidate, invalidate_counts
+from fastapi_manager.db.identity import (
+    IdentityLookup,
+    forget,
+    get_identity_map,
+    get_pk,
+    remember,
+)
+from fastapi_manager.db.queryset import HookedQuery, Manager as DefaultManager
+from fastapi_manager.db.signals import BatchSignals, has_batch_listeners, send_batch
+from fastapi_manager.db.singleflight import SingleFlightManager, single_flight_db
+from fastapi_manager.schemas import schemas
+from .compiled import PkLookup
+from .defaults import resolve_async_defaults
 from .meta import ModelMeta, MetaInfo, MODEL, EMPTY
+from .upsert import (
+    covers_required,
+    get_conflict_target,
+    get_set_fields,
+    upsert_dialect,
+    upsert_lookup,
+    upsert_save,
+)
 
 PK = Union[int, str, UUID]
+# managers whose querysets are not filtered, Model.get(pk=...) loads with compiled select
+DEFAULT_MANAGERS = (Manager, DefaultManager, SingleFlightManager)
+
+# Internal write path for __init__ and defaults, skips __setattr__
+#  which ModelMeta adds to models with async defaults
+_setattr = object.__setattr__
 
 
 class Model(metaclass=ModelMeta):
@@ -57,6 +86,9 @@ class Model(metaclass=ModelMeta):
     Base class for all Tortoise ORM Models.
     """
 
+    # subclasses get __dict__ unless they are compact, see Meta.compact
+    __slots__ = ()
+
     # I don' like this here, but it makes auto completion and static analysis much happier
     _meta = MetaInfo(None)  # type: ignore
     _listeners: Dict[Signals, Dict[Type[MODEL], List[Callable]]] = {  # type: ignore
@@ -69,27 +101,31 @@ class Model(metaclass=ModelMeta):
     def __init__(self, **kwargs: Any) -> None:
         # self._meta is a very common attribute lookup, lets cache it.
         meta = self._meta
-        self._partial = False
-        self._saved_in_db = False
-        self._custom_generated_pk = False
-        self._await_when_save: Dict[str, Callable[[], Awaitable[Any]]] = {}
-
-        # Assign defaults for missing fields
-        for key in meta.fields.difference(self._set_kwargs(kwargs)):
-            field_object = meta.fields_map[key]
-            field_default = field_object.default
-            if inspect.iscoroutinefunction(field_default):
-                self._await_when_save[key] = field_default
-            elif callable(field_default):
-                setattr(self, key, field_default())
-            else:
-                setattr(self, key, deepcopy(field_object.default))
-
-    def __setattr__(self, key, value):
-        # set field value override async default function
-        if hasattr(self, "_await_when_save"):
-            self._await_when_save.pop(key, None)
-        super().__setattr__(key, value)
+        _setattr(self, "_partial", False)
+        _setattr(self, "_saved_in_db", False)
+        _setattr(self, "_custom_generated_pk", False)
+
+        # Assign defaults for missing fields by plan made in MetaInfo.finalise_fields
+        passed_fields = self._set_kwargs(kwargs)
+        plan = meta.default_plan
+        for key, value in plan.constant:
+            if key not in passed_fields:
+                _setattr(self, key, value)
+        for key, value in plan.copy:
+            if key not in passed_fields:
+                _setattr(self, key, deepcopy(value))
+        for key, default in plan.sync:
+            if key not in passed_fields:
+                _setattr(self, key, default())
+        if plan.awaitable:
+            # _await_when_save is created only if model has async defaults
+            await_when_save: Dict[str, Callable[[], Awaitable[Any]]] = {
+                key: default
+                for key, default in plan.awaitable
+                if key not in passed_fields
+            }
+            if await_when_save:
+                _setattr(self, "_await_when_save", await_when_save)
 
     def _set_kwargs(self, kwargs: dict) -> Set[str]:
         meta = self._meta
@@ -132,55 +168,13 @@ class Model(metaclass=ModelMeta):
 
     @classmethod
     def _init_from_db(cls: Type[MODEL], **kwargs: Any) -> MODEL:
-        self = cls.__new__(cls)
-        self._partial = False
-        self._saved_in_db = True
-        self._custom_generated_pk = (
-            self._meta.db_pk_column not in self._meta.generated_db_fields
-        )
-        self._await_when_save = {}
-
-        meta = self._meta
-        inited_keys: Set[str] = set()
+        # Hydrators are generated per model in MetaInfo._generate_db_fields,
+        #  rows without some db column are built by hydrator cached for their key set
+        meta = cls._meta
         try:
-            # This is like so for performance reasons.
-            #  We want to avoid conditionals and calling .to_python_value()
-            # Native fields are fields that are already converted to/from python to DB type
-            #  by the DB driver
-            for key, model_field, field in meta.db_native_fields:
-                setattr(self, model_field, kwargs[key])
-                inited_keys.add(key)
-            # Fields that don't override .to_python_value() are converted without a call
-            #  as we already know what we will be doing.
-            for key, model_field, field in meta.db_default_fields:
-                if (value := kwargs[key]) is not None:
-                    value = field.field_type(value)
-                setattr(self, model_field, value)
-                inited_keys.add(key)
-            # These fields need manual .to_python_value()
-            for key, model_field, field in meta.db_complex_fields:
-                setattr(self, model_field, field.to_python_value(kwargs[key]))
-                inited_keys.add(key)
+            return meta.hydrator(cls, kwargs)
         except KeyError:
-            self._partial = True
-            native_fields: List[Field] = [f for *_, f in meta.db_native_fields]
-            default_fields = complex_fields = None
-            for key, value in kwargs.items():
-                if key in inited_keys or key not in meta.fields_map:
-                    continue
-                if (field := meta.fields_map[key]) not in native_fields:
-                    if default_fields is None:
-                        default_fields = [f for *_, f in meta.db_default_fields]
-                    if field in default_fields:
-                        if value is not None:
-                            value = field.field_type(value)
-                    else:
-                        if complex_fields is None:
-                            complex_fields = [f for *_, f in meta.db_complex_fields]
-                        value = field.to_python_value(value)
-                setattr(self, key, value)
-
-        return self
+            return meta.get_partial_hydrator(frozenset(kwargs))(cls, kwargs)
 
     def __str__(self) -> str:
         return f"<{self.__class__.__name__}>"
@@ -278,12 +272,17 @@ class Model(metaclass=ModelMeta):
         if listener not in cls_listeners:
             cls_listeners.append(listener)
 
+    @classmethod
+    def has_listeners(cls, *signals: Signals) -> bool:
+        """
+        Check if any listener is registered to current model class for given signals
+        """
+        return any(cls._listeners[signal].get(cls) for signal in signals)
+
     async def _set_async_default_field(self) -> None:
         """retrieve value from field's async default value"""
         if hasattr(self, "_await_when_save"):
-            for k, v in self._await_when_save.copy().items():
-                setattr(self, k, await v())
-            self._await_when_save = {}
+            await resolve_async_defaults((self,))
 
     async def _wait_for_listeners(self, signal: Signals, *listener_args) -> None:
         cls_listeners = self._listeners.get(signal, {}).get(self.__class__, [])
@@ -296,6 +295,8 @@ class Model(metaclass=ModelMeta):
         await self._wait_for_listeners(Signals.pre_delete, using_db)
 
     async def _post_delete(self, using_db: Optional[BaseDBAsyncClient] = None) -> None:
+        forget(self.__class__, self.pk)
+        await invalidate(self.__class__, self.pk)
         await self._wait_for_listeners(Signals.post_delete, using_db)
 
     async def _pre_save(
@@ -311,6 +312,12 @@ class Model(metaclass=ModelMeta):
         created: bool = False,
         update_fields: Optional[Iterable[str]] = None,
     ) -> None:
+        # instance of .only() misses fields, next load must read the row
+        if self._partial:
+            forget(self.__class__, self.pk)
+        else:
+            remember(self)
+        await invalidate(self.__class__, self.pk)
         await self._wait_for_listeners(
             Signals.post_save, created, using_db, update_fields
         )
@@ -374,8 +381,10 @@ class Model(metaclass=ModelMeta):
                 else:
                     await executor.execute_update(self, update_fields)
                     created = False
+            elif self.pk is not None and upsert_dialect(db):
+                # pk is known, row may exist already: INSERT ... ON CONFLICT DO UPDATE
+                created = await upsert_save(self, db)
             else:
-                # TODO: Do a merge/upsert operation here instead. Let the executor determine an optimal strategy for each DB engine.
                 await executor.execute_insert(self)
                 created = True
 
@@ -477,22 +486,67 @@ class Model(metaclass=ModelMeta):
         if not defaults:
             defaults = {}
         db = using_db or cls._choose_db(True)
+        targets = cls._upsert_target(db, defaults, kwargs)
+        if targets is not None:
+            return await cls._upsert_lookup(db, targets, defaults, kwargs, ())
         try:
             return await cls.filter(**kwargs).using_db(db).get(), False
         except DoesNotExist:
             return await cls._create_or_get(db, defaults, **kwargs)
 
     @classmethod
-    async def _create_or_get(
-        cls, db: BaseDBAsyncClient, defaults: dict, **kwargs
+    def _upsert_target(
+        cls, db: BaseDBAsyncClient, defaults: dict, kwargs: dict
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Fields of unique constraint looked up by kwargs if lookup can be done
+        with upsert statement, models with save listeners take the long way,
+        as do lookups whose kwargs and defaults can't make up a new row
+        """
+        if not upsert_dialect(db, returning=True) or cls.has_listeners(
+            Signals.pre_save, Signals.post_save
+        ):
+            return None
+        if not covers_required(cls, {**kwargs, **defaults}):
+            return None
+        return get_conflict_target(cls, kwargs)
+
+    @classmethod
+    async def _upsert_lookup(
+        cls,
+        db: BaseDBAsyncClient,
+        targets: Tuple[str, ...],
+        defaults: dict,
+        kwargs: dict,
+        updates: Iterable[str],
     ) -> Tuple[Self, bool]:
-        """Try to create, if fails with IntegrityError then try to get"""
+        """
+        INSERT ... ON CONFLICT DO UPDATE RETURNING, found row is updated with
+        updates fields of defaults, without them it's ON CONFLICT DO NOTHING
+        and found row is selected
+        """
+        instance, created = await upsert_lookup(
+            cls, db, targets, cls._merge_defaults(defaults, kwargs), updates
+        )
+        if created or updates:
+            await instance._post_save(db, created)
+        return instance, created  # type: ignore[return-value]
+
+    @classmethod
+    def _merge_defaults(cls, defaults: dict, kwargs: dict) -> dict:
         for key in defaults.keys() & kwargs.keys():
             if (default_value := defaults[key]) != (query_value := kwargs[key]):
                 raise ParamsError(
                     f"Conflict value with {key=}: {default_value=} vs {query_value=}"
                 )
-        merged_defaults = {**kwargs, **defaults}
+        return {**kwargs, **defaults}
+
+    @classmethod
+    async def _create_or_get(
+        cls, db: BaseDBAsyncClient, defaults: dict, **kwargs
+    ) -> Tuple[Self, bool]:
+        """Try to create, if fails with IntegrityError then try to get"""
+        merged_defaults = cls._merge_defaults(defaults, kwargs)
         try:
             async with in_transaction(connection_name=db.connection_name) as connection:
                 return await cls.create(using_db=connection, **merged_defaults), True
@@ -507,8 +561,19 @@ class Model(metaclass=ModelMeta):
     def _db_queryset(
         cls, using_db: Optional[BaseDBAsyncClient] = None, for_write: bool = False
     ) -> QuerySet[Self]:
+        return cls._meta.manager.get_queryset().using_db(
+            cls._query_db(using_db, for_write)
+        )
+
+    @classmethod
+    def _query_db(
+        cls, using_db: Optional[BaseDBAsyncClient] = None, for_write: bool = False
+    ) -> BaseDBAsyncClient:
         db = using_db or cls._choose_db(for_write)
-        return cls._meta.manager.get_queryset().using_db(db)
+        if cls._meta.single_flight and not (using_db or for_write):
+            # queryset is bound to db here, so SingleFlightQuerySet won't wrap it
+            db = single_flight_db(db)
+        return db
 
     @classmethod
     def select_for_update(
@@ -545,6 +610,12 @@ class Model(metaclass=ModelMeta):
         if not defaults:
             defaults = {}
         db = using_db or cls._choose_db(True)
+        updates = get_set_fields(cls, defaults)
+        targets = (
+            cls._upsert_target(db, defaults, kwargs) if updates is not None else None
+        )
+        if targets is not None:
+            return await cls._upsert_lookup(db, targets, defaults, kwargs, updates)
         async with in_transaction(connection_name=db.connection_name) as connection:
             instance = (
                 await cls.select_for_update().using_db(connection).get_or_none(**kwargs)
@@ -609,9 +680,12 @@ class Model(metaclass=ModelMeta):
         :param batch_size: How many objects are created in a single query
         :param using_db: Specific DB connection to use instead of default bound
         """
-        return cls._db_queryset(using_db, for_write=True).bulk_update(
+        objects = list(objects)
+        fields = list(fields)
+        query = cls._db_queryset(using_db, for_write=True).bulk_update(
             objects, fields, batch_size
         )
+        return cls._hook_bulk_save(query, objects, False, fields)
 
     @classmethod
     async def in_bulk(
@@ -628,7 +702,14 @@ class Model(metaclass=ModelMeta):
         :param field_name: Must be a unique field
         :param using_db: Specific DB connection to use instead of default bound
         """
-        return await cls._db_queryset(using_db).in_bulk(id_list, field_name)
+        identity_map = get_identity_map(cls) if using_db is None else None
+        if identity_map is None or field_name not in ("pk", cls._meta.pk_attr):
+            return await cls._db_queryset(using_db).in_bulk(id_list, field_name)
+        return await identity_map.load_bulk(
+            cls,
+            [cls._meta.pk.to_python_value(pk) for pk in id_list],
+            lambda missing: cls._db_queryset().in_bulk(missing, field_name),
+        )
 
     @classmethod
     def bulk_create(
@@ -667,9 +748,52 @@ class Model(metaclass=ModelMeta):
         :param batch_size: How many objects are created in a single query
         :param using_db: Specific DB connection to use instead of default bound
         """
-        return cls._db_queryset(using_db, for_write=True).bulk_create(
+        objects = list(objects)
+        query = cls._db_queryset(using_db, for_write=True).bulk_create(
             objects, batch_size, ignore_conflicts, update_fields, on_conflict
         )
+        return cls._hook_bulk_save(query, objects, True, None)
+
+    @classmethod
+    def _hook_bulk_save(
+        cls,
+        query: Any,
+        objects: List[MODEL],
+        created: bool,
+        update_fields: Optional[List[str]],
+    ) -> Any:
+        """
+        Resolve async defaults of objects and send batch signals around bulk query,
+        cached counts of model are invalidated after it
+        """
+        awaitable = bool(cls._meta.default_plan.awaitable)
+        signals = has_batch_listeners(
+            cls, BatchSignals.pre_save, BatchSignals.post_save
+        )
+        if not (awaitable or signals or has_cached_counts(cls)):
+            return query
+
+        async def before() -> None:
+            if awaitable:
+                await resolve_async_defaults(objects)
+            if signals:
+                await send_batch(
+                    cls, BatchSignals.pre_save, objects, query._db, update_fields
+                )
+
+        async def after(_: Any) -> None:
+            await invalidate_counts(cls)
+            if signals:
+                await send_batch(
+                    cls,
+                    BatchSignals.post_save,
+                    objects,
+                    created,
+                    query._db,
+                    update_fields,
+                )
+
+        return HookedQuery(query, before, after)
 
     @classmethod
     def first(
@@ -734,7 +858,17 @@ class Model(metaclass=ModelMeta):
         :raises MultipleObjectsReturned: If provided search returned more than one object.
         :raises DoesNotExist: If object can not be found.
         """
-        return cls._db_queryset(using_db).get(*args, **kwargs)
+        pk = get_pk(cls, args, kwargs)
+        # custom manager may filter its querysets, so its loads can't skip them
+        if pk is None or type(cls._meta.manager) not in DEFAULT_MANAGERS:
+            return cls._db_queryset(using_db).get(*args, **kwargs)
+        lookup = PkLookup(cls, pk, using_db, args, kwargs)
+        # loads by pk go through identity map of current request if any
+        if using_db is None:
+            identity_map = get_identity_map(cls)
+            if identity_map is not None:
+                return IdentityLookup(lookup, identity_map, cls, pk)  # type: ignore
+        return lookup  # type: ignore
 
     @classmethod
     def raw(
@@ -859,6 +993,9 @@ class Model(metaclass=ModelMeta):
         """
         Describes the given list of models or ALL registered models.
 
+        Description is cached in the schemas registry after ORM init,
+        returned dict is shared and must not be modified.
+
         :param serializable:
             ``False`` if you want raw python objects,
             ``True`` for JSON-serializable data. (Defaults to ``True``)
@@ -891,6 +1028,10 @@ class Model(metaclass=ModelMeta):
 
             Each field is specified as defined in :meth:`tortoise.fields.base.Field.describe`
         """
+        return schemas.describe(cls, serializable)
+
+    @classmethod
+    def _describe(cls, serializable: bool) -> dict:
         return {
             "name": cls._meta.full_name,
             "app": cls._meta.app,
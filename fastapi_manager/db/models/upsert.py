@@ -0,0 +1,277 @@
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from pypika.terms import Function, Term
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from .compiled import get_compiled
+
+if TYPE_CHECKING:
+    from .model import Model
+
+
+# dialects with one statement upsert, mysql has no RETURNING so it upserts only in save()
+UPSERT_DIALECTS = ("postgres", "sqlite", "mysql")
+RETURNING_DIALECTS = ("postgres", "sqlite")
+
+CREATED_COLUMN = "_upsert_created"
+SQLITE_MARK = "fastapi_manager_upsert_mark"
+SQLITE_CREATED = "fastapi_manager_upsert_created"
+
+
+class _SqliteUpsertState:
+    """
+    SQLite has no way to tell inserted row from updated one in RETURNING,
+    so SET of DO UPDATE calls mark() and RETURNING calls created()
+    """
+
+    __slots__ = ("updated", "__weakref__")
+
+    def __init__(self):
+        self.updated = False
+
+    def mark(self, value: Any) -> Any:
+        self.updated = True
+        return value
+
+    def created(self) -> bool:
+        created = not self.updated
+        self.updated = False
+        return created
+
+
+_sqlite_states: "weakref.WeakKeyDictionary[Any, _SqliteUpsertState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _prepare_sqlite(db: BaseDBAsyncClient) -> None:
+    connection = db._connection  # type: ignore[attr-defined]
+    if connection is None:
+        await db.create_connection(with_db=True)
+        connection = db._connection  # type: ignore[attr-defined]
+    state = _sqlite_states.get(connection)
+    if state is None:
+        state = _sqlite_states[connection] = _SqliteUpsertState()
+        await connection.create_function(SQLITE_MARK, 1, state.mark)
+        await connection.create_function(SQLITE_CREATED, 0, state.created)
+    state.updated = False
+
+
+def upsert_dialect(db: BaseDBAsyncClient, returning: bool = False) -> Optional[str]:
+    dialect = db.capabilities.dialect
+    if dialect in (RETURNING_DIALECTS if returning else UPSERT_DIALECTS):
+        return dialect
+    return None
+
+
+def get_conflict_target(
+    model: Type["Model"], data: Dict[str, Any]
+) -> Optional[Tuple[str, ...]]:
+    """
+    Fields of pk, unique field or unique_together which are exactly keys of data,
+    None if there's no such constraint or some value isn't plain
+    """
+    meta = model._meta
+    keys = set()
+    for key, value in data.items():
+        key = meta.pk_attr if key == "pk" else key
+        if key not in meta.fields_db_projection or isinstance(value, (Term, Function)):
+            return None
+        keys.add(key)
+    if len(keys) == 1:
+        key = next(iter(keys))
+        if meta.fields_map[key].unique or key == meta.pk_attr:
+            return (key,)
+        return None
+    for together in meta.unique_together:
+        fields = {
+            getattr(meta.fields_map[name], "source_field", None) or name
+            for name in together
+        }
+        if fields == keys:
+            return tuple(sorted(keys))
+    return None
+
+
+def covers_required(model: Type["Model"], data: Dict[str, Any]) -> bool:
+    """
+    Whether data has value of every column which can't be null and has no default,
+    so row can be inserted from data alone
+    """
+    meta = model._meta
+    keys = {meta.pk_attr if key == "pk" else key for key in data}
+    for name in meta.fields_db_projection:
+        field = meta.fields_map[name]
+        if (
+            name in keys
+            or field.null
+            or field.generated
+            or field.default is not None
+            or getattr(field, "auto_now_add", False)
+        ):
+            continue
+        reference = getattr(field, "reference", None)
+        if reference is None or reference.model_field_name not in keys:
+            return False
+    return True
+
+
+def get_set_fields(model: Type["Model"], data: Iterable[str]) -> Optional[List[str]]:
+    """
+    db fields of data keys, foreign keys by their source field,
+    None if some key isn't a column
+    """
+    meta = model._meta
+    fields = []
+    for key in data:
+        key = meta.pk_attr if key == "pk" else key
+        if key not in meta.fields_db_projection:
+            key = getattr(meta.fields_map.get(key), "source_field", None)
+            if key is None:
+                return None
+        fields.append(key)
+    return fields
+
+
+def _upsert_sql(
+    model: Type["Model"],
+    db: BaseDBAsyncClient,
+    columns: Tuple[str, ...],
+    targets: Tuple[str, ...],
+    updates: Tuple[str, ...],
+) -> str:
+    meta = model._meta
+    executor = db.executor_class(model=model, db=db)
+    dialect = db.capabilities.dialect
+    quote_char = db.query_class._builder().QUOTE_CHAR
+    projection = meta.fields_db_projection
+
+    def quote(field: str) -> str:
+        return f"{quote_char}{projection[field]}{quote_char}"
+
+    insert = str(
+        executor._prepare_insert_statement(
+            [projection[column] for column in columns], has_generated=False
+        )
+    )
+    if dialect == "mysql":
+        sets = [f"{quote(field)}=VALUES({quote(field)})" for field in updates]
+        if not sets:
+            sets = [f"{quote(targets[0])}={quote(targets[0])}"]
+        return f"{insert} ON DUPLICATE KEY UPDATE {','.join(sets)}"
+
+    target = ",".join(quote(field) for field in targets)
+    if not updates:
+        # existing row is left alone (no lock, no UPDATE), only inserted is returned
+        return f"{insert} ON CONFLICT ({target}) DO NOTHING RETURNING *"
+    sets = [f"{quote(field)}=EXCLUDED.{quote(field)}" for field in updates]
+    if dialect == "postgres":
+        created = "xmax=0"
+    else:
+        first = quote(updates[0])
+        sets[0] = f"{first}={SQLITE_MARK}(EXCLUDED.{first})"
+        created = f"{SQLITE_CREATED}()"
+    return (
+        f"{insert} ON CONFLICT ({target}) DO UPDATE SET {','.join(sets)}"
+        f" RETURNING *,{created} AS {quote_char}{CREATED_COLUMN}{quote_char}"
+    )
+
+
+async def upsert(
+    instance: "Model",
+    db: BaseDBAsyncClient,
+    targets: Tuple[str, ...],
+    updates: Iterable[str],
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    INSERT instance, on conflict of targets UPDATE updates fields (and auto_now
+    fields if any is updated) of existing row, in one statement.
+    Return whether row was created and row from RETURNING, None on mysql
+    and, without updates, when row exists
+    """
+    model = instance.__class__
+    meta = model._meta
+    executor = db.executor_class(model=model, db=db)
+    if instance._custom_generated_pk:
+        columns = tuple(executor.regular_columns_all)
+    else:
+        columns = tuple(executor.regular_columns)
+    updates = tuple(sorted(set(updates) & set(columns) - set(targets) - {meta.pk_attr}))
+    if updates:
+        updates += tuple(
+            field
+            for field in columns
+            if getattr(meta.fields_map[field], "auto_now", False)
+            and field not in updates
+        )
+
+    compiled = get_compiled(model, db)
+    key = (columns, targets, updates)
+    sql = compiled.upserts.get(key)
+    if sql is None:
+        sql = compiled.upserts[key] = _upsert_sql(model, db, columns, targets, updates)
+    values = [
+        executor.column_map[field](getattr(instance, field), instance)
+        for field in columns
+    ]
+
+    dialect = db.capabilities.dialect
+    if dialect != "mysql" and not updates:
+        _, rows = await db.execute_query(sql, values)
+        return (True, dict(rows[0])) if rows else (False, None)
+    if dialect == "sqlite":
+        await _prepare_sqlite(db)
+    count, rows = await db.execute_query(sql, values)
+    if dialect == "mysql":
+        # affected rows: 1 inserted, 2 updated, 0 unchanged
+        return count == 1, None
+    row = dict(rows[0])
+    return bool(row.pop(CREATED_COLUMN)), row
+
+
+def _auto_now_add(model: Type["Model"]) -> List[str]:
+    return [
+        field
+        for field, field_object in model._meta.fields_map.items()
+        if getattr(field_object, "auto_now_add", False)
+        and not getattr(field_object, "auto_now", False)
+    ]
+
+
+async def upsert_save(instance: "Model", db: BaseDBAsyncClient) -> bool:
+    """
+    Insert or update row of instance with pk set, return whether it was created.
+    Columns of row returned by database (e.g. kept auto_now_add) are set on instance
+    """
+    model = instance.__class__
+    meta = model._meta
+    updates = set(meta.fields_db_projection) - set(_auto_now_add(model))
+    created, row = await upsert(instance, db, (meta.pk_attr,), updates)
+    if row is not None:
+        fresh = model._init_from_db(**row)
+        for field in meta.db_fields:
+            setattr(instance, field, getattr(fresh, field))
+    return created
+
+
+async def upsert_lookup(
+    model: Type["Model"],
+    db: BaseDBAsyncClient,
+    targets: Tuple[str, ...],
+    data: Dict[str, Any],
+    updates: Iterable[str],
+) -> Tuple["Model", bool]:
+    """
+    Row matching targets fields of data, with updates fields set from data,
+    created from data when there is none. Data must cover required fields,
+    see covers_required. Without updates existing row is selected after INSERT
+    """
+    instance = model(**data)
+    await instance._set_async_default_field()
+    created, row = await upsert(instance, db, targets, updates)
+    if row is None:
+        lookup = {target: getattr(instance, target) for target in targets}
+        return await model.filter(**lookup).using_db(db).get(), False
+    instance = model._init_from_db(**row)
+    return instance, created
@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, Type
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.log import logger
+
+# statements of current request by normalized SQL, None outside of detect_n_plus_one
+_queries: ContextVar[Optional[Counter]] = ContextVar("queries", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+")
+_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    SQL with literals and parameters replaced by ?, lists of them by one ?,
+    so queries differing only in values are equal
+    """
+    return _LISTS.sub("?", _LITERALS.sub("?", sql))
+
+
+def _recorded(method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(self: BaseDBAsyncClient, query: str, *args: Any, **kwargs: Any):
+        queries = _queries.get()
+        if queries is not None:
+            queries[normalize_sql(query)] += 1
+        return await method(self, query, *args, **kwargs)
+
+    wrapper.recorded = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def record_queries(client_class: Type[BaseDBAsyncClient]) -> None:
+    """
+    Count queries of client class (and its transactions) in detect_n_plus_one scopes,
+    installed in DEBUG for every connection on ORM init
+    """
+    for name in ("execute_query", "execute_query_dict"):
+        method = getattr(client_class, name)
+        if not getattr(method, "recorded", False):
+            setattr(client_class, name, _recorded(method))
+
+
+@contextmanager
+def detect_n_plus_one(threshold: int, label: str = "") -> Iterator[Counter]:
+    """
+    Log each statement which ran more than threshold times in the scope
+    with different values, usually relation loaded row by row
+    """
+    queries: Counter = Counter()
+    token = _queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _queries.reset(token)
+        for sql, count in queries.items():
+            if count > threshold:
+                logger.warning(
+                    "Possible N+1 in %s: %d similar queries: %s", label, count, sql
+                )
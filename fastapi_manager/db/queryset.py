@@ -0,0 +1,124 @@
+from typing import Any, Awaitable, Callable, List, Optional
+
+from tortoise import manager, queryset
+
+from fastapi_manager.cache import has_cached_counts, invalidate_counts
+from fastapi_manager.db.identity import current_identity_map, forget, forget_all
+from fastapi_manager.db.signals import BatchSignals, has_batch_listeners, send_batch
+
+
+class HookedQuery:
+    """
+    Query which awaits before() before it runs and after(result) when it's done,
+    other attributes are of wrapped query
+    """
+
+    __slots__ = ("query", "before", "after")
+
+    def __init__(
+        self,
+        query: Any,
+        before: Optional[Callable[[], Awaitable[None]]] = None,
+        after: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        self.query = query
+        self.before = before
+        self.after = after
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.query, name)
+
+    def __await__(self):
+        return self._execute().__await__()
+
+    async def _execute(self) -> Any:
+        if self.before is not None:
+            await self.before()
+        result = await self.query
+        if self.after is not None:
+            await self.after(result)
+        return result
+
+
+class QuerySet(queryset.QuerySet):
+    """
+    QuerySet whose update() and delete() send batch signals when model has
+    listeners of them. Matched rows are loaded before the statement, so these
+    are one SELECT more, and post_bulk_save one more to reload updated rows.
+    Rows changed by others in between are missed, use transaction for exact set.
+
+    Inside request both drop changed rows from its identity map: matched ones
+    when they are loaded for signals, otherwise all rows of the model.
+    Cached counts of the model are invalidated, see CachedCount.
+    """
+
+    __slots__ = ()
+
+    def update(self, **kwargs: Any) -> queryset.UpdateQuery:
+        query = super().update(**kwargs)
+        if not has_batch_listeners(
+            self.model, BatchSignals.pre_save, BatchSignals.post_save
+        ):
+            return self._hook_write(query)
+        db = query._db = self._db or self._choose_db(True)
+        update_fields = list(kwargs)
+        instances: List[Any] = []
+
+        async def before() -> None:
+            instances.extend(await self._clone().using_db(db))
+            await send_batch(
+                self.model, BatchSignals.pre_save, instances, db, update_fields
+            )
+
+        async def after(_: Any) -> None:
+            forget(self.model, *(instance.pk for instance in instances))
+            await invalidate_counts(self.model)
+            if not has_batch_listeners(self.model, BatchSignals.post_save):
+                return
+            updated = await self.model.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).using_db(db)
+            await send_batch(
+                self.model, BatchSignals.post_save, updated, False, db, update_fields
+            )
+
+        return HookedQuery(query, before, after)  # type: ignore[return-value]
+
+    def delete(self) -> queryset.DeleteQuery:
+        query = super().delete()
+        if not has_batch_listeners(
+            self.model, BatchSignals.pre_delete, BatchSignals.post_delete
+        ):
+            return self._hook_write(query)
+        db = query._db = self._db or self._choose_db(True)
+        instances: List[Any] = []
+
+        async def before() -> None:
+            instances.extend(await self._clone().using_db(db))
+            await send_batch(self.model, BatchSignals.pre_delete, instances, db)
+
+        async def after(_: Any) -> None:
+            forget(self.model, *(instance.pk for instance in instances))
+            await invalidate_counts(self.model)
+            await send_batch(self.model, BatchSignals.post_delete, instances, db)
+
+        return HookedQuery(query, before, after)  # type: ignore[return-value]
+
+    def _hook_write(self, query: Any) -> Any:
+        if current_identity_map() is None and not has_cached_counts(self.model):
+            return query
+
+        async def after(_: Any) -> None:
+            forget_all(self.model)
+            await invalidate_counts(self.model)
+
+        return HookedQuery(query, after=after)
+
+
+class Manager(manager.Manager):
+    """
+    Default manager of models, custom managers should subclass it
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return QuerySet(self._model)
@@ -0,0 +1,125 @@
+import typing
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.queryset import QuerySet
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+class RelatedPlan:
+    """
+    Relations loaded together with rows: select_related ones are joined
+    to the rows query, prefetch_related ones are loaded after it
+    with one IN query per relation, see Model.fetch_for_list
+    """
+
+    __slots__ = ("select_related", "prefetch_related")
+
+    def __init__(
+        self, select_related: Iterable[str] = (), prefetch_related: Iterable[str] = ()
+    ):
+        self.select_related = tuple(dict.fromkeys(select_related))
+        self.prefetch_related = tuple(
+            name
+            for name in dict.fromkeys(prefetch_related)
+            if name not in self.select_related
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.select_related or self.prefetch_related)
+
+    def __or__(self, other: "RelatedPlan") -> "RelatedPlan":
+        return RelatedPlan(
+            self.select_related + other.select_related,
+            self.prefetch_related + other.prefetch_related,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, RelatedPlan)
+            and self.select_related == other.select_related
+            and self.prefetch_related == other.prefetch_related
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RelatedPlan(select_related={self.select_related!r}, "
+            f"prefetch_related={self.prefetch_related!r})"
+        )
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    async def fetch(
+        self,
+        model: Type["Model"],
+        instances: List["Model"],
+        using_db: Optional[BaseDBAsyncClient] = None,
+    ) -> None:
+        """
+        Load all relations of plan for already loaded instances,
+        e.g. object from cache or rows of streamed chunk
+        """
+        relations = self.select_related + self.prefetch_related
+        if relations and instances:
+            await model.fetch_for_list(instances, *relations, using_db=using_db)
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        schema = _nested_schema(arg)
+        if schema is not None:
+            return schema
+    return None
+
+
+def _infer(
+    model: Type["Model"],
+    schema: Type[BaseModel],
+    prefix: str,
+    joinable: bool,
+    select_related: List[str],
+    prefetch_related: List[str],
+) -> None:
+    meta = model._meta
+    forward = meta.fk_fields | meta.o2o_fields
+    backward = meta.backward_fk_fields | meta.backward_o2o_fields | meta.m2m_fields
+    for name, field in schema.model_fields.items():
+        if name not in forward and name not in backward:
+            continue
+        path = f"{prefix}{name}"
+        join = joinable and name in forward
+        (select_related if join else prefetch_related).append(path)
+        nested = _nested_schema(field.annotation)
+        if nested is not None:
+            _infer(
+                meta.fields_map[name].related_model,
+                nested,
+                f"{path}__",
+                join,
+                select_related,
+                prefetch_related,
+            )
+
+
+@lru_cache(maxsize=None)
+def infer_related_plan(model: Type["Model"], schema: Type[BaseModel]) -> RelatedPlan:
+    """
+    Plan of relation fields of response schema, nested ones too:
+    chains of foreign keys and one to one fields are joined,
+    reverse relations, many to many and anything under them are prefetched
+    """
+    select_related: List[str] = []
+    prefetch_related: List[str] = []
+    _infer(model, schema, "", True, select_related, prefetch_related)
+    return RelatedPlan(select_related, prefetch_related)
@@ -0,0 +1,97 @@
+import sqlite3
+from typing import Any, Dict, Optional, Type
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import DoesNotExist
+from tortoise.queryset import QuerySet
+
+from fastapi_manager.db.models.compiled import (
+    delete_by_pk,
+    get_by_pk,
+    get_update_fields,
+    update_by_pk,
+)
+from fastapi_manager.db.models.meta import MODEL
+
+
+def supports_returning(db: BaseDBAsyncClient) -> bool:
+    dialect = db.capabilities.dialect
+    if dialect == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 35)
+    return dialect == "postgres"
+
+
+async def update_returning(
+    queryset: QuerySet[MODEL], data: Dict[str, Any]
+) -> Optional[MODEL]:
+    """
+    Update first row matching queryset with data and return it,
+    in single UPDATE ... RETURNING * statement if database supports it,
+    otherwise with UPDATE and SELECT. None if no row matched.
+    """
+    query = queryset.update(**data)
+    db = query._db = query._db or queryset._choose_db(True)
+    if not supports_returning(db):
+        if not await query:
+            return None
+        return await queryset.using_db(db).first()
+
+    query._make_query()
+    _, rows = await db.execute_query(f"{query.query} RETURNING *", query.values)
+    return queryset.model._init_from_db(**rows[0]) if rows else None
+
+
+async def delete_returning(queryset: QuerySet[MODEL]) -> Optional[MODEL]:
+    """
+    Delete rows matching queryset and return first of them,
+    in single DELETE ... RETURNING * statement if database supports it,
+    otherwise with SELECT and DELETE. None if no row matched.
+    """
+    query = queryset.delete()
+    db = query._db = query._db or queryset._choose_db(True)
+    if not supports_returning(db):
+        instance = await queryset.using_db(db).first()
+        if instance is not None:
+            await query
+        return instance
+
+    query._make_query()
+    _, rows = await db.execute_query(f"{query.query} RETURNING *")
+    return queryset.model._init_from_db(**rows[0]) if rows else None
+
+
+async def update_returning_by_pk(
+    model: Type[MODEL], pk: Any, data: Dict[str, Any]
+) -> Optional[MODEL]:
+    """
+    update_returning of row by primary key with compiled UPDATE,
+    data with relations or expressions goes through queryset
+    """
+    fields = get_update_fields(model, data)
+    if fields is None:
+        return await update_returning(model.filter(pk=pk), data)
+    db = model._choose_db(True)
+    if not supports_returning(db):
+        if not await update_by_pk(model, pk, fields, data, db):
+            return None
+        return await get_by_pk(model, pk, db)
+
+    rows = await update_by_pk(model, pk, fields, data, db, returning=True)
+    return model._init_from_db(**rows[0]) if rows else None
+
+
+async def delete_returning_by_pk(model: Type[MODEL], pk: Any) -> Optional[MODEL]:
+    """
+    delete_returning of row by primary key with compiled DELETE
+    """
+    db = model._choose_db(True)
+    if not supports_returning(db):
+        try:
+            instance = await get_by_pk(model, pk, db)
+        except DoesNotExist:
+            return None
+        await delete_by_pk(model, pk, db)
+        return instance
+
+    rows = await delete_by_pk(model, pk, db, returning=True)
+    return model._init_from_db(**rows[0]) if rows else None
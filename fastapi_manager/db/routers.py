@@ -0,0 +1,125 @@
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Type,
+)
+
+from tortoise.backends.base.client import BaseTransactionWrapper
+from tortoise.connection import connections
+from tortoise.exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+BALANCERS = (ROUND_ROBIN, LEAST_OUTSTANDING)
+
+# connections written during current request, None outside of request
+_written: ContextVar[Optional[Set[str]]] = ContextVar("written", default=None)
+
+
+class ReplicaSet:
+    """
+    Replica connections of one primary and balancing of reads between them,
+    round robin or to replica with the fewest queries in flight
+    """
+
+    def __init__(self, aliases: List[str], balancer: str = ROUND_ROBIN):
+        if balancer not in BALANCERS:
+            raise ConfigurationError(
+                f"Unknown replica balancer {balancer!r}, choose one of {BALANCERS}"
+            )
+        if not aliases:
+            raise ConfigurationError("Replica set needs at least one replica")
+        self.aliases = list(aliases)
+        self.balancer = balancer
+        self.outstanding = dict.fromkeys(self.aliases, 0)
+        self._cycle = itertools.cycle(self.aliases)
+
+    def choose(self) -> str:
+        if self.balancer == LEAST_OUTSTANDING:
+            return min(self.aliases, key=self.outstanding.__getitem__)
+        return next(self._cycle)
+
+    def track(self) -> None:
+        """
+        Count queries in flight of replica clients, used by least_outstanding
+        """
+        for alias in self.aliases:
+            client = connections.get(alias)
+            for name in ("execute_query", "execute_query_dict"):
+                setattr(client, name, self._counted(alias, getattr(client, name)))
+
+    def _counted(self, alias: str, method: Callable) -> Callable:
+        @wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            self.outstanding[alias] += 1
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.outstanding[alias] -= 1
+
+        return wrapper
+
+
+# replica sets by primary connection alias, filled on ORM init
+replica_sets: Dict[str, ReplicaSet] = {}
+
+
+def configure_replicas(replicas: Dict[str, ReplicaSet]) -> None:
+    replica_sets.clear()
+    replica_sets.update(replicas)
+    for replica_set in replicas.values():
+        if replica_set.balancer == LEAST_OUTSTANDING:
+            replica_set.track()
+
+
+class ReplicaRouter:
+    """
+    Send reads of models whose connection has replicas to one of them.
+    Reads stay on primary inside transaction and, during request,
+    after request wrote to that connection, so it always reads its own writes.
+    Outside of request use transaction or using_db for that.
+    """
+
+    def db_for_read(self, model: Type["Model"]) -> Optional[str]:
+        alias = model._meta.default_connection
+        replica_set = replica_sets.get(alias)
+        if replica_set is None:
+            return None
+        written = _written.get()
+        if written is not None and alias in written:
+            return None
+        if isinstance(connections.get(alias), BaseTransactionWrapper):
+            return None
+        return replica_set.choose()
+
+    def db_for_write(self, model: Type["Model"]) -> None:
+        written = _written.get()
+        if written is not None:
+            written.add(model._meta.default_connection)
+        return None
+
+
+@contextmanager
+def primary_after_write() -> Iterator[Set[str]]:
+    """
+    Request scope of ReplicaRouter, yield aliases of connections written in it
+    """
+    token = _written.set(set())
+    try:
+        yield _written.get()
+    finally:
+        _written.reset(token)
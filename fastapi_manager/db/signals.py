@@ -0,0 +1,133 @@
+import asyncio
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+)
+
+from tortoise.exceptions import ConfigurationError
+
+from fastapi_manager.conf import settings
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+class BatchSignals(Enum):
+    """
+    Signals of bulk_create, bulk_update and queryset update/delete,
+    listener gets all instances of operation at once:
+
+        async def listener(sender, instances, using_db, update_fields): ...  # pre_save
+        async def listener(sender, instances, created, using_db, update_fields): ...  # post_save
+        async def listener(sender, instances, using_db): ...  # pre_delete, post_delete
+    """
+
+    pre_save = "pre_bulk_save"
+    post_save = "post_bulk_save"
+    pre_delete = "pre_bulk_delete"
+    post_delete = "post_bulk_delete"
+
+
+_batch_listeners: Dict[BatchSignals, Dict[Type["Model"], List[Callable]]] = {
+    signal: {} for signal in BatchSignals
+}
+
+
+def register_batch_listener(
+    model: Type["Model"], signal: BatchSignals, listener: Callable
+) -> None:
+    if not callable(listener):
+        raise ConfigurationError("Signal listener must be callable!")
+    listeners = _batch_listeners[signal].setdefault(model, [])
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def has_batch_listeners(model: Type["Model"], *signals: BatchSignals) -> bool:
+    return any(_batch_listeners[signal].get(model) for signal in signals)
+
+
+def _connect(signal: BatchSignals, senders: tuple) -> Callable:
+    def decorator(f):
+        for sender in senders:
+            register_batch_listener(sender, signal, f)
+        return f
+
+    return decorator
+
+
+def pre_bulk_save(*senders: Type["Model"]) -> Callable:
+    return _connect(BatchSignals.pre_save, senders)
+
+
+def post_bulk_save(*senders: Type["Model"]) -> Callable:
+    return _connect(BatchSignals.post_save, senders)
+
+
+def pre_bulk_delete(*senders: Type["Model"]) -> Callable:
+    return _connect(BatchSignals.pre_delete, senders)
+
+
+def post_bulk_delete(*senders: Type["Model"]) -> Callable:
+    return _connect(BatchSignals.post_delete, senders)
+
+
+async def gather_limited(
+    awaitables: Iterable[Awaitable[Any]], limit: Optional[int] = None
+) -> List[Any]:
+    """
+    asyncio.gather with at most limit awaitables running at once,
+    limit defaults to SIGNAL_CONCURRENCY setting, 0 or None is no limit
+    """
+    if limit is None:
+        limit = settings.SIGNAL_CONCURRENCY
+    if not limit:
+        return await asyncio.gather(*awaitables)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run(awaitable) for awaitable in awaitables))
+
+
+async def send_batch(
+    model: Type["Model"],
+    signal: BatchSignals,
+    instances: List["Model"],
+    *listener_args: Any,
+) -> None:
+    listeners = _batch_listeners[signal].get(model)
+    if not listeners or not instances:
+        return
+    await gather_limited(
+        listener(model, instances, *listener_args) for listener in listeners
+    )
+
+
+def each_instance(listener: Callable, limit: Optional[int] = None) -> Callable:
+    """
+    Adapt per instance listener (of tortoise.signals) to batch signal,
+    it's called for every instance, at most limit calls at once:
+
+        post_bulk_save(Item)(each_instance(on_item_saved))
+    """
+
+    async def batch_listener(
+        sender: Type["Model"], instances: List["Model"], *args: Any
+    ) -> None:
+        await gather_limited(
+            (listener(sender, instance, *args) for instance in instances), limit
+        )
+
+    batch_listener.listener = listener  # type: ignore[attr-defined]
+    return batch_listener
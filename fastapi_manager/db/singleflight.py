@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from tortoise.backends.base.client import BaseDBAsyncClient, BaseTransactionWrapper
+
+from fastapi_manager.db.queryset import Manager, QuerySet
+
+
+class SingleFlight:
+    """
+    Identical SELECTs running at the same time, keyed by connection, SQL
+    and parameters. First caller (leader) runs the query, callers arriving
+    while it is in flight (followers) await its rows instead of running their own.
+    Rows are shared, instances are still built by every caller.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def execute_query(
+        self, db: BaseDBAsyncClient, query: str, values: Optional[list] = None
+    ) -> Tuple[int, List[Any]]:
+        try:
+            key = (db.connection_name, query, tuple(values or ()))
+            hash(key)
+        except TypeError:
+            return await db.execute_query(query, values)
+
+        future = self._in_flight.get(key)
+        if future is None:
+            self.leaders += 1
+            future = self._in_flight[key] = asyncio.ensure_future(
+                db.execute_query(query, values)
+            )
+            future.add_done_callback(lambda _: self._discard(key, future))
+        else:
+            self.coalesced += 1
+        # shield: cancelled caller must not cancel query awaited by others
+        return await asyncio.shield(future)
+
+    def _discard(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced}
+
+    def reset(self) -> None:
+        self.leaders = self.coalesced = 0
+
+
+single_flight = SingleFlight()
+
+
+class SingleFlightClient:
+    """
+    Proxy of db client which coalesces SELECTs through single_flight,
+    everything else goes to wrapped client as is
+    """
+
+    __slots__ = ("client",)
+
+    def __init__(self, client: BaseDBAsyncClient):
+        self.client = client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def execute_query(
+        self, query: str, values: Optional[list] = None
+    ) -> Tuple[int, List[Any]]:
+        if query.lstrip()[:6].upper() != "SELECT":
+            return await self.client.execute_query(query, values)
+        return await single_flight.execute_query(self.client, query, values)
+
+
+def single_flight_db(db: BaseDBAsyncClient) -> BaseDBAsyncClient:
+    """
+    Wrap db for coalesced reads, transactions are returned as is: reads there
+    must see rows written by the same transaction
+    """
+    if isinstance(db, (BaseTransactionWrapper, SingleFlightClient)):
+        return db
+    return SingleFlightClient(db)  # type: ignore[return-value]
+
+
+class SingleFlightQuerySet(QuerySet):
+    """
+    QuerySet which coalesces its SELECT when it's executed
+    with default (not transaction) connection
+    """
+
+    __slots__ = ()
+
+    def _choose_db(self, for_write: bool = False) -> BaseDBAsyncClient:
+        if self._db or for_write:
+            return super()._choose_db(for_write)
+        return single_flight_db(super()._choose_db())
+
+
+class SingleFlightManager(Manager):
+    """
+    Default manager of Meta.single_flight models,
+    custom managers of such models should subclass it
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return SingleFlightQuerySet(self._model)
@@ -0,0 +1,3 @@
+from .base import FilterBackend, LOOKUPS
+
+__all__ = ["FilterBackend", "LOOKUPS"]
@@ -0,0 +1,152 @@
+import warnings
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, Request
+from pydantic import TypeAdapter, ValidationError
+from tortoise.exceptions import ConfigurationError
+from tortoise.queryset import QuerySet
+
+from fastapi_manager.pagination import CursorPagination
+
+# lookups which can be declared for filter field, "exact" is plain ?field=value
+LOOKUPS = ("exact", "range", "in", "icontains")
+
+FilterFields = Union[Sequence[str], Mapping[str, Sequence[str]]]
+
+
+@lru_cache(maxsize=None)
+def get_adapter(field_type: Any) -> TypeAdapter:
+    return TypeAdapter(field_type)
+
+
+class FilterBackend:
+    """
+    Filter list rows by query params with lookups of MetaInfo.filters:
+    ?rank=3, ?rank__range=1,5, ?id__in=1,2,3, ?title__icontains=abc,
+    and order them by ?ordering=-rank,title.
+
+    Params are compiled for model once, when route is registered,
+    so fields which can't be filtered raise ConfigurationError on startup.
+    Values are parsed with pydantic by field type, invalid ones answer 400.
+    """
+
+    ordering_query_param: str = "ordering"
+    separator: str = ","
+
+    def __init__(
+        self,
+        model,
+        filter_fields: FilterFields = (),
+        ordering_fields: Sequence[str] = (),
+    ):
+        self.model = model
+        # sequence of names is shortcut for exact lookups
+        if not isinstance(filter_fields, Mapping):
+            filter_fields = {name: ("exact",) for name in filter_fields}
+        # query param -> (model field name, lookup)
+        self.params: Dict[str, Tuple[str, str]] = self.compile(filter_fields)
+        self.ordering_fields = tuple(
+            self.get_field_name(name, "order") for name in ordering_fields
+        )
+        self.check_indexes()
+
+    def get_field_name(self, name: str, action: str) -> str:
+        meta = self.model._meta
+        name = meta.pk_attr if name == "pk" else name
+        if name not in meta.fields_db_projection:
+            raise ConfigurationError(
+                f"Can't {action} {meta.full_name} by '{name}', "
+                f"only model db fields are allowed"
+            )
+        return name
+
+    def compile(self, filter_fields: Mapping[str, Sequence[str]]):
+        meta = self.model._meta
+        params = {}
+        for name, lookups in filter_fields.items():
+            name = self.get_field_name(name, "filter")
+            for lookup in lookups:
+                if lookup not in LOOKUPS:
+                    raise ConfigurationError(
+                        f"Unknown lookup '{lookup}' of {meta.full_name}.{name}, "
+                        f"use one of {', '.join(LOOKUPS)}"
+                    )
+                param = name if lookup == "exact" else f"{name}__{lookup}"
+                try:
+                    meta.get_filter(param)
+                except KeyError:
+                    raise ConfigurationError(
+                        f"Can't filter {meta.full_name} by '{param}'"
+                    )
+                params[param] = (name, lookup)
+        return params
+
+    def check_indexes(self) -> None:
+        meta = self.model._meta
+        names = {name for name, _ in self.params.values()} | set(self.ordering_fields)
+        for name in sorted(names):
+            if not CursorPagination.is_indexed(self.model, name):
+                warnings.warn(
+                    f"{meta.full_name} can be filtered or ordered by not indexed "
+                    f"field '{name}', add it to Meta.indexes",
+                    RuntimeWarning,
+                )
+
+    def to_python(self, param: str, name: str, value: str) -> Any:
+        field_type = self.model._meta.fields_map[name].field_type
+        try:
+            return get_adapter(field_type).validate_python(value)
+        except ValidationError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid value of {param}: '{value}'"
+            )
+
+    def get_filters(self, request: Request) -> Dict[str, Any]:
+        filters = {}
+        for param, value in request.query_params.items():
+            compiled = self.params.get(param)
+            if compiled is None:
+                continue
+            name, lookup = compiled
+            if lookup == "icontains":
+                filters[param] = value
+            elif lookup in ("in", "range"):
+                values = [
+                    self.to_python(param, name, item)
+                    for item in value.split(self.separator)
+                    if item
+                ]
+                if lookup == "range" and len(values) != 2:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"{param} must be two values separated "
+                        f"by '{self.separator}'",
+                    )
+                filters[param] = values
+            else:
+                filters[param] = self.to_python(param, name, value)
+        return filters
+
+    def filter_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        filters = self.get_filters(request)
+        return queryset.filter(**filters) if filters else queryset
+
+    def get_ordering(self, request: Request) -> Optional[Tuple[str, ...]]:
+        """
+        Requested ordering in tortoise format e.g. ("-rank", "id"),
+        None if it isn't asked
+        """
+        value = request.query_params.get(self.ordering_query_param)
+        if not value or not self.ordering_fields:
+            return None
+        ordering = []
+        for item in value.split(self.separator):
+            item = item.strip()
+            name = item[1:] if item.startswith("-") else item
+            if not name:
+                continue
+            if name not in self.ordering_fields:
+                raise HTTPException(status_code=400, detail=f"Can't order by '{name}'")
+            ordering.append(item)
+        return tuple(dict.fromkeys(ordering)) or None
@@ -0,0 +1,13 @@
+from .base import BasePagination, CursorPagination, LimitOffsetPagination
+from .counts import CachedCount, CountStrategy, EstimatedCount, ExactCount, HasMore
+
+__all__ = [
+    "BasePagination",
+    "CursorPagination",
+    "LimitOffsetPagination",
+    "CachedCount",
+    "CountStrategy",
+    "EstimatedCount",
+    "ExactCount",
+    "HasMore",
+]
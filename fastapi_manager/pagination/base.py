@@ -0,0 +1,309 @@
+import base64
+import binascii
+import datetime
+import json
+import warnings
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, create_model
+from tortoise.exceptions import ConfigurationError
+from tortoise.queryset import Q, QuerySet
+
+from fastapi_manager.conf import settings
+from fastapi_manager.db.iterators import keyset_filter
+from fastapi_manager.schemas import schemas
+
+from .counts import CountStrategy, HasMore
+
+
+# (model field name, descending)
+Ordering = Tuple[Tuple[str, bool], ...]
+
+
+class BasePagination(ABC):
+    """
+    Base class for list pagination, view call paginate_queryset on the unevaluated
+    queryset and get dict that match envelope model from get_envelope_model.
+    """
+
+    # if not set, PAGE_SIZE and MAX_PAGE_SIZE from settings are used
+    page_size: Optional[int] = None
+    max_page_size: Optional[int] = None
+    limit_query_param: str = "limit"
+
+    # fields to order by, in tortoise format e.g. ("-created_at", "id"),
+    # if not set, Meta.ordering of model is used, or primary key
+    ordering: Optional[Tuple[str, ...]] = None
+
+    envelope_suffix: str = "Page"
+
+    def __init__(self, count_strategy: Optional[CountStrategy] = None):
+        self._orderings: dict[tuple, Ordering] = {}
+        self.count_strategy = count_strategy or HasMore()
+
+    def get_page_size(self) -> int:
+        return self.page_size or settings.PAGE_SIZE
+
+    def get_max_page_size(self) -> int:
+        return self.max_page_size or settings.MAX_PAGE_SIZE
+
+    def get_limit(self, request: Request) -> int:
+        limit = request.query_params.get(self.limit_query_param)
+        try:
+            limit = int(limit) if limit is not None else self.get_page_size()
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"{self.limit_query_param} must be integer"
+            )
+        return max(1, min(limit, self.get_max_page_size()))
+
+    def get_ordering(
+        self, model, ordering: Optional[Tuple[str, ...]] = None
+    ) -> Ordering:
+        """
+        Ordering of model, requested one (e.g. ?ordering= of filter backend)
+        takes place of paginator and Meta.ordering
+        """
+        key = (model, ordering)
+        if key not in self._orderings:
+            self._orderings[key] = self.build_ordering(model, ordering)
+        return self._orderings[key]
+
+    def build_ordering(
+        self, model, ordering: Optional[Tuple[str, ...]] = None
+    ) -> Ordering:
+        meta = model._meta
+        names = ordering if ordering is not None else self.ordering
+        if names is not None:
+            ordering = [
+                (name[1:], True) if name.startswith("-") else (name, False)
+                for name in names
+            ]
+        else:
+            ordering = [
+                (name, order.value.upper() == "DESC")
+                for name, order in meta.ordering
+            ]
+
+        ordering = [
+            (meta.pk_attr if name == "pk" else name, desc) for name, desc in ordering
+        ]
+        for name, _ in ordering:
+            if name not in meta.fields_db_projection:
+                raise ConfigurationError(
+                    f"Can't paginate {meta.full_name} by '{name}', "
+                    f"only model db fields are allowed"
+                )
+
+        # primary key is always last to make order strict
+        if meta.pk_attr not in {name for name, _ in ordering}:
+            ordering.append((meta.pk_attr, ordering[-1][1] if ordering else False))
+        return tuple(ordering)
+
+    @staticmethod
+    def order_by(ordering: Ordering, reverse: bool = False) -> List[str]:
+        return [
+            f"-{name}" if desc is not reverse else name for name, desc in ordering
+        ]
+
+    def get_envelope_model(self, item_model: type[BaseModel]) -> type[BaseModel]:
+        # tortoise generated models are all named "leaf", title keep model name
+        name = item_model.model_config.get("title") or item_model.__name__
+        counts = self.count_strategy.counts
+        return schemas.get_or_create(
+            (type(self), item_model, counts),
+            lambda: create_model(
+                f"{name}{self.envelope_suffix}",
+                **self.get_envelope_fields(item_model),
+                **({"count": (Optional[int], None)} if counts else {}),
+            ),
+        )
+
+    async def add_count(self, page: dict, queryset: QuerySet) -> dict:
+        """
+        Set total of queryset rows on page, if count strategy has it
+        """
+        if self.count_strategy.counts:
+            page["count"] = await self.count_strategy.count(queryset)
+        return page
+
+    @abstractmethod
+    def get_envelope_fields(self, item_model: type[BaseModel]) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        ordering: Optional[Tuple[str, ...]] = None,
+    ) -> dict[str, Any]:
+        raise NotImplementedError
+
+
+class LimitOffsetPagination(BasePagination):
+    """
+    Simple ?limit=&offset= pagination, use it only when client need jump to page,
+    big offsets still scan all skipped rows.
+    """
+
+    offset_query_param: str = "offset"
+    envelope_suffix = "LimitOffsetPage"
+
+    def get_offset(self, request: Request) -> int:
+        offset = request.query_params.get(self.offset_query_param, 0)
+        try:
+            return max(0, int(offset))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"{self.offset_query_param} must be integer"
+            )
+
+    def get_envelope_fields(self, item_model):
+        return dict(
+            results=(List[item_model], ...),
+            limit=(int, ...),
+            offset=(int, ...),
+            next=(Optional[int], None),
+            previous=(Optional[int], None),
+        )
+
+    async def paginate_queryset(self, queryset, request, ordering=None):
+        limit = self.get_limit(request)
+        offset = self.get_offset(request)
+        ordering = self.get_ordering(queryset.model, ordering)
+
+        # one extra row tells us if there is next page without COUNT(*)
+        rows = await queryset.order_by(*self.order_by(ordering)).offset(offset).limit(
+            limit + 1
+        )
+        page = {
+            "results": rows[:limit],
+            "limit": limit,
+            "offset": offset,
+            "next": offset + limit if len(rows) > limit else None,
+            "previous": max(offset - limit, 0) if offset else None,
+        }
+        return await self.add_count(page, queryset)
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset pagination, page is selected by WHERE on ordering fields instead of OFFSET,
+    so every page cost the same if ordering fields are indexed.
+    Cursor is opaque urlsafe base64 json with ordering values of the border row.
+
+    Ordering fields should be non nullable, primary key is added as tiebreaker.
+    """
+
+    cursor_query_param: str = "cursor"
+    envelope_suffix = "CursorPage"
+
+    def build_ordering(self, model, ordering=None) -> Ordering:
+        requested = ordering is not None
+        ordering = super().build_ordering(model, ordering)
+        name, _ = ordering[0]
+        # requested ordering is allowed by view, which is warned on registration
+        if not requested and not self.is_indexed(model, name):
+            warnings.warn(
+                f"Cursor pagination of {model._meta.full_name} ordered by not indexed "
+                f"field '{name}', falling back to primary key ordering",
+                RuntimeWarning,
+            )
+            return ((model._meta.pk_attr, False),)
+        return ordering
+
+    @staticmethod
+    def is_indexed(model, field_name: str) -> bool:
+        meta = model._meta
+        field = meta.fields_map[field_name]
+        if field.pk or field.unique or field.index:
+            return True
+        for together in (*meta.indexes, *meta.unique_together):
+            fields = getattr(together, "fields", together)
+            if fields and fields[0] == field_name:
+                return True
+        return False
+
+    def get_envelope_fields(self, item_model):
+        return dict(
+            results=(List[item_model], ...),
+            next=(Optional[str], None),
+            previous=(Optional[str], None),
+        )
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        return str(value)
+
+    def encode_cursor(self, row, ordering: Ordering, reverse: bool) -> str:
+        position = [getattr(row, name) for name, _ in ordering]
+        payload = json.dumps(
+            {"p": position, "r": int(reverse)},
+            default=self._encode_value,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(
+        self, request: Request, model, ordering: Ordering
+    ) -> Optional[Tuple[list, bool]]:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+            position, reverse = payload["p"], bool(payload["r"])
+            if len(position) != len(ordering):
+                raise ValueError("cursor doesn't match ordering")
+            fields_map = model._meta.fields_map
+            position = [
+                fields_map[name].to_python_value(value)
+                for (name, _), value in zip(ordering, position)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return position, reverse
+
+    @staticmethod
+    def keyset_filter(ordering: Ordering, position: list, reverse: bool) -> Q:
+        """
+        (a > x) OR (a = x AND b > y) OR ... for every ordering field
+        """
+        return keyset_filter(ordering, position, reverse)
+
+    async def paginate_queryset(self, queryset, request, ordering=None):
+        limit = self.get_limit(request)
+        ordering = self.get_ordering(queryset.model, ordering)
+        cursor = self.decode_cursor(request, queryset.model, ordering)
+        # total is of all matching rows, not ones after cursor
+        counted = queryset
+
+        reverse = False
+        if cursor is not None:
+            position, reverse = cursor
+            queryset = queryset.filter(self.keyset_filter(ordering, position, reverse))
+
+        rows = await queryset.order_by(*self.order_by(ordering, reverse)).limit(
+            limit + 1
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = self.encode_cursor(rows[-1], ordering, False)
+            if (has_more and reverse) or (cursor is not None and not reverse):
+                previous_cursor = self.encode_cursor(rows[0], ordering, True)
+
+        page = {"results": rows, "next": next_cursor, "previous": previous_cursor}
+        return await self.add_count(page, counted)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional, Type, Union
+
+from tortoise.log import logger
+from tortoise.queryset import QuerySet
+
+from fastapi_manager.cache import (
+    BaseCache,
+    caches,
+    count_generation_key,
+    track_counts,
+)
+
+
+class CountStrategy(ABC):
+    """
+    How pagination envelope get total number of rows, set per viewset
+    with count_strategy or per service, see BaseService.get_count_strategy.
+    Paginator count the filtered queryset before it's ordered and limited.
+    """
+
+    # envelope has count field, False keep page without total
+    counts: bool = True
+
+    @abstractmethod
+    async def count(self, queryset: QuerySet) -> Optional[int]:
+        raise NotImplementedError
+
+
+class HasMore(CountStrategy):
+    """
+    No total at all, next of page tell whether there are more rows,
+    which paginator knows from one extra fetched row
+    """
+
+    counts = False
+
+    async def count(self, queryset):
+        return None
+
+
+class ExactCount(CountStrategy):
+    """
+    SELECT COUNT(*) of every page, full scan of matching rows on big tables
+    """
+
+    async def count(self, queryset):
+        return await queryset.count()
+
+
+class CachedCount(ExactCount):
+    """
+    Exact count kept in cache for timeout seconds.
+
+    Keys of model counts include generation which is replaced on every write of
+    model (save, delete, queryset update and delete, bulk writes and writes of
+    services), so counts of all filters are dropped at once
+    """
+
+    def __init__(self, timeout: Optional[float] = 60, alias: str = "default"):
+        self.timeout = timeout
+        self.alias = alias
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    @staticmethod
+    def generation_key(model: Type) -> str:
+        return count_generation_key(model)
+
+    async def get_generation(self, model: Type) -> str:
+        key = self.generation_key(model)
+        generation = await self.cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            await self.cache.set(key, generation, timeout=None)
+        return generation
+
+    async def count(self, queryset):
+        model = queryset.model
+        track_counts(model, self.alias)
+        query = queryset.count()
+        generation = await self.get_generation(model)
+        digest = hashlib.sha1(query.sql().encode()).hexdigest()
+        key = f"{self.generation_key(model)}:{generation}:{digest}"
+        count = await self.cache.get(key)
+        if count is None:
+            count = await query
+            await self.cache.set(key, count, timeout=self.timeout)
+        return count
+
+
+class EstimatedCount(ExactCount):
+    """
+    Planner estimate on postgres: pg_class.reltuples of table for unfiltered
+    queryset, "Plan Rows" of EXPLAIN of its SELECT for filtered one. Estimates
+    are as fresh as last ANALYZE. Other databases and never analyzed tables
+    get exact count
+    """
+
+    async def count(self, queryset):
+        db = queryset._choose_db()
+        if db.capabilities.dialect != "postgres":
+            return await super().count(queryset)
+        if queryset._q_objects or queryset._custom_filters:
+            estimate = await self.explain(db, queryset)
+        else:
+            estimate = await self.reltuples(db, queryset.model._meta.db_table)
+        if estimate is None or estimate < 0:
+            return await super().count(queryset)
+        return int(estimate)
+
+    @staticmethod
+    async def reltuples(db, table: str) -> Optional[float]:
+        rows = await db.execute_query_dict(
+            "SELECT reltuples FROM pg_class WHERE oid = to_regclass($1)", [f'"{table}"']
+        )
+        return rows[0]["reltuples"] if rows else None
+
+    @staticmethod
+    async def explain(db, queryset: QuerySet) -> Optional[float]:
+        # plan of rows themselves, COUNT(*) may be parallel aggregate whose
+        # children are partial aggregates, not matching rows
+        rows = await db.execute_query_dict(f"EXPLAIN (FORMAT JSON) {queryset.sql()}")
+        plan: Union[str, list] = rows[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return plan[0]["Plan"]["Plan Rows"]
+        except (KeyError, IndexError, TypeError):
+            logger.warning("Unexpected EXPLAIN output: %s", plan)
+            return None
@@ -0,0 +1,25 @@
+from .conditional import (
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
+from .json import RawJSONResponse
+from .streaming import (
+    ModelStreamingResponse,
+    NDJSONStreamingResponse,
+    JSONArrayStreamingResponse,
+    STREAMING_FORMATS,
+)
+
+__all__ = [
+    "is_conditional",
+    "is_not_modified",
+    "make_etag",
+    "validator_headers",
+    "RawJSONResponse",
+    "ModelStreamingResponse",
+    "NDJSONStreamingResponse",
+    "JSONArrayStreamingResponse",
+    "STREAMING_FORMATS",
+]
@@ -0,0 +1,61 @@
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict
+
+from fastapi import Request
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag of parts which identify representation, e.g. pk, version and query,
+    it's derived from data version, not from response bytes
+    """
+    digest = hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _aware(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def http_date(value: datetime.datetime) -> str:
+    return format_datetime(_aware(value).astimezone(datetime.timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Any = None) -> Dict[str, str]:
+    """
+    ETag and, if version is a timestamp, Last-Modified headers
+    """
+    headers = {"ETag": etag}
+    if isinstance(last_modified, datetime.datetime):
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Any = None) -> bool:
+    """
+    Whether client copy is fresh: If-None-Match has etag (weak comparison),
+    or, without If-None-Match, If-Modified-Since is not before last_modified
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or not isinstance(last_modified, datetime.datetime):
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # http dates have no fraction of second
+    return _aware(last_modified).replace(microsecond=0) <= _aware(since)
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+class RawJSONResponse(JSONResponse):
+    """
+    Response with content already serialized to json bytes
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
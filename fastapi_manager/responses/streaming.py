@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List
+
+from fastapi.responses import StreamingResponse
+
+RowEncoder = Callable[[Any], bytes]
+
+
+class ModelStreamingResponse(StreamingResponse, ABC):
+    """
+    Stream chunks of model instances, every chunk is encoded and sent
+    as soon as it is fetched, so only one chunk is kept in memory.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterable[List[Any]], encoder: RowEncoder, **kwargs
+    ) -> None:
+        self.encoder = encoder
+        super().__init__(self.render_chunks(chunks), **kwargs)
+
+    @abstractmethod
+    def render_chunks(self, chunks: AsyncIterable[List[Any]]) -> AsyncIterator[bytes]:
+        """
+        Async generator of response body parts, one part per chunk
+        """
+
+
+class NDJSONStreamingResponse(ModelStreamingResponse):
+    """
+    One json object per line
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def render_chunks(self, chunks):
+        encoder = self.encoder
+        async for chunk in chunks:
+            if chunk:
+                yield b"".join([encoder(row) + b"\n" for row in chunk])
+
+
+class JSONArrayStreamingResponse(ModelStreamingResponse):
+    """
+    Regular json array, sent by parts
+    """
+
+    media_type = "application/json"
+
+    async def render_chunks(self, chunks):
+        encoder = self.encoder
+        separator = b"["
+        async for chunk in chunks:
+            if chunk:
+                yield separator + b",".join([encoder(row) for row in chunk])
+                separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
+# formats for ?stream= query param of list endpoints
+STREAMING_FORMATS: dict[str, type[ModelStreamingResponse]] = {
+    "ndjson": NDJSONStreamingResponse,
+    "json": JSONArrayStreamingResponse,
+}
@@ -1,10 +1,46 @@
-from contextlib import asynccontextmanager
+from contextlib import ExitStack, asynccontextmanager
 from importlib import import_module
-from fastapi import APIRouter, FastAPI
+from typing import Callable, Coroutine, Any
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from tortoise.log import logger
 from fastapi_manager.conf import settings
+from fastapi_manager.db.identity import identity_map
+from fastapi_manager.db.querylog import detect_n_plus_one
+from fastapi_manager.db.routers import primary_after_write
+from fastapi_manager.schemas import schemas
+
+
+class RequestScopeRoute(APIRoute):
+    """
+    Run endpoint with request scoped identity map, see fastapi_manager.db.identity,
+    and reads routed to primary after request wrote, see fastapi_manager.db.routers.
+    In DEBUG repeated statements are logged, see fastapi_manager.db.querylog
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            with ExitStack() as stack:
+                if settings.IDENTITY_MAP:
+                    stack.enter_context(identity_map())
+                stack.enter_context(primary_after_write())
+                if settings.DEBUG and settings.N_PLUS_ONE_THRESHOLD:
+                    stack.enter_context(
+                        detect_n_plus_one(
+                            settings.N_PLUS_ONE_THRESHOLD,
+                            f"{request.method} {request.url.path}",
+                        )
+                    )
+                return await handler(request)
+
+        return route_handler
 
 
 class BaseRouter(APIRouter):
+    def __init__(self, *args, route_class=RequestScopeRoute, **kwargs):
+        super().__init__(*args, route_class=route_class, **kwargs)
 
     @classmethod
     def as_view(cls, **initkwargs):
@@ -26,4 +62,6 @@ async def resolve_endpoints(app: FastAPI):
     for endpoint in endpoints:
         app.include_router(endpoint)
 
+    logger.info("Pydantic schemas resolved: %s", schemas.stats())
+
     yield
@@ -0,0 +1,4 @@
+from .bulk import BulkResult
+from .registry import SchemaRegistry, schemas
+
+__all__ = ["BulkResult", "SchemaRegistry", "schemas"]
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class BulkResult(BaseModel):
+    """
+    Response of bulk endpoints, number of created, updated or deleted rows
+    """
+
+    count: int
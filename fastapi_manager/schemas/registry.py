@@ -0,0 +1,178 @@
+import copy
+import hashlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from pydantic import BaseModel, create_model
+from tortoise.contrib.pydantic import PydanticModel, pydantic_model_creator
+
+if TYPE_CHECKING:
+    from fastapi_manager.db.models import Model
+
+
+class SchemaRegistry:
+    """
+    Process wide cache of pydantic models generated from ORM models,
+    so every viewset, action and openapi schema use the same class
+    instead of building new one with pydantic_model_creator.
+
+    Also cache Model.describe(), which is called by pydantic_model_creator
+    for every model and related model. Each call gets own copy of cached value,
+    as pydantic_model_creator mutates description (e.g. drops readOnly).
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(SchemaRegistry, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "initialized"):
+            return
+        self.initialized = True
+
+        self._schemas: Dict[Hashable, Type[BaseModel]] = {}
+        self._descriptions: Dict[Tuple[Type["Model"], bool], dict] = {}
+        self.built = 0
+        self.reused = 0
+
+    def get(
+        self,
+        model: Type["Model"],
+        name: Optional[str] = None,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        computed: Iterable[str] = (),
+        **options: Any,
+    ) -> Type[PydanticModel]:
+        """
+        Return pydantic model for ORM model, build it on first call.
+        Options are passed to pydantic_model_creator and must be hashable.
+        """
+        include, exclude, computed = tuple(include), tuple(exclude), tuple(computed)
+        key = (
+            model,
+            name,
+            frozenset(include),
+            frozenset(exclude),
+            computed,
+            tuple(sorted(options.items())),
+        )
+        if name is None and any(key[2:]):
+            # tortoise name field-only models "<model>.leaf" whatever include/exclude
+            # are and return the first one built, so subsets need own name
+            digest = hashlib.sha1(repr(key[2:]).encode()).hexdigest()[:8]
+            name = f"{model.__module__}.{model.__qualname__}:{digest}"
+            options.setdefault("model_config", {"title": model.__name__})
+
+        return self.get_or_create(
+            key,
+            lambda: pydantic_model_creator(
+                model,
+                name=name,
+                include=include,
+                exclude=exclude,
+                computed=computed,
+                **options,
+            ),
+        )
+
+    def get_or_create(
+        self, key: Hashable, factory: Callable[[], Type[BaseModel]]
+    ) -> Type[BaseModel]:
+        """
+        Return schema cached by key or build it with factory,
+        used for schemas derived from generated ones e.g. pagination envelopes
+        """
+        try:
+            schema = self._schemas[key]
+        except KeyError:
+            schema = self._schemas[key] = factory()
+            self.built += 1
+        else:
+            self.reused += 1
+        return schema
+
+    def project(
+        self, schema: Type[BaseModel], fields: Iterable[str]
+    ) -> Type[BaseModel]:
+        """
+        Return model with only given fields of schema, in schema order,
+        e.g. response model of ?fields= sparse fieldset
+        """
+        fields = set(fields)
+        model_fields = schema.model_fields
+        names = tuple(name for name in model_fields if name in fields)
+        return self.get_or_create(
+            ("project", schema, names),
+            lambda: create_model(
+                schema.__name__,
+                __config__=schema.model_config,
+                **{
+                    name: (model_fields[name].annotation, model_fields[name])
+                    for name in names
+                },
+            ),
+        )
+
+    def get_input(self, model: Type["Model"], partial: bool = False) -> Type[BaseModel]:
+        """
+        Return model of data written to ORM model, readonly fields excluded.
+        Partial one has every field optional (null is still validated)
+        and primary key, as id or pk, to find the row
+        """
+        schema = self.get(model, exclude_readonly=True)
+        if not partial:
+            return schema
+        meta = model._meta
+        pk_type = Optional[meta.pk.field_type]
+        return self.get_or_create(
+            ("partial", schema),
+            lambda: create_model(
+                f"{model.__name__}PartialInput",
+                **{
+                    name: (field.annotation, None)
+                    for name, field in schema.model_fields.items()
+                },
+                **{meta.pk_attr: (pk_type, None), "pk": (pk_type, None)},
+            ),
+        )
+
+    def describe(self, model: Type["Model"], serializable: bool = True) -> dict:
+        # relations are set on tortoise init, don't cache description before it
+        if not model._meta._inited:
+            return model._describe(serializable)
+
+        key = (model, serializable)
+        if key not in self._descriptions:
+            self._descriptions[key] = model._describe(serializable)
+        return copy.deepcopy(self._descriptions[key])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "schemas": len(self._schemas),
+            "built": self.built,
+            "reused": self.reused,
+        }
+
+    def clear(self) -> None:
+        """
+        Drop all cached schemas, called on ORM init as relations may change
+        """
+        self._schemas.clear()
+        self._descriptions.clear()
+        self.built = self.reused = 0
+
+
+schemas = SchemaRegistry()
@@ -0,0 +1,3 @@
+from .base import ModelSerializer, build_encoder, dumps
+
+__all__ = ["ModelSerializer", "build_encoder", "dumps"]
@@ -0,0 +1,129 @@
+import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+from tortoise.exceptions import ConfigurationError
+from tortoise.fields import JSONField
+
+from fastapi_manager.db.models import Model
+
+try:
+    import orjson
+except ImportError:  # pragma: nocoverage
+    orjson = None
+
+
+# values of these types are written by both orjson and pydantic as is
+JSON_NATIVE = {
+    str,
+    int,
+    float,
+    bool,
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+    UUID,
+}
+
+
+def _str(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Serialize builtins to json bytes, with orjson if it is installed
+    """
+    if orjson is not None:
+        # UTC as "Z" like pydantic writes it
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return to_json(data)
+
+
+@lru_cache(maxsize=None)
+def build_encoder(
+    model: Type[Model], fields: Tuple[str, ...]
+) -> Callable[[Model], Dict[str, Any]]:
+    """
+    Build function which convert model instance to dict of json friendly values
+    for given model fields, without any validation.
+
+    Values from db_native_fields and db_default_fields are already python values
+    of the field type after _init_from_db, so only types unknown to json encoder
+    are converted: Decimal to string as pydantic does, other unknown types
+    with to_jsonable_python. JSONField values are already decoded.
+    """
+    meta = model._meta
+    db_fields = {
+        model_field: field
+        for _, model_field, field in (
+            *meta.db_native_fields,
+            *meta.db_default_fields,
+            *meta.db_complex_fields,
+        )
+    }
+
+    namespace: Dict[str, Any] = {
+        "_convert": to_jsonable_python,
+        "_str": _str,
+    }
+    items = []
+    for name in fields:
+        if name not in db_fields:
+            raise ConfigurationError(
+                f"Fast serialization of {meta.full_name} supports only db fields, "
+                f"'{name}' is not a db field"
+            )
+        field = db_fields[name]
+        field_type = field.field_type
+        if isinstance(field, JSONField):
+            # already decoded to dicts and lists by field
+            items.append(f"{name!r}: obj.{name}")
+        elif field_type is Decimal:
+            items.append(f"{name!r}: _str(obj.{name})")
+        elif field_type not in JSON_NATIVE:
+            items.append(f"{name!r}: _convert(obj.{name})")
+        else:
+            items.append(f"{name!r}: obj.{name}")
+
+    source = "def encode(obj):\n    return {" + ", ".join(items) + "}\n"
+    exec(compile(source, f"<{meta.full_name} encoder>", "exec"), namespace)
+    return namespace["encode"]
+
+
+class ModelSerializer:
+    """
+    Serialize model instances straight to json bytes with encoder built from model
+    meta, field set is taken from pydantic schema which is still published in openapi.
+    """
+
+    def __init__(self, model: Type[Model], schema: Type[BaseModel]):
+        self.model = model
+        self.schema = schema
+        self.encode = build_encoder(model, tuple(schema.model_fields))
+
+    def to_builtins(self, data: Any) -> Any:
+        """
+        Encode model instances inside of lists and dicts e.g. pagination envelope
+        """
+        if isinstance(data, self.model):
+            return self.encode(data)
+        if isinstance(data, (list, tuple)):
+            encode = self.encode
+            return [
+                encode(row) if isinstance(row, self.model) else self.to_builtins(row)
+                for row in data
+            ]
+        if isinstance(data, dict):
+            return {key: self.to_builtins(value) for key, value in data.items()}
+        return data
+
+    def dumps(self, data: Any) -> bytes:
+        return dumps(self.to_builtins(data))
+
+    def dumps_row(self, row: Model) -> bytes:
+        return dumps(self.encode(row))
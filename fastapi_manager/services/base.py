@@ -1,7 +1,37 @@
-from typing import TypeVar, Generic, Any
+from typing import (
+    TypeVar,
+    Generic,
+    Any,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from contextlib import contextmanager
 
 from fastapi import HTTPException, Request
+from tortoise import timezone
+from tortoise.exceptions import DoesNotExist, IntegrityError, ValidationError
+from tortoise.functions import Count, Max
+from tortoise.queryset import QuerySet
+from tortoise.signals import Signals
+from tortoise.transactions import in_transaction
+from fastapi_manager.cache import cache_key, get_model_cache, invalidate
+from fastapi_manager.conf import settings
+from fastapi_manager.db.identity import forget
+from fastapi_manager.db.iterators import iterate_chunks
+from fastapi_manager.db.related import RelatedPlan
+from fastapi_manager.db.returning import (
+    delete_returning_by_pk,
+    update_returning_by_pk,
+)
 from fastapi_manager.db.models import Model
+from fastapi_manager.filters import FilterBackend
+from fastapi_manager.pagination import BasePagination, CountStrategy
+from fastapi_manager.utils.module_loading import import_string
 from abc import ABC, abstractmethod
 from fastapi_manager.db.models import PK
 
@@ -9,6 +39,17 @@ from fastapi_manager.db.models import PK
 _ORM_MODEL = TypeVar("_ORM_MODEL", bound=Model)
 
 
+@contextmanager
+def bulk_errors():
+    # items rejected by database or field validators are client errors
+    try:
+        yield
+    except IntegrityError as error:
+        raise HTTPException(status_code=409, detail=str(error))
+    except ValidationError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+
 class AbstractService(ABC):
 
     @abstractmethod
@@ -16,7 +57,7 @@ class AbstractService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def select(self, request):
+    async def select(self, request, paginator=None):
         raise NotImplementedError
 
     @abstractmethod
@@ -35,29 +76,332 @@ class AbstractService(ABC):
 class BaseService(Generic[_ORM_MODEL], AbstractService):
     model: type[_ORM_MODEL]
 
+    # update and delete with single UPDATE/DELETE ... RETURNING statement,
+    # instances are loaded and saved only if model has save/delete listeners
+    single_statement_writes: bool = True
+
+    # total of paginated select, CountStrategy instance, class or dotted path,
+    # settings.DEFAULT_COUNT_STRATEGY if not set, viewsets may override it
+    count_strategy: Union[CountStrategy, type[CountStrategy], str, None] = None
+
+    # relations loaded with rows of select, get and stream, see RelatedPlan,
+    # viewsets add ones inferred from their response model
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+
+    def get_related_plan(self, related: Optional[RelatedPlan] = None) -> RelatedPlan:
+        plan = RelatedPlan(self.select_related, self.prefetch_related)
+        return plan | related if related else plan
+
     async def insert(self, data: dict[str, Any], request: Request):
         return await self.model.create(**data)
 
-    async def get(self, pk: PK, request: Request):
-        return await self.model.get(pk=pk)
+    async def get(
+        self,
+        pk: PK,
+        request: Request,
+        related: Optional[RelatedPlan] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ):
+        """
+        Read through cache of model if it opted in with Meta.cache,
+        relations of plan are fetched for the row (cached without them).
+        With fields only these columns are loaded, cached row is returned whole.
+        Overridden get_queryset scopes the row, cache is skipped then
+        """
+        cache = get_model_cache(self.model)
+        if self._overrides("get_queryset"):
+            lookup = self.get_queryset(request).get(pk=pk)
+            obj = await (lookup.only(*fields) if fields else lookup)
+        elif cache is None:
+            lookup = self.model.get(pk=pk)
+            obj = await (lookup.only(*fields) if fields else lookup)
+        else:
+            key = cache_key(self.model, self.to_pk(pk))
+            obj = await cache.get(key)
+            if obj is None:
+                obj = await self.model.get(pk=pk)
+                await cache.set(key, obj, self.model._meta.cache_timeout)
+        await self.get_related_plan(related).fetch(self.model, [obj])
+        return obj
+
+    async def get_version(
+        self, pk: PK, field: str, request: Request
+    ) -> Optional[Tuple[Any]]:
+        """
+        (version,) of row for conditional requests, from cached object
+        if model opted in with Meta.cache, else SELECT of the single column
+        of get_queryset. None if there is no such row.
+
+        Services overriding get must override this one too, with the same
+        scope or checks, until then None is returned and row is got as usual
+        """
+        if self._overrides("get"):
+            return None
+        cache = get_model_cache(self.model)
+        if cache is not None and not self._overrides("get_queryset"):
+            obj = await cache.get(cache_key(self.model, self.to_pk(pk)))
+            if obj is not None:
+                return (getattr(obj, field),)
+        queryset = self.get_queryset(request).filter(pk=pk)
+        return await queryset.first().values_list(field)
+
+    async def get_fingerprint(
+        self, request: Request, field: str, filters: Optional[FilterBackend] = None
+    ) -> Tuple[Any, int]:
+        """
+        Max version and count of rows select would return, one aggregate query.
+        Max of timestamp like modified_at moves on every write,
+        per row version counters miss updates of rows other than the newest
+        """
+        queryset = self.get_queryset(request)
+        if filters is not None:
+            queryset = filters.filter_queryset(queryset, request)
+        row = await (
+            queryset.annotate(
+                _version=Max(field), _rows=Count(self.model._meta.pk_attr)
+            )
+            .first()
+            .values("_version", "_rows")
+        )
+        version = row["_version"]
+        if version is not None:
+            # aggregates come as raw db values, e.g. text datetimes of sqlite
+            version = self.model._meta.fields_map[field].to_python_value(version)
+        return version, row["_rows"]
 
     async def delete(self, pk: PK, request: Request):
-        obj = await self.model.get(pk=pk)
-        if not obj:
+        if self.writes_single_statement(Signals.pre_delete, Signals.post_delete):
+            obj = await delete_returning_by_pk(self.model, self.to_pk(pk))
+            if obj is not None:
+                await self.invalidate(obj.pk)
+        else:
+            obj = await self.get_for_write(pk, request)
+            if obj is not None:
+                await obj.delete()
+        if obj is None:
             raise HTTPException(status_code=404, detail=f"{self.model} Not found")
-        await obj.delete()
         return obj
 
     async def update(self, pk: PK, data: dict[str, Any], request: Request):
-        obj = await self.get(pk, request)
-        if not obj:
+        data = self.get_update_data(data)
+        if not data:
+            obj = await self.get_for_write(pk, request)
+        elif self.writes_single_statement(Signals.pre_save, Signals.post_save):
+            obj = await update_returning_by_pk(self.model, self.to_pk(pk), data)
+            if obj is not None:
+                await self.invalidate(obj.pk)
+        else:
+            obj = await self.get_for_write(pk, request)
+            if obj is not None:
+                obj.update_from_dict(data)
+                await obj.save(update_fields=list(data))
+        if obj is None:
             raise HTTPException(status_code=404, detail=f"{self.model} Not found")
-        await obj.update_from_dict(data)
-        await obj.save()
         return obj
 
-    async def select(self, request: Request):
-        return await self.model.filter().all()
+    def writes_single_statement(self, *signals: Signals) -> bool:
+        """
+        Whether update or delete can skip loading the row: model has no listeners
+        of signals and service doesn't override get or get_queryset, which scope
+        rows available for request
+        """
+        return (
+            self.single_statement_writes
+            and not self._overrides("get")
+            and not self._overrides("get_queryset")
+            and not self.model.has_listeners(*signals)
+        )
+
+    async def get_for_write(self, pk: PK, request: Request) -> Optional[_ORM_MODEL]:
+        """
+        Row to update or delete, through get if service overrides it,
+        None if there is no such row for request
+        """
+        if self._overrides("get"):
+            try:
+                return await self.get(pk, request)
+            except DoesNotExist:
+                return None
+        return await self.get_queryset(request).filter(pk=pk).first()
+
+    async def invalidate(self, *pks: PK) -> None:
+        """
+        Drop rows written without their instances from object cache and identity map
+        """
+        forget(self.model, *pks)
+        await invalidate(self.model, *pks)
+
+    def get_update_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Fields which can be written by update, primary key and unknown keys are dropped.
+        auto_now fields (e.g. modified_at) are set to current time as save() does
+        """
+        meta = self.model._meta
+        data = {
+            key: value
+            for key, value in data.items()
+            if key != meta.pk_attr
+            and (
+                key in meta.fields_db_projection
+                or key in meta.fk_fields
+                or key in meta.o2o_fields
+            )
+        }
+        if data:
+            data.update(self.get_auto_now_data())
+        return data
+
+    def get_auto_now_data(self) -> dict[str, Any]:
+        now = timezone.now()
+        return {
+            name: now
+            for name, field in self.model._meta.fields_map.items()
+            if getattr(field, "auto_now", False)
+        }
+
+    def to_pk(self, value: Any) -> PK:
+        try:
+            return self.model._meta.pk.to_python_value(value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Invalid pk '{value}'")
+
+    async def bulk_insert(
+        self, data: List[dict[str, Any]], request: Request, batch_size: int
+    ) -> int:
+        with bulk_errors():
+            objects = [self.model(**item) for item in data]
+            async with in_transaction(
+                self.model._meta.default_connection
+            ) as connection:
+                await self.model.bulk_create(
+                    objects, batch_size=batch_size, using_db=connection
+                )
+        return len(objects)
+
+    async def bulk_update(
+        self, data: List[dict[str, Any]], request: Request, batch_size: int
+    ) -> int:
+        """
+        Update rows by pk from each item, rows are loaded in one query
+        and saved with Model.bulk_update by batches
+        """
+        meta = self.model._meta
+        changes = {}
+        for item in data:
+            item = dict(item)
+            pk = item.pop(meta.pk_attr, None)
+            pk = item.pop("pk", pk)
+            if pk is None:
+                raise HTTPException(status_code=400, detail="Every item requires pk")
+            changes.setdefault(self.to_pk(pk), {}).update(item)
+        fields = sorted(
+            {key for item in changes.values() for key in item}
+            & meta.fields_db_projection.keys()
+        )
+        if fields:
+            # auto_now fields are set to current time when they're written
+            fields = sorted({*fields, *self.get_auto_now_data()})
+
+        with bulk_errors():
+            async with in_transaction(meta.default_connection) as connection:
+                objects = await self.model.filter(pk__in=list(changes)).using_db(
+                    connection
+                )
+                missing = changes.keys() - {obj.pk for obj in objects}
+                if missing:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"{self.model} Not found: {sorted(missing, key=str)}",
+                    )
+                for obj in objects:
+                    obj.update_from_dict(changes[obj.pk])
+                if fields:
+                    await self.model.bulk_update(
+                        objects, fields, batch_size=batch_size, using_db=connection
+                    )
+        await self.invalidate(*changes)
+        return len(objects)
+
+    async def bulk_delete(self, pks: Iterable[Any], request: Request) -> int:
+        # single DELETE ... WHERE pk IN statement, no transaction required
+        pks = [self.to_pk(pk) for pk in pks]
+        count = await self.model.filter(pk__in=pks).delete()
+        await self.invalidate(*pks)
+        return count
+
+    def _overrides(self, name: str) -> bool:
+        return getattr(type(self), name) is not getattr(BaseService, name)
+
+    def get_queryset(self, request: Request) -> QuerySet[_ORM_MODEL]:
+        """
+        Override this to filter rows available for current request
+        """
+        return self.model.all()
+
+    def get_count_strategy(self) -> CountStrategy:
+        strategy = self.count_strategy or settings.DEFAULT_COUNT_STRATEGY
+        if isinstance(strategy, str):
+            strategy = import_string(strategy)
+        return strategy() if isinstance(strategy, type) else strategy
+
+    async def select(
+        self,
+        request: Request,
+        paginator: Optional[BasePagination] = None,
+        related: Optional[RelatedPlan] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        filters: Optional[FilterBackend] = None,
+    ):
+        """
+        With fields rows are loaded with only these columns
+        and ones paginator orders by.
+        Filters narrow rows by query params and may ask for ordering
+        """
+        queryset = self.get_related_plan(related).apply(self.get_queryset(request))
+        ordering = None
+        if filters is not None:
+            queryset = filters.filter_queryset(queryset, request)
+            ordering = filters.get_ordering(request)
+        if fields:
+            if paginator is not None:
+                fields = (
+                    *fields,
+                    *(name for name, _ in paginator.get_ordering(self.model, ordering)),
+                )
+            elif ordering:
+                fields = (*fields, *(name.lstrip("-") for name in ordering))
+            queryset = queryset.only(*dict.fromkeys(fields))
+        if paginator is not None:
+            return await paginator.paginate_queryset(queryset, request, ordering)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return await queryset
+
+    async def stream(
+        self,
+        request: Request,
+        chunk_size: Optional[int] = None,
+        related: Optional[RelatedPlan] = None,
+        filters: Optional[FilterBackend] = None,
+    ) -> AsyncIterator[List[_ORM_MODEL]]:
+        """
+        Iterate over all rows of get_queryset by chunks, see iterate_chunks,
+        relations of plan are fetched for each chunk.
+        Rows are filtered and come in requested ordering or Meta.ordering
+        """
+        plan = self.get_related_plan(related)
+        queryset = self.get_queryset(request)
+        if filters is not None:
+            queryset = filters.filter_queryset(queryset, request)
+            ordering = filters.get_ordering(request)
+            if ordering:
+                queryset = queryset.order_by(*ordering)
+        async for chunk in iterate_chunks(
+            queryset, chunk_size or settings.STREAM_CHUNK_SIZE
+        ):
+            await plan.fetch(self.model, chunk)
+            yield chunk
 
     @property
     def orm_model(self):
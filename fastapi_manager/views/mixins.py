@@ -1,6 +1,12 @@
-from fastapi import Request, Body
+import inspect
+from functools import cached_property, wraps
+from fastapi import HTTPException, Query, Request, Body, Response, status
 from pydantic import BaseModel
-from typing import Annotated
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+
+from fastapi_manager.conf import settings
+from fastapi_manager.responses import STREAMING_FORMATS, is_not_modified
+from fastapi_manager.schemas import schemas
 
 
 class CreateModelMixin:
@@ -8,7 +14,7 @@ class CreateModelMixin:
 
     async def create(self, body: Annotated[BaseModel, Body()], *, request: Request):
         data = body.model_dump()
-        return await self.service.insert(data, request=request)
+        return self.finalize_response(await self.service.insert(data, request=request))
 
 
 class UpdateModelMixin:
@@ -16,31 +22,177 @@ class UpdateModelMixin:
 
     async def update(self, pk, body: Annotated[BaseModel, Body()], *, request: Request):
         data = body.model_dump()
-        return await self.service.update(pk, data, request=request)
+        return self.finalize_response(
+            await self.service.update(pk, data, request=request)
+        )
 
     async def partial_update(
         self, pk, body: Annotated[BaseModel, Body()], *, request: Request
     ):
         data = body.model_dump(exclude_unset=True)
-        return await self.service.update(pk, data, request=request)
+        return self.finalize_response(
+            await self.service.update(pk, data, request=request)
+        )
 
 
 class DestroyModelMixin:
     allowed_methods = ["DELETE"]
 
     async def destroy(self, pk, *, request: Request):
-        return await self.service.delete(pk, request=request)
+        return self.finalize_response(await self.service.delete(pk, request=request))
+
+
+class BulkMixin:
+    # rows per statement, settings.BULK_BATCH_SIZE if not set
+    bulk_batch_size: Optional[int] = None
+
+    def get_bulk_batch_size(self) -> int:
+        return self.bulk_batch_size or settings.BULK_BATCH_SIZE
+
+    def get_bulk_item_model(self, action: str) -> Optional[type[BaseModel]]:
+        if action == "bulk_create":
+            return schemas.get_input(self.get_model())
+        if action == "bulk_update":
+            return schemas.get_input(self.get_model(), partial=True)
+        return None
+
+    def get_endpoint(self, action: str, handler):
+        """
+        Body of bulk actions is validated against list of model input items
+        (422 on invalid ones), handler gets them as dicts of set fields
+        """
+        item_model = self.get_bulk_item_model(action)
+        if item_model is None:
+            return super().get_endpoint(action, handler)
+
+        @wraps(handler)
+        async def endpoint(body, *, request: Request):
+            items = [item.model_dump(exclude_unset=True) for item in body]
+            return await handler(items, request=request)
+
+        signature = inspect.signature(handler)
+        body = signature.parameters["body"].replace(
+            annotation=Annotated[List[item_model], Body()]
+        )
+        endpoint.__signature__ = signature.replace(
+            parameters=[body, signature.parameters["request"]]
+        )
+        return endpoint
+
+
+class BulkCreateModelMixin(BulkMixin):
+    allowed_methods = ["POST"]
+
+    async def bulk_create(
+        self, body: Annotated[List[Dict[str, Any]], Body()], *, request: Request
+    ):
+        count = await self.service.bulk_insert(
+            body, request=request, batch_size=self.get_bulk_batch_size()
+        )
+        return self.finalize_response({"count": count})
+
+
+class BulkUpdateModelMixin(BulkMixin):
+    allowed_methods = ["PATCH"]
+
+    async def bulk_update(
+        self, body: Annotated[List[Dict[str, Any]], Body()], *, request: Request
+    ):
+        count = await self.service.bulk_update(
+            body, request=request, batch_size=self.get_bulk_batch_size()
+        )
+        return self.finalize_response({"count": count})
+
+
+class BulkDestroyModelMixin:
+    allowed_methods = ["DELETE"]
+
+    async def bulk_destroy(
+        self, ids: Annotated[List[str], Query()], *, request: Request
+    ):
+        # both ?ids=1&ids=2 and ?ids=1,2
+        pks = [pk for value in ids for pk in value.split(",") if pk]
+        count = await self.service.bulk_delete(pks, request=request)
+        return self.finalize_response({"count": count})
 
 
 class RetrieveModelMixin:
     allowed_methods = ["GET"]
 
-    async def retrieve(self, pk, *, request: Request):
-        return await self.service.get(pk, request=request)
+    async def retrieve(self, pk, *, request: Request, response: Response):
+        fields = self.get_fields(request)
+        not_modified = await self.check_retrieve(pk, request)
+        if not_modified is not None:
+            return not_modified
+
+        load_fields = fields
+        if fields and self.version_field is not None:
+            load_fields = (*fields, self.version_field)
+        obj = await self.service.get(
+            pk, request=request, **self.get_service_kwargs(load_fields)
+        )
+        result = self.finalize_response(obj, fields=fields)
+        if self.version_field is None:
+            return result
+        headers = self.get_validators(request, getattr(obj, self.version_field), pk)
+        return self.with_headers(result, response, headers)
 
 
 class ListModelMixin:
     allowed_methods = ["LIST"]
 
-    async def list(self, request: Request):
-        return await self.service.select(request)
+    # formats from STREAMING_FORMATS, which client can ask with ?stream=<format>
+    # to get all rows without pagination, e.g. ("ndjson", "json")
+    streaming_formats: Tuple[str, ...] = ()
+    stream_query_param: str = "stream"
+
+    async def list(self, request: Request, response: Response):
+        stream_format = request.query_params.get(self.stream_query_param)
+        if stream_format is not None:
+            return self.stream_list(request, stream_format)
+        fields = self.get_fields(request)
+
+        headers = None
+        if self.version_field is not None:
+            version, count = await self.service.get_fingerprint(
+                request, self.version_field, **self.get_filter_kwargs()
+            )
+            headers = self.get_validators(request, version, count)
+            if is_not_modified(request, headers["ETag"], version):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+
+        rows = await self.service.select(
+            request,
+            paginator=self.paginator,
+            **self.get_service_kwargs(fields),
+            **self.get_filter_kwargs(),
+        )
+        result = self.finalize_response(rows, fields=fields, many=True)
+        if headers is None:
+            return result
+        return self.with_headers(result, response, headers)
+
+    def stream_list(self, request: Request, stream_format: str):
+        if stream_format not in self.streaming_formats:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Streaming format '{stream_format}' is not supported",
+            )
+        response_class = STREAMING_FORMATS[stream_format]
+        return response_class(
+            self.service.stream(
+                request, **self.get_service_kwargs(), **self.get_filter_kwargs()
+            ),
+            self.stream_encoder,
+        )
+
+    @cached_property
+    def stream_encoder(self):
+        if self.fast_serialization:
+            return self.serializer.dumps_row
+        item_model = self.get_response_model_class("GET")
+        serializer = item_model.__pydantic_serializer__
+        validate = item_model.model_validate
+        return lambda row: serializer.to_json(validate(row))
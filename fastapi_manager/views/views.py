@@ -1,12 +1,35 @@
-from typing import Tuple
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from fastapi_manager.conf import settings
+from fastapi_manager.db.related import RelatedPlan, infer_related_plan
+from fastapi_manager.filters import FilterBackend
+from fastapi_manager.filters.base import FilterFields
+from fastapi_manager.pagination import BasePagination, CountStrategy
+from fastapi_manager.responses import (
+    RawJSONResponse,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
 from fastapi_manager.router import BaseRouter
+from fastapi_manager.schemas import BulkResult, schemas
+from fastapi_manager.serializers import ModelSerializer
 from fastapi_manager.services import BaseService
-from tortoise.contrib.pydantic import pydantic_model_creator
-from fastapi import Response
+from fastapi_manager.utils.module_loading import import_string
+from fastapi import Response, status
+
+BULK_ACTIONS = ("bulk_create", "bulk_update", "bulk_destroy")
+
+
+@lru_cache(maxsize=None)
+def get_adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
 
 
 class APIView(BaseRouter):
@@ -15,15 +38,203 @@ class APIView(BaseRouter):
     response_model: dict[str, BaseModel] = {}
     response_class: dict[str, Response] = {}
     allowed_methods: Tuple[str] = tuple()
+    default_status_code: int = status.HTTP_200_OK
+
+    # class or dotted path, None disable pagination,
+    # if not set settings.DEFAULT_PAGINATION_CLASS is used
+    pagination_class: Union[type[BasePagination], str, None]
+
+    # serialize model instances to json without pydantic validation,
+    # response model is used only for openapi schema and field set
+    fast_serialization: bool = False
+
+    # column changed on every write of row, e.g. "modified_at" of TimestampMixin,
+    # enables ETag/Last-Modified of retrieve and list and 304 answers
+    # to If-None-Match/If-Modified-Since, list ones cost an aggregate query
+    version_field: Optional[str] = None
+
+    # total of paginated lists, see CountStrategy, service one if not set
+    count_strategy: Union[CountStrategy, type[CountStrategy], str, None] = None
+
+    # relations loaded with rows of retrieve and list, in addition to ones
+    # of service and, with infer_related, relation fields of response model
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+    infer_related: bool = True
+
+    # query param of sparse fieldset of retrieve and list, e.g. ?fields=id,name,
+    # only db fields of response model can be asked, None disable it
+    fields_query_param: Optional[str] = "fields"
+
+    # list filters, see FilterBackend: names of fields filtered by exact value,
+    # or dict of field name to lookups e.g. {"rank": ("exact", "range")}
+    filter_fields: FilterFields = ()
+    # fields client can order list by with ?ordering=
+    ordering_fields: Tuple[str, ...] = ()
+    # class or dotted path
+    filter_backend_class: Union[type[FilterBackend], str] = FilterBackend
 
     def get_model(self):
         return self.service.model
 
-    def get_response_model_class(self, method):
-        if method in self.allowed_methods:
-            return self.response_model.get(
-                method, pydantic_model_creator(self.get_model())
+    def get_item_schema(self) -> type[BaseModel]:
+        return self.response_model.get("GET") or schemas.get(self.get_model())
+
+    @cached_property
+    def related_plan(self) -> RelatedPlan:
+        plan = RelatedPlan(self.select_related, self.prefetch_related)
+        if self.infer_related:
+            plan = infer_related_plan(self.get_model(), self.get_item_schema()) | plan
+        return plan
+
+    @cached_property
+    def selectable_fields(self) -> Tuple[str, ...]:
+        projection = self.get_model()._meta.fields_db_projection
+        return tuple(
+            name for name in self.get_item_schema().model_fields if name in projection
+        )
+
+    def get_fields(self, request: Request) -> Optional[Tuple[str, ...]]:
+        """
+        Fields of ?fields= sparse fieldset, pk is always included.
+        None if param isn't given
+        """
+        if self.fields_query_param is None:
+            return None
+        value = request.query_params.get(self.fields_query_param)
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.selectable_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
             )
+        pk = self.get_model()._meta.pk_attr
+        return tuple(dict.fromkeys((pk, *names)))
+
+    @cached_property
+    def filter_backend(self) -> Optional[FilterBackend]:
+        """
+        Filters compiled for model, None if view has no filter or ordering fields
+        """
+        if not self.filter_fields and not self.ordering_fields:
+            return None
+        backend_class = self.filter_backend_class
+        if isinstance(backend_class, str):
+            backend_class = import_string(backend_class)
+        return backend_class(self.get_model(), self.filter_fields, self.ordering_fields)
+
+    def get_filter_kwargs(self) -> Dict[str, Any]:
+        return {"filters": self.filter_backend} if self.filter_backend else {}
+
+    def get_service_kwargs(self, fields: Optional[Tuple[str, ...]] = None):
+        # services overriding get/select without related or fields
+        # work while plan is empty and no fields are asked
+        if fields:
+            # only plain columns can be asked, relations aren't needed
+            return {"fields": fields}
+        return {"related": self.related_plan} if self.related_plan else {}
+
+    @cached_property
+    def paginator(self) -> Optional[BasePagination]:
+        pagination_class = getattr(
+            self, "pagination_class", settings.DEFAULT_PAGINATION_CLASS
+        )
+        if isinstance(pagination_class, str):
+            pagination_class = import_string(pagination_class)
+        if pagination_class is None:
+            return None
+        return pagination_class(count_strategy=self.get_count_strategy())
+
+    def get_count_strategy(self) -> CountStrategy:
+        strategy = self.count_strategy
+        if strategy is None:
+            return self.service.get_count_strategy()
+        if isinstance(strategy, str):
+            strategy = import_string(strategy)
+        return strategy() if isinstance(strategy, type) else strategy
+
+    def get_response_model_class(self, method, action=None):
+        if method in self.allowed_methods:
+            if action in BULK_ACTIONS:
+                return BulkResult
+            response_model = self.response_model.get(method)
+            if response_model is None:
+                response_model = schemas.get(self.get_model())
+            if action == "list":
+                return self.get_list_response_model(response_model)
+            return response_model
+
+    def get_list_response_model(self, item_model):
+        if self.paginator is None:
+            return List[item_model]
+        return self.paginator.get_envelope_model(item_model)
+
+    @cached_property
+    def serializer(self) -> ModelSerializer:
+        return ModelSerializer(self.get_model(), self.get_response_model_class("GET"))
+
+    def finalize_response(
+        self, data: Any, fields: Optional[Tuple[str, ...]] = None, many: bool = False
+    ) -> Any:
+        """
+        Return data for FastAPI to validate with response model,
+        or ready json response if fast_serialization is enabled.
+        With sparse fieldset data is serialized with projected response model
+        """
+        if fields:
+            schema = schemas.project(self.get_item_schema(), fields)
+            if self.fast_serialization:
+                content = ModelSerializer(self.get_model(), schema).dumps(data)
+            else:
+                adapter = get_adapter(
+                    self.get_list_response_model(schema) if many else schema
+                )
+                content = adapter.dump_json(
+                    adapter.validate_python(data, from_attributes=True)
+                )
+            return RawJSONResponse(content, status_code=self.default_status_code)
+        if not self.fast_serialization:
+            return data
+        return RawJSONResponse(
+            self.serializer.dumps(data), status_code=self.default_status_code
+        )
+
+    def get_validators(self, request: Request, version: Any, *parts: Any):
+        """
+        ETag of representation (query is part of it, e.g. ?fields= or cursor)
+        and Last-Modified headers
+        """
+        etag = make_etag(*parts, version, request.url.query)
+        return validator_headers(etag, version)
+
+    async def check_retrieve(self, pk, request: Request) -> Optional[Response]:
+        """
+        304 response if client copy of row is fresh, checked by version column
+        only, without loading and serializing object
+        """
+        if self.version_field is None or not is_conditional(request):
+            return None
+        row = await self.service.get_version(pk, self.version_field, request=request)
+        if row is None:
+            return None
+        headers = self.get_validators(request, row[0], pk)
+        if is_not_modified(request, headers["ETag"], row[0]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return None
+
+    @staticmethod
+    def with_headers(result: Any, response: Response, headers: Dict[str, str]):
+        # ready response is returned as is, data is sent with injected one's headers
+        (result if isinstance(result, Response) else response).headers.update(headers)
+        return result
+
+    def get_endpoint(self, action: str, handler):
+        """
+        Return function registered as route of action handler
+        """
+        return handler
 
     def get_response_class(self, method):
         if method in self.allowed_methods:
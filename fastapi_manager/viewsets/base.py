@@ -1,5 +1,5 @@
 from dataclasses import field
-from functools import wraps
+from functools import cached_property, wraps
 from typing import Callable, ClassVar, Any
 
 from pydantic import BaseModel, field_validator
@@ -17,6 +17,16 @@ MAPPINGS = {
     "destroy": "DELETE",
     "partial_update": "PATCH",
     "create": "POST",
+    "bulk_create": "POST",
+    "bulk_update": "PATCH",
+    "bulk_destroy": "DELETE",
+}
+
+# actions with own path instead of lookup field one
+PATHS = {
+    "bulk_create": "bulk",
+    "bulk_update": "bulk",
+    "bulk_destroy": "bulk",
 }
 
 
@@ -108,8 +118,21 @@ class ViewSetMixin(BaseRouter):
             for action in actions.values():
                 if action not in self.allowed_methods:
                     raise ValueError(f"action {action} is not allowed for that class")
-
-            for _callable_name in dir(self):
+            if "list" in actions:
+                # filters are compiled and checked once, on registration
+                self.filter_backend
+            if self.fast_serialization:
+                # as is encoder, which supports only db fields of response model
+                self.serializer
+
+            # fixed paths (e.g. bulk) go before "{pk}" one, which would match them
+            names = sorted(dir(self), key=lambda name: name not in PATHS)
+            for _callable_name in names:
+                # don't evaluate e.g. serializer of views without fast_serialization
+                if isinstance(
+                    getattr(cls, _callable_name, None), (property, cached_property)
+                ):
+                    continue
                 handler = getattr(self, _callable_name)
                 if _callable_name in actions.keys() or hasattr(
                     handler, "__endpoint_metadata"
@@ -118,7 +141,10 @@ class ViewSetMixin(BaseRouter):
                     metadata: Metadata = getattr(
                         handler,
                         "__endpoint_metadata",
-                        Metadata(methods=[method], path=self.get_paths(handler)),
+                        Metadata(
+                            methods=[method],
+                            path=PATHS.get(_callable_name) or self.get_paths(handler),
+                        ),
                     )
 
                     _path = self.path
@@ -127,11 +153,13 @@ class ViewSetMixin(BaseRouter):
 
                     self.add_api_route(
                         _path,
-                        handler,
+                        self.get_endpoint(_callable_name, handler),
                         methods=metadata.methods,
                         name=cls.name_parser(cls, method),
                         tags=[cls.name_parser(cls)],
-                        response_model=self.get_response_model_class(method),
+                        response_model=self.get_response_model_class(
+                            method, _callable_name
+                        ),
                         # response_class=self.get_response_class(method),
                         status_code=self.default_status_code,
                     )
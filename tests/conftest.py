@@ -1,8 +1,93 @@
+from contextlib import AsyncExitStack
+from unittest.mock import patch
+
+import httpx
 import pytest
+import pytest_asyncio
+from fastapi import APIRouter, FastAPI
+from tortoise import Tortoise, connections
+from tortoise.backends.sqlite.client import SqliteClient
 from fastapi_manager.conf import settings
+from fastapi_manager.pagination import CursorPagination
+from fastapi_manager.services import BaseService
+from fastapi_manager.viewsets import ReadOnlyModelViewSet
 from tests import local_config
+from tests.db.models import Event
 
 @pytest.fixture(scope='function', autouse=True)
 def local_settings():
     settings.configure(settings_module=local_config)
-    return settings
\ No newline at end of file
+    return settings
+
+
+@pytest_asyncio.fixture
+async def orm():
+    """
+    In memory sqlite database with tests.db.models tables
+    """
+    from tests.db.models import MODELS
+
+    await connections._init(
+        {
+            "default": {
+                "engine": "tortoise.backends.sqlite",
+                "credentials": {"file_path": ":memory:"},
+            }
+        },
+        False,
+    )
+    Tortoise._init_routers(None)
+    Tortoise.apps = {"tests": {model.__name__: model for model in MODELS}}
+    for model in MODELS:
+        model._meta.default_connection = "default"
+    Tortoise._init_relations()
+    Tortoise._build_initial_querysets()
+    Tortoise._inited = True
+    await Tortoise.generate_schemas()
+    yield connections.get("default")
+    await connections.close_all()
+    Tortoise.apps = {}
+    Tortoise._inited = False
+
+
+@pytest_asyncio.fixture
+async def make_client(orm):
+    """
+    Factory of clients of FastAPI app with given routers, e.g. path("/x", ViewSet)
+    """
+    async with AsyncExitStack() as stack:
+
+        async def make(*routes: APIRouter) -> httpx.AsyncClient:
+            app = FastAPI()
+            for router in routes:
+                app.include_router(router)
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://test")
+            return await stack.enter_async_context(client)
+
+        yield make
+
+
+def count_queries():
+    """
+    Spy of sqlite queries, aggregates and values ones go by execute_query_dict
+    """
+    return patch.object(
+        SqliteClient,
+        "execute_query",
+        autospec=True,
+        side_effect=SqliteClient.execute_query,
+    )
+
+
+class EventService(BaseService[Event]):
+    model = Event
+
+
+class EventViewSet(ReadOnlyModelViewSet):
+    service = EventService()
+    pagination_class = None
+
+
+class PagedEventViewSet(EventViewSet):
+    pagination_class = CursorPagination
@@ -0,0 +1,109 @@
+from enum import Enum
+from typing import List
+
+from fastapi_manager.db import models, fields
+from fastapi_manager.db.models import BatchDefault, TimestampMixin
+
+
+class Kind(str, Enum):
+    BOOK = "book"
+    GAME = "game"
+
+
+class Item(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField(default=0)
+
+    class Meta:
+        app = "tests"
+        table = "item"
+
+
+class Event(models.Model):
+    title = fields.CharField(max_length=50)
+    rank = fields.IntField(index=True)
+
+    class Meta:
+        app = "tests"
+        table = "event"
+        ordering = ["-rank"]
+        single_flight = True
+
+
+class Product(models.Model):
+    name = fields.CharField(max_length=50)
+    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    kind = fields.CharEnumField(Kind, default=Kind.BOOK)
+    tags = fields.JSONField(default=list)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        app = "tests"
+        table = "product"
+
+
+class CompactItem(models.Model):
+    name = fields.CharField(max_length=50)
+    qty = fields.IntField(default=0)
+    owner = fields.ForeignKeyField(
+        "tests.Event", null=True, related_name="compact_items"
+    )
+
+    class Meta:
+        app = "tests"
+        table = "compact_item"
+        compact = True
+
+
+async def next_code() -> str:
+    return "generated"
+
+
+class Ticket(models.Model):
+    code = fields.CharField(max_length=20, default=next_code)
+    title = fields.CharField(max_length=50, default="")
+    labels = fields.JSONField(default=["new"])
+
+    class Meta:
+        app = "tests"
+        table = "ticket"
+
+
+class Config(models.Model):
+    key = fields.CharField(max_length=50, unique=True)
+    value = fields.CharField(max_length=200)
+
+    class Meta:
+        app = "tests"
+        table = "config"
+        cache = True
+
+
+# counts asked by each allocate_numbers call
+NUMBER_BATCHES: List[int] = []
+
+
+async def allocate_numbers(count: int) -> List[int]:
+    start = sum(NUMBER_BATCHES)
+    NUMBER_BATCHES.append(count)
+    return list(range(start + 1, start + count + 1))
+
+
+class Invoice(models.Model):
+    number = fields.IntField(default=BatchDefault(allocate_numbers))
+    code = fields.CharField(max_length=20, default=next_code)
+
+    class Meta:
+        app = "tests"
+        table = "invoice"
+
+
+class Article(TimestampMixin, models.Model):
+    title = fields.CharField(max_length=50)
+
+    class Meta:
+        app = "tests"
+        table = "article"
+
+
+MODELS = [Item, Event, Product, CompactItem, Ticket, Config, Invoice, Article]
@@ -0,0 +1,63 @@
+import pytest
+
+from tests.db.models import NUMBER_BATCHES, Invoice, Item, Ticket
+
+
+def test_setattr_is_added_only_for_async_defaults():
+    assert Item.__setattr__ is object.__setattr__
+    assert Ticket.__setattr__ is not object.__setattr__
+
+
+@pytest.mark.asyncio
+async def test_async_default_is_resolved_on_save(orm):
+    ticket = Ticket(title="a")
+    assert ticket._await_when_save == {"code": Ticket._meta.fields_map["code"].default}
+
+    await ticket.save()
+
+    assert ticket.code == "generated"
+    assert not hasattr(ticket, "_await_when_save")
+
+
+@pytest.mark.asyncio
+async def test_assignment_overrides_async_default(orm):
+    ticket = Ticket(title="a")
+    ticket.code = "manual"
+
+    await ticket.save()
+
+    assert (await Ticket.get(pk=ticket.pk)).code == "manual"
+
+
+@pytest.fixture
+def number_batches():
+    NUMBER_BATCHES.clear()
+    return NUMBER_BATCHES
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_resolves_async_defaults(orm):
+    await Ticket.bulk_create([Ticket(title="a"), Ticket(title="b", code="manual")])
+
+    codes = await Ticket.all().order_by("title").values_list("code", flat=True)
+    assert codes == ["generated", "manual"]
+
+
+@pytest.mark.asyncio
+async def test_batch_default_is_called_once_per_bulk(orm, number_batches):
+    invoices = [Invoice(), Invoice(number=100), Invoice()]
+
+    await Invoice.bulk_create(invoices)
+
+    assert number_batches == [2]
+    assert [invoice.number for invoice in invoices] == [1, 100, 2]
+    assert not any(hasattr(invoice, "_await_when_save") for invoice in invoices)
+    assert await Invoice.filter(code="generated").count() == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_default_on_save(orm, number_batches):
+    invoice = await Invoice.create()
+
+    assert number_batches == [1]
+    assert (invoice.number, invoice.code) == (1, "generated")
@@ -0,0 +1,55 @@
+import gc
+
+import pytest
+
+from tests.db.models import CompactItem, Event
+
+
+def test_compact_model_is_slotted():
+    assert {"name", "qty", "_owner", "owner_id", "_flags", "__dict__"} <= set(
+        CompactItem.__slots__
+    )
+    item = CompactItem(name="a")
+    # __dict__ is allocated only for attributes without slot
+    assert not any(isinstance(ref, dict) for ref in gc.get_referents(item))
+    item.extra = 1
+    assert item.__dict__ == {"extra": 1}
+
+
+def test_bookkeeping_flags():
+    item = CompactItem(name="a")
+
+    assert not item._saved_in_db and not item._partial
+    item._saved_in_db = True
+    assert item._saved_in_db and not item._partial
+    assert item._flags == 2
+
+
+@pytest.mark.asyncio
+async def test_compact_model_roundtrip(orm):
+    owner = await Event.create(title="owner", rank=1)
+    await CompactItem.create(name="a", qty=3, owner=owner)
+
+    item = await CompactItem.get(name="a").select_related("owner")
+
+    assert item._saved_in_db and not item._partial
+    assert (item.name, item.qty, item.owner_id) == ("a", 3, owner.id)
+    assert item.owner.title == "owner"
+    assert not hasattr(item, "_await_when_save")
+
+    item.qty = 4
+    await item.save()
+    clone = item.clone()
+    assert clone.name == "a" and not clone._saved_in_db
+    assert (await CompactItem.get(pk=item.pk)).qty == 4
+    assert await owner.compact_items.all().count() == 1
+
+
+@pytest.mark.asyncio
+async def test_compact_partial_row(orm):
+    await CompactItem.create(name="a", qty=3)
+
+    item = await CompactItem.filter(name="a").only("id", "name").first()
+
+    assert item._partial and item.name == "a"
+    assert not hasattr(item, "qty")
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+import pytest
+from tortoise.exceptions import DoesNotExist
+
+from fastapi_manager.db.models.compiled import PkLookup
+from fastapi_manager.db.returning import delete_returning_by_pk, update_returning_by_pk
+from tests.conftest import count_queries
+from tests.db.models import CompactItem, Event, Item, Kind, Product
+
+
+@pytest.mark.asyncio
+async def test_get_by_pk_uses_same_sql(orm):
+    first = await Item.create(name="first")
+    second = await Item.create(name="second")
+
+    with count_queries() as execute_query:
+        assert isinstance(Item.get(pk=first.id), PkLookup)
+        assert (await Item.get(pk=first.id)).name == "first"
+        assert (await Item.get(id=str(second.id))).name == "second"
+
+    (_, first_sql, first_values), (_, second_sql, second_values) = [
+        call.args for call in execute_query.call_args_list
+    ]
+    assert first_sql == second_sql
+    assert (first_values, second_values) == ([first.id], [second.id])
+    with pytest.raises(DoesNotExist):
+        await Item.get(pk=second.id + 1)
+
+
+@pytest.mark.asyncio
+async def test_get_by_pk_chained_with_queryset_method(orm):
+    item = await Item.create(name="item", qty=3)
+
+    partial = await Item.get(pk=item.id).only("id", "qty")
+
+    assert partial._partial and partial.qty == 3
+    assert await Item.get(pk=item.id).exists()
+
+
+@pytest.mark.asyncio
+async def test_update_by_pk_converts_values(orm):
+    product = await Product.create(name="a", price=Decimal("1.00"))
+
+    with count_queries() as execute_query:
+        updated = await update_returning_by_pk(
+            Product, product.id, {"price": Decimal("2.50"), "kind": Kind.GAME}
+        )
+        await update_returning_by_pk(
+            Product, product.id, {"kind": Kind.BOOK, "price": Decimal("3.00")}
+        )
+
+    assert updated.price == Decimal("2.50") and updated.kind is Kind.GAME
+    first, second = execute_query.call_args_list
+    assert first.args[1] == second.args[1]
+    assert len(Product._meta.compiled_queries) == 1
+    assert await update_returning_by_pk(Product, product.id + 1, {"name": "b"}) is None
+
+
+@pytest.mark.asyncio
+async def test_update_by_pk_with_relation_uses_queryset(orm):
+    event = await Event.create(title="event", rank=1)
+    item = await CompactItem.create(name="item")
+
+    updated = await update_returning_by_pk(CompactItem, item.id, {"owner": event})
+
+    assert updated.owner_id == event.id
+
+
+@pytest.mark.asyncio
+async def test_delete_by_pk(orm):
+    item = await Item.create(name="item")
+
+    deleted = await delete_returning_by_pk(Item, item.id)
+
+    assert deleted.name == "item"
+    assert await delete_returning_by_pk(Item, item.id) is None
+    assert not await Item.exists(id=item.id)
@@ -0,0 +1,29 @@
+from tests.db.models import CompactItem, Kind, Product, Ticket, next_code
+
+
+def test_default_plan_buckets():
+    plan = Ticket._meta.default_plan
+
+    assert dict(plan.constant) == {"id": None, "title": ""}
+    assert dict(plan.copy) == {"labels": ["new"]}
+    assert plan.sync == ()
+    assert plan.awaitable == (("code", next_code),)
+
+    product_plan = Product._meta.default_plan
+    assert ("kind", Kind.BOOK) in product_plan.constant
+    assert ("tags", list) in product_plan.sync
+
+
+def test_relation_fields_are_not_in_plan():
+    keys = {key for bucket in CompactItem._meta.default_plan for key, _ in bucket}
+
+    assert "owner" not in keys
+
+
+def test_init_applies_plan():
+    first, second = Ticket(), Ticket(title="b", labels=["x"])
+
+    assert (first.title, first.labels) == ("", ["new"])
+    assert first.labels is not Ticket()._meta.fields_map["labels"].default
+    assert (second.title, second.labels) == ("b", ["x"])
+    assert Product(name="a").tags == []
@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+import pytest
+
+from tests.db.models import Item, Kind, Product
+
+
+@pytest.mark.asyncio
+async def test_full_row_hydration(orm):
+    await Product.create(name="a", price=Decimal("1.50"), kind=Kind.GAME, tags=["x"])
+
+    product = await Product.get(name="a")
+
+    assert product.price == Decimal("1.50")
+    assert product.kind is Kind.GAME
+    assert product.tags == ["x"]
+    assert product._saved_in_db and not product._partial
+    assert not hasattr(product, "_await_when_save")
+
+
+@pytest.mark.asyncio
+async def test_partial_row_hydration(orm):
+    await Product.create(name="a", price=Decimal("2.00"), kind=Kind.GAME)
+
+    product = await Product.filter(name="a").only("id", "kind").first()
+
+    assert product._partial
+    assert product.kind is Kind.GAME
+    assert not hasattr(product, "name")
+    product.kind = Kind.BOOK
+    await product.save(update_fields=["kind"])
+    assert (await Product.get(name="a")).kind is Kind.BOOK
+
+
+def test_partial_hydrator_is_cached_by_key_set(orm):
+    meta = Item._meta
+    hydrator = meta.get_partial_hydrator(frozenset({"id", "name"}))
+
+    assert meta.get_partial_hydrator(frozenset({"name", "id"})) is hydrator
+    assert meta.get_partial_hydrator(frozenset({"id"})) is not hydrator
+
+    item = Item._init_from_db(id=1, name="a")
+    assert item._partial and item.name == "a"
+    assert not hasattr(item, "qty")
@@ -0,0 +1,106 @@
+import pytest
+from tortoise.exceptions import ParamsError
+from tortoise.signals import Signals, post_save
+
+from tests.conftest import count_queries
+from tests.db.models import Config, Item
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_one_query(orm):
+    with count_queries() as execute_query:
+        config, created = await Config.get_or_create(key="a", defaults={"value": "1"})
+        assert created and config.value == "1" and config.id
+        found, created = await Config.get_or_create(key="a", defaults={"value": "2"})
+
+    # found row isn't touched by INSERT ... DO NOTHING, it's selected after
+    assert execute_query.call_count == 3
+    assert "DO NOTHING" in execute_query.call_args_list[1].args[1]
+    assert not created
+    assert (found.id, found.value) == (config.id, "1")
+    assert await Config.all().count() == 1
+
+
+@pytest.mark.asyncio
+async def test_update_or_create_one_query(orm):
+    with count_queries() as execute_query:
+        config, created = await Config.update_or_create(
+            key="a", defaults={"value": "1"}
+        )
+        assert created
+        updated, created = await Config.update_or_create(
+            key="a", defaults={"value": "2"}
+        )
+
+    assert execute_query.call_count == 2
+    assert not created
+    assert (updated.id, updated.value) == (config.id, "2")
+    assert (await Config.get(key="a")).value == "2"
+
+
+@pytest.mark.asyncio
+async def test_save_with_pk_upserts(orm):
+    item = await Item.create(name="first", qty=1)
+
+    with count_queries() as execute_query:
+        await Item(id=item.id, name="second", qty=2).save()
+        new = Item(id=item.id + 1, name="third")
+        await new.save()
+
+    assert execute_query.call_count == 2
+    assert await Item.all().order_by("id").values_list("name", "qty") == [
+        ("second", 2),
+        ("third", 0),
+    ]
+    assert new._saved_in_db
+
+
+@pytest.mark.asyncio
+async def test_save_upsert_created_flag(orm):
+    flags = []
+
+    @post_save(Item)
+    async def record(sender, instance, created, using_db, update_fields):
+        flags.append(created)
+
+    try:
+        await Item(id=10, name="a").save()
+        await Item(id=10, name="b").save()
+        await Item(id=10, name="c").save()
+    finally:
+        Item._listeners[Signals.post_save].pop(Item)
+
+    assert flags == [True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_lookup_without_unique_constraint_falls_back(orm):
+    # name isn't unique, can't be conflict target
+    item, created = await Item.get_or_create(name="a", defaults={"qty": 1})
+    same, created_again = await Item.get_or_create(name="a")
+
+    assert created and not created_again
+    assert same.id == item.id
+
+
+@pytest.mark.asyncio
+async def test_lookup_of_existing_row_by_key_only(orm):
+    config = await Config.create(key="a", value="x")
+    item = await Item.create(name="a", qty=2)
+
+    # value and name are required, so rows can't be upserted from lookups
+    with count_queries() as execute_query:
+        found, created = await Config.get_or_create(key="a")
+        assert (found.id, found.value, created) == (config.id, "x", False)
+        found, created = await Item.get_or_create(id=item.id)
+        assert (found.name, found.qty, created) == ("a", 2, False)
+    assert not any("INSERT" in call.args[1] for call in execute_query.call_args_list)
+
+    found, created = await Item.update_or_create(id=item.id, defaults={"qty": 3})
+    assert (found.name, found.qty, created) == ("a", 3, False)
+
+
+@pytest.mark.asyncio
+async def test_conflicting_defaults(orm):
+    with pytest.raises(ParamsError):
+        await Config.get_or_create(key="a", defaults={"key": "b", "value": "1"})
@@ -0,0 +1,153 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from fastapi_manager.router import path
+from fastapi_manager.services import BaseService
+from fastapi_manager.views import mixins
+from fastapi_manager.viewsets import ModelViewSet
+from tests.db.models import Article, Config, Item
+
+
+class ItemService(BaseService[Item]):
+    model = Item
+
+
+class ItemViewSet(
+    mixins.BulkCreateModelMixin,
+    mixins.BulkUpdateModelMixin,
+    mixins.BulkDestroyModelMixin,
+    ModelViewSet,
+):
+    service = ItemService()
+    bulk_batch_size = 2
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(path("/items", ItemViewSet))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create(client):
+    response = await client.post(
+        "/items/bulk", json=[{"name": f"item{i}", "qty": i} for i in range(5)]
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"count": 5}
+    assert await Item.all().order_by("qty").values_list("name", flat=True) == [
+        f"item{i}" for i in range(5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update(client):
+    items = [await Item.create(name=f"item{i}", qty=i) for i in range(3)]
+
+    response = await client.patch(
+        "/items/bulk",
+        json=[{"id": item.id, "qty": 10 + item.qty} for item in items]
+        + [{"pk": items[0].id, "name": "first"}],
+    )
+
+    assert response.json() == {"count": 3}
+    assert await Item.all().order_by("id").values_list("name", "qty") == [
+        ("first", 10),
+        ("item1", 11),
+        ("item2", 12),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_atomic(client):
+    item = await Item.create(name="item", qty=1)
+
+    response = await client.patch(
+        "/items/bulk", json=[{"id": item.id, "qty": 2}, {"id": 999, "qty": 2}]
+    )
+
+    assert response.status_code == 404
+    assert (await Item.get(pk=item.id)).qty == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_destroy(client):
+    items = [await Item.create(name=f"item{i}") for i in range(4)]
+
+    response = await client.delete(
+        f"/items/bulk?ids={items[0].id},{items[1].id}&ids={items[2].id}"
+    )
+
+    assert response.json() == {"count": 3}
+    assert await Item.all().values_list("id", flat=True) == [items[3].id]
+    assert (await client.delete("/items/bulk?ids=abc")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_single_object_routes_still_work(client):
+    item = await Item.create(name="item")
+
+    response = await client.get(f"/items/{item.id}")
+
+    assert response.json() == {"id": item.id, "name": "item", "qty": 0}
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_are_rejected(client):
+    item = await Item.create(name="item")
+
+    for body in (
+        [{"name": "a", "qty": "abc"}],
+        [{"qty": 1}],
+        [{"name": None}],
+    ):
+        response = await client.post("/items/bulk", json=body)
+        assert response.status_code == 422, body
+    for body in ([{"id": item.id, "name": None}], [{"id": item.id, "qty": "abc"}]):
+        response = await client.patch("/items/bulk", json=body)
+        assert response.status_code == 422, body
+
+    assert await Item.all().values_list("name", "qty") == [("item", 0)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_body_schema(client):
+    openapi = (await client.get("/openapi.json")).json()
+    schema = openapi["paths"]["/items/bulk"]["post"]["requestBody"]["content"]
+    items = schema["application/json"]["schema"]["items"]
+    model = openapi["components"]["schemas"][items["$ref"].rsplit("/", 1)[-1]]
+
+    assert set(model["properties"]) == {"name", "qty"}
+    assert model["required"] == ["name"]
+
+
+def test_bulk_routes_go_before_object_routes():
+    paths = [route.path for route in path("/items", ItemViewSet).routes]
+
+    assert paths.index("/items/bulk") < paths.index("/items/{pk}")
+
+
+@pytest.mark.asyncio
+async def test_conflicting_items(orm):
+    class ConfigService(BaseService[Config]):
+        model = Config
+
+    with pytest.raises(HTTPException) as error:
+        await ConfigService().bulk_insert(
+            [{"key": "a", "value": "1"}, {"key": "a", "value": "2"}], None, 10
+        )
+
+    assert error.value.status_code == 409
+    assert not await Config.exists()
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_refreshes_auto_now_fields(orm):
+    class ArticleService(BaseService[Article]):
+        model = Article
+
+    article = await Article.create(title="a")
+    await ArticleService().bulk_update([{"id": article.id, "title": "b"}], None, 10)
+
+    assert (await Article.get(pk=article.id)).modified_at > article.modified_at
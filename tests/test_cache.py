@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from fastapi_manager.cache import DEFAULT_TIMEOUT, BaseCache, LocMemCache, caches
+from fastapi_manager.services import BaseService
+from tests.db.models import Config, Item
+
+
+class FakeCache(BaseCache):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.data = {}
+
+    async def get(self, key, default=None):
+        if key in self.data:
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return default
+
+    async def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def clear(self):
+        self.data.clear()
+
+
+class ConfigService(BaseService[Config]):
+    model = Config
+
+
+@pytest_asyncio.fixture
+async def cache(orm):
+    cache = caches["default"] = FakeCache()
+    yield cache
+    caches.reset()
+
+
+@pytest.mark.asyncio
+async def test_locmem_lru_eviction():
+    cache = LocMemCache(max_size=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert cache.stats() == {"hits": 2, "misses": 1, "evictions": 1}
+
+
+@pytest.mark.asyncio
+async def test_locmem_ttl():
+    cache = LocMemCache(timeout=10)
+    with patch("time.monotonic", return_value=100):
+        await cache.set("a", [1])
+        await cache.set("b", [2], timeout=None)
+    with patch("time.monotonic", return_value=111):
+        assert await cache.get("a") is None
+        assert await cache.get("b") == [2]
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_locmem_returns_copies():
+    cache = LocMemCache()
+    value = {"a": []}
+    await cache.set("key", value)
+    value["a"].append(1)
+
+    assert await cache.get("key") == {"a": []}
+
+
+@pytest.mark.asyncio
+async def test_get_reads_through_cache(cache):
+    config = await Config.create(key="site", value="a")
+    service = ConfigService()
+
+    first = await service.get(str(config.id), request=None)
+    second = await service.get(config.id, request=None)
+
+    assert first.value == second.value == "a"
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cache(cache):
+    config = await Config.create(key="site", value="a")
+    service = ConfigService()
+
+    await service.get(config.id, request=None)
+    config.value = "b"
+    await config.save()
+    assert (await service.get(config.id, request=None)).value == "b"
+
+    await service.update(config.id, {"value": "c"}, request=None)
+    assert (await service.get(config.id, request=None)).value == "c"
+
+    await service.delete(config.id, request=None)
+    assert cache.data == {}
+
+
+@pytest.mark.asyncio
+async def test_models_without_cache_meta_are_not_cached(cache):
+    item = await Item.create(name="item")
+
+    class ItemService(BaseService[Item]):
+        model = Item
+
+    await ItemService().get(item.id, request=None)
+    assert cache.data == {}
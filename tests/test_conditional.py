@@ -0,0 +1,138 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from tortoise.exceptions import DoesNotExist
+
+from fastapi_manager.router import path
+from fastapi_manager.services import BaseService
+from fastapi_manager.viewsets import ReadOnlyModelViewSet
+from tests.conftest import count_queries
+from tests.db.models import Article
+
+
+class ArticleService(BaseService[Article]):
+    model = Article
+
+
+class ArticleViewSet(ReadOnlyModelViewSet):
+    service = ArticleService()
+    pagination_class = None
+    version_field = "modified_at"
+    filter_fields = ("title",)
+
+
+class VisibleArticleService(ArticleService):
+    def get_queryset(self, request):
+        return self.model.exclude(title="a0")
+
+
+class ForbiddenArticleService(ArticleService):
+    async def get(self, pk, request, related=None, fields=None):
+        raise HTTPException(status_code=403)
+
+
+class VisibleArticleViewSet(ArticleViewSet):
+    service = VisibleArticleService()
+
+
+class ForbiddenArticleViewSet(ArticleViewSet):
+    service = ForbiddenArticleService()
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(
+        path("/articles", ArticleViewSet),
+        path("/visible", VisibleArticleViewSet),
+        path("/forbidden", ForbiddenArticleViewSet),
+    )
+
+
+@pytest_asyncio.fixture
+async def articles(orm):
+    return [await Article.create(title=f"a{i}") for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_not_modified(client, articles):
+    url = f"/articles/{articles[0].id}"
+    response = await client.get(url)
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and response.headers["last-modified"]
+
+    with count_queries() as execute_query:
+        response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag and not response.content
+    sql = execute_query.call_args.args[1]
+    assert execute_query.call_count == 1 and '"title"' not in sql
+
+    await ArticleService().update(articles[0].id, {"title": "changed"}, None)
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_retrieve_if_modified_since(client, articles):
+    url = f"/articles/{articles[0].id}"
+    last_modified = (await client.get(url)).headers["last-modified"]
+
+    response = await client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    response = await client.get(url, headers={"If-Modified-Since": old})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_etag_depends_on_query(client, articles):
+    url = f"/articles/{articles[0].id}"
+    etag = (await client.get(url)).headers["etag"]
+
+    response = await client.get(
+        url, params={"fields": "title"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"id": articles[0].id, "title": "a0"}
+
+
+@pytest.mark.asyncio
+async def test_list_fingerprint(client, articles):
+    etag = (await client.get("/articles/")).headers["etag"]
+
+    with count_queries() as execute_query:
+        response = await client.get("/articles/", headers={"If-None-Match": etag})
+    # only aggregate query, which is run with execute_query_dict
+    assert response.status_code == 304
+    assert execute_query.call_count == 0
+
+    await Article.create(title="new")
+    response = await client.get("/articles/", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and len(response.json()) == 4
+
+    # filtered list has own fingerprint
+    response = await client.get(
+        "/articles/", params={"title": "a1"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200 and len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_row_is_looked_up(client, articles):
+    with pytest.raises(DoesNotExist):
+        await client.get("/articles/999", headers={"If-None-Match": "*"})
+
+
+@pytest.mark.asyncio
+async def test_hidden_row_is_not_validated(client, articles):
+    headers = {"If-None-Match": "*"}
+
+    with pytest.raises(DoesNotExist):
+        await client.get(f"/visible/{articles[0].id}", headers=headers)
+    response = await client.get(f"/visible/{articles[1].id}", headers=headers)
+    assert response.status_code == 304
+
+    response = await client.get(f"/forbidden/{articles[1].id}", headers=headers)
+    assert response.status_code == 403
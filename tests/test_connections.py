@@ -0,0 +1,39 @@
+import pytest
+from tortoise import Tortoise, connections
+from tortoise.backends.sqlite.client import SqliteClient
+from tortoise.utils import generate_schema_for_client
+
+from fastapi_manager.db.connection import DBConnector
+from fastapi_manager.db.connection.clients import close_connections, init_lazy
+from tests.db.models import MODELS, Item
+
+MEMORY = {
+    "engine": "tortoise.backends.sqlite",
+    "credentials": {"file_path": ":memory:"},
+}
+
+
+@pytest.mark.asyncio
+async def test_lazy_connections_are_created_on_first_use():
+    init_lazy({"default": MEMORY, "other": MEMORY, "unused": "sqlite://:memory:"})
+    Tortoise._init_routers(None)
+    Tortoise.apps = {"tests": {model.__name__: model for model in MODELS}}
+    for model in MODELS:
+        model._meta.default_connection = "default"
+    try:
+        Tortoise._init_relations()
+        DBConnector._build_initial_querysets()
+        assert connections._get_storage() == {}
+        assert Item._meta.db_class is SqliteClient
+
+        await generate_schema_for_client(Item._meta.db, safe=False)
+        await Item.create(name="item")
+
+        assert await Item.filter(name="item").count() == 1
+        assert set(connections._get_storage()) == {"default"}
+    finally:
+        await close_connections()
+        connections._db_config = None
+        Tortoise.apps = {}
+
+    assert connections._get_storage() == {}
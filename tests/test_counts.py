@@ -0,0 +1,127 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from tortoise.signals import Signals
+
+from fastapi_manager.cache import caches
+from fastapi_manager.cache.models import _counted
+from fastapi_manager.pagination import (
+    CachedCount,
+    EstimatedCount,
+    ExactCount,
+    LimitOffsetPagination,
+)
+from fastapi_manager.router import path
+from tests.conftest import EventService, PagedEventViewSet, count_queries
+from tests.db.models import Event
+
+
+class CountedEventService(EventService):
+    count_strategy = ExactCount
+
+
+class CountedEventViewSet(PagedEventViewSet):
+    service = CountedEventService()
+    filter_fields = ("rank",)
+
+
+class OffsetEventViewSet(CountedEventViewSet):
+    pagination_class = LimitOffsetPagination
+    count_strategy = EstimatedCount()
+
+
+class HasMoreEventViewSet(CountedEventViewSet):
+    count_strategy = "fastapi_manager.pagination.HasMore"
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(
+        path("/events", CountedEventViewSet),
+        path("/offset", OffsetEventViewSet),
+        path("/more", HasMoreEventViewSet),
+    )
+
+
+@pytest_asyncio.fixture
+async def events(orm):
+    ranks = [5, 3, 3, 9, 1]
+    return [await Event.create(title=f"e{i}", rank=r) for i, r in enumerate(ranks)]
+
+
+@pytest_asyncio.fixture
+async def cached(orm):
+    yield CachedCount(timeout=None)
+    _counted.pop(Event, None)
+    await caches["default"].clear()
+
+
+@pytest.mark.asyncio
+async def test_envelope_count(client, events):
+    page = (await client.get("/events/", params={"limit": 2})).json()
+    assert page["count"] == 5 and len(page["results"]) == 2
+
+    # count of filtered rows, not only ones after cursor
+    params = {"limit": 1, "rank": 3}
+    page = (await client.get("/events/", params=params)).json()
+    page = await client.get("/events/", params={**params, "cursor": page["next"]})
+    assert page.json()["count"] == 2
+
+    # planner estimate falls back to exact count on sqlite
+    page = (await client.get("/offset/", params={"limit": 2})).json()
+    assert page["count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_has_more_skips_count(client, events):
+    with count_queries() as execute_query:
+        page = (await client.get("/more/", params={"limit": 2})).json()
+
+    assert "count" not in page and page["next"]
+    assert not any("COUNT" in call.args[1] for call in execute_query.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_cached_count(cached, events):
+    with count_queries() as execute_query:
+        assert await cached.count(Event.all()) == 5
+        assert await cached.count(Event.all()) == 5
+        assert await cached.count(Event.filter(rank=3)) == 2
+    assert execute_query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_count_invalidated_on_writes(cached, events):
+    assert await cached.count(Event.all()) == 5
+
+    await Event.create(title="new", rank=2)
+    assert await cached.count(Event.all()) == 6
+
+    await Event.filter(rank=3).delete()
+    assert await cached.count(Event.all()) == 4
+
+    await Event.bulk_create([Event(title="bulk", rank=1)])
+    assert await cached.count(Event.filter(rank=1)) == 2
+    await Event.filter(rank=1).update(rank=4)
+    assert await cached.count(Event.filter(rank=1)) == 0
+
+    # counting doesn't add listeners, service writes stay single statements
+    assert not Event.has_listeners(Signals.post_save, Signals.post_delete)
+    with count_queries() as execute_query:
+        await EventService().delete(events[0].id, None)
+    assert execute_query.call_count == 1
+    assert await cached.count(Event.all()) == 4
+
+
+@pytest.mark.asyncio
+async def test_estimate_of_filtered_rows(orm):
+    # rows of the whole plan, not of per worker scan under Gather
+    scan = {"Node Type": "Seq Scan", "Parallel Aware": True, "Plan Rows": 50000}
+    plan = {"Plan": {"Node Type": "Gather", "Plan Rows": 120000, "Plans": [scan]}}
+    db = AsyncMock()
+    db.execute_query_dict.return_value = [{"QUERY PLAN": [plan]}]
+
+    assert await EstimatedCount.explain(db, Event.filter(rank=3)) == 120000
+    sql = db.execute_query_dict.await_args.args[0]
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT") and "COUNT" not in sql
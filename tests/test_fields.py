@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from tortoise.exceptions import ConfigurationError
+
+from fastapi_manager.router import path
+from fastapi_manager.schemas import schemas
+from tests.conftest import EventViewSet, PagedEventViewSet, count_queries
+from tests.db.models import Event
+
+
+class FastEventViewSet(EventViewSet):
+    fast_serialization = True
+    response_model = {"GET": schemas.get(Event, exclude=["compact_items"])}
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(
+        path("/events", EventViewSet),
+        path("/paged", PagedEventViewSet),
+        path("/fast", FastEventViewSet),
+    )
+
+
+@pytest_asyncio.fixture
+async def events(orm):
+    return [await Event.create(title=f"e{i}", rank=i) for i in range(5)]
+
+
+def test_projected_schema_is_cached(orm):
+    schema = schemas.get(Event)
+    projected = schemas.project(schema, ["title", "id"])
+
+    assert list(projected.model_fields) == ["id", "title"]
+    assert schemas.project(schema, ["id", "title"]) is projected
+
+
+@pytest.mark.asyncio
+async def test_list_selects_only_asked_fields(client, events):
+    with count_queries() as execute_query:
+        response = await client.get("/events/", params={"fields": "title"})
+
+    assert response.status_code == 200
+    assert response.json()[0] == {"id": events[-1].id, "title": "e4"}
+    sql = execute_query.call_args_list[0].args[1]
+    assert '"rank"' not in sql.split("FROM")[0]
+    # reverse relation of response model isn't prefetched
+    assert execute_query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_retrieve_with_fields(client, events):
+    response = await client.get(f"/events/{events[0].id}", params={"fields": "rank"})
+
+    assert response.json() == {"id": events[0].id, "rank": 0}
+
+
+@pytest.mark.asyncio
+async def test_fast_serialization_with_fields(client, events):
+    response = await client.get("/fast/", params={"fields": "rank,title"})
+
+    assert response.json()[0] == {"id": events[-1].id, "title": "e4", "rank": 4}
+
+
+@pytest.mark.asyncio
+async def test_unknown_fields_are_rejected(client, events):
+    response = await client.get("/events/", params={"fields": "title,secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: secret"
+
+    # relations aren't columns
+    response = await client.get("/events/", params={"fields": "compact_items"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_with_fields(client, events):
+    response = await client.get("/paged/", params={"fields": "title", "limit": 2})
+    page = response.json()
+
+    assert [row["title"] for row in page["results"]] == ["e4", "e3"]
+    assert set(page["results"][0]) == {"id", "title"}
+
+    response = await client.get(
+        "/paged/", params={"fields": "title", "limit": 2, "cursor": page["next"]}
+    )
+    assert [row["title"] for row in response.json()["results"]] == ["e2", "e1"]
+
+
+def test_fast_serialization_is_checked_on_registration(orm):
+    class RelatedEventViewSet(FastEventViewSet):
+        # reverse relation isn't a db field
+        response_model = {"GET": schemas.get(Event)}
+
+    with pytest.raises(ConfigurationError, match="compact_items"):
+        path("/related", RelatedEventViewSet)
@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from tortoise.exceptions import ConfigurationError
+
+from fastapi_manager.filters import FilterBackend
+from fastapi_manager.pagination import CursorPagination
+from fastapi_manager.router import path
+from tests.conftest import EventViewSet
+from tests.db.models import Event
+
+
+class FilteredEventViewSet(EventViewSet):
+    filter_fields = {"rank": ("exact", "range", "in"), "id": ("in",)}
+    ordering_fields = ("rank", "id")
+
+
+class PagedFilteredEventViewSet(FilteredEventViewSet):
+    pagination_class = CursorPagination
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(
+        path("/events", FilteredEventViewSet),
+        path("/paged", PagedFilteredEventViewSet),
+    )
+
+
+@pytest_asyncio.fixture
+async def events(orm):
+    ranks = [5, 3, 3, 9, 1]
+    return [await Event.create(title=f"e{i}", rank=r) for i, r in enumerate(ranks)]
+
+
+async def titles(client, url="/events/", **params):
+    response = await client.get(url, params=params)
+    assert response.status_code == 200, response.json()
+    return [row["title"] for row in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_lookups(client, events):
+    assert sorted(await titles(client, rank=3)) == ["e1", "e2"]
+    assert sorted(await titles(client, rank__range="3,5")) == ["e0", "e1", "e2"]
+    assert await titles(client, rank__in="1,9") == ["e3", "e4"]
+    ids = f"{events[0].id},{events[4].id}"
+    assert await titles(client, id__in=ids, rank__in="1,3") == ["e4"]
+
+
+@pytest.mark.asyncio
+async def test_ordering(client, events):
+    assert await titles(client, ordering="rank,-id") == ["e4", "e2", "e1", "e0", "e3"]
+    assert await titles(client, ordering="-id") == ["e4", "e3", "e2", "e1", "e0"]
+
+
+@pytest.mark.asyncio
+async def test_ordering_with_cursor_pagination(client, events):
+    response = await client.get("/paged/", params={"ordering": "rank", "limit": 3})
+    page = response.json()
+    assert [row["title"] for row in page["results"]] == ["e4", "e1", "e2"]
+
+    response = await client.get(
+        "/paged/", params={"ordering": "rank", "limit": 3, "cursor": page["next"]}
+    )
+    assert [row["title"] for row in response.json()["results"]] == ["e0", "e3"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_params(client, events):
+    for params in (
+        {"rank": "high"},
+        {"rank__range": "1"},
+        {"ordering": "title"},
+    ):
+        response = await client.get("/events/", params=params)
+        assert response.status_code == 400, params
+
+
+def test_fields_are_checked_on_registration(orm):
+    with pytest.raises(ConfigurationError):
+        FilterBackend(Event, {"rank": ("startswith",)})
+    with pytest.raises(ConfigurationError):
+        FilterBackend(Event, ["compact_items"])
+
+    class BadViewSet(FilteredEventViewSet):
+        ordering_fields = ("missing",)
+
+    with pytest.raises(ConfigurationError):
+        path("/bad", BadViewSet)
+
+
+def test_not_indexed_field_warns(orm):
+    with pytest.warns(RuntimeWarning, match="not indexed field 'title'"):
+        backend = FilterBackend(Event, {"title": ("icontains",)})
+
+    assert backend.params == {"title__icontains": ("title", "icontains")}
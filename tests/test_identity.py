@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from tortoise.exceptions import DoesNotExist
+from tortoise.transactions import in_transaction
+
+from fastapi_manager.db.identity import IdentityLookup, get_identity_map, identity_map
+from fastapi_manager.router import path
+from fastapi_manager.router.base import RequestScopeRoute
+from fastapi_manager.services import BaseService
+from fastapi_manager.viewsets import ReadOnlyModelViewSet
+from tests.conftest import count_queries
+from tests.db.models import Item
+
+
+@pytest.mark.asyncio
+async def test_get_by_pk_returns_same_instance(orm):
+    item = await Item.create(name="item")
+
+    with identity_map() as identities, count_queries() as execute_query:
+        first = await Item.get(pk=item.id)
+        second = await Item.get(id=str(item.id))
+        third = await Item._getbypk(item.id)
+
+    assert first is second is third
+    assert execute_query.call_count == 1
+    assert identities.hits == 2
+    assert await Item.get(pk=item.id) is not first
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced(orm):
+    item = await Item.create(name="item")
+
+    with identity_map() as identities, count_queries() as execute_query:
+        items = await asyncio.gather(*[Item.get(pk=item.id) for _ in range(3)])
+
+    assert items[0] is items[1] is items[2]
+    assert execute_query.call_count == 1
+    assert identities.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_in_bulk_loads_only_missing_rows(orm):
+    items = [await Item.create(name=f"item{i}") for i in range(3)]
+
+    with identity_map(), count_queries() as execute_query:
+        first = await Item.get(pk=items[0].id)
+        loaded = await Item.in_bulk([item.id for item in items])
+        again = await Item.get(pk=items[2].id)
+
+    assert loaded[items[0].id] is first
+    assert loaded[items[2].id] is again
+    assert execute_query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_map_is_off_inside_transactions(orm):
+    item = await Item.create(name="item")
+
+    with identity_map():
+        loaded = await Item.get(pk=item.id)
+        assert not isinstance(Item.get(pk=item.id).select_for_update(), IdentityLookup)
+        async with in_transaction():
+            assert get_identity_map(Item) is None
+            assert await Item.get(pk=item.id) is not loaded
+
+
+@pytest.mark.asyncio
+async def test_deleted_rows_are_forgotten(orm):
+    item = await Item.create(name="item")
+
+    with identity_map():
+        loaded = await Item.get(pk=item.id)
+        await loaded.delete()
+        assert await Item.get_or_none(pk=item.id) is None
+        with pytest.raises(DoesNotExist):
+            await Item.get(pk=item.id)
+
+
+@pytest.mark.asyncio
+async def test_queryset_writes_are_forgotten(orm):
+    items = [await Item.create(name=f"item{i}", qty=i) for i in range(3)]
+
+    with identity_map():
+        for item in items:
+            await Item.get(pk=item.id)
+        await Item.filter(qty__gte=1).update(name="changed")
+        assert (await Item.get(pk=items[1].id)).name == "changed"
+
+        await Item.filter(qty=2).delete()
+        with pytest.raises(DoesNotExist):
+            await Item.get(pk=items[2].id)
+
+
+@pytest.mark.asyncio
+async def test_partial_instances_are_not_remembered(orm):
+    item = await Item.create(name="item", qty=3)
+
+    with identity_map():
+        await Item.get(pk=item.id)
+        partial = await Item.filter(pk=item.id).only("id", "name").get()
+        partial.name = "changed"
+        await partial.save(update_fields=["name"])
+
+        loaded = await Item.get(pk=item.id)
+        assert loaded is not partial
+        assert (loaded.name, loaded.qty) == ("changed", 3)
+
+
+@pytest.mark.asyncio
+async def test_router_scopes_map_to_request(make_client):
+    item = await Item.create(name="item")
+    seen = []
+
+    class ItemService(BaseService[Item]):
+        model = Item
+
+        async def get(self, pk, request):
+            seen.append(get_identity_map(Item))
+            return await super().get(pk, request)
+
+    class ItemViewSet(ReadOnlyModelViewSet):
+        service = ItemService()
+        pagination_class = None
+
+    router = path("/items", ItemViewSet)
+    assert all(isinstance(route, RequestScopeRoute) for route in router.routes)
+
+    client = await make_client(router)
+    for _ in range(2):
+        assert (await client.get(f"/items/{item.id}")).status_code == 200
+
+    assert seen[0] is not None and seen[1] is not None and seen[0] is not seen[1]
+    assert get_identity_map(Item) is None
@@ -0,0 +1,132 @@
+from urllib.parse import urlencode
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, Request
+
+from fastapi_manager.pagination import CursorPagination, LimitOffsetPagination
+from tests.db.models import Event, Item
+
+
+def make_request(**params):
+    return Request(
+        {"type": "http", "method": "GET", "query_string": urlencode(params).encode()}
+    )
+
+
+@pytest_asyncio.fixture
+async def items(orm):
+    return [await Item.create(name=f"item{i}", qty=i) for i in range(7)]
+
+
+@pytest_asyncio.fixture
+async def events(orm):
+    ranks = [5, 3, 3, 9, 1, 3]
+    return [await Event.create(title=f"e{i}", rank=r) for i, r in enumerate(ranks)]
+
+
+def test_limit_is_bounded():
+    paginator = CursorPagination()
+    paginator.page_size, paginator.max_page_size = 10, 20
+
+    assert paginator.get_limit(make_request()) == 10
+    assert paginator.get_limit(make_request(limit=500)) == 20
+    assert paginator.get_limit(make_request(limit=-3)) == 1
+    with pytest.raises(HTTPException):
+        paginator.get_limit(make_request(limit="many"))
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_forward_and_back(items):
+    paginator = CursorPagination()
+
+    page = await paginator.paginate_queryset(Item.all(), make_request(limit=3))
+    assert [i.qty for i in page["results"]] == [0, 1, 2]
+    assert page["previous"] is None
+
+    page = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, cursor=page["next"])
+    )
+    assert [i.qty for i in page["results"]] == [3, 4, 5]
+
+    last = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, cursor=page["next"])
+    )
+    assert [i.qty for i in last["results"]] == [6]
+    assert last["next"] is None
+
+    back = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, cursor=last["previous"])
+    )
+    assert [i.qty for i in back["results"]] == [3, 4, 5]
+
+    first = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, cursor=back["previous"])
+    )
+    assert [i.qty for i in first["results"]] == [0, 1, 2]
+    assert first["previous"] is None
+    assert first["next"] is not None
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_uses_indexed_meta_ordering(events):
+    paginator = CursorPagination()
+    assert paginator.get_ordering(Event) == (("rank", True), ("id", True))
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = await paginator.paginate_queryset(Event.all(), make_request(**params))
+        seen.extend((e.rank, e.id) for e in page["results"])
+        if (cursor := page["next"]) is None:
+            break
+
+    assert seen == sorted(((e.rank, e.id) for e in events), reverse=True)
+
+
+def test_cursor_pagination_falls_back_to_pk_for_unindexed_ordering():
+    paginator = CursorPagination()
+    paginator.ordering = ("-qty",)
+
+    with pytest.warns(RuntimeWarning):
+        assert paginator.get_ordering(Item) == (("id", False),)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(items):
+    with pytest.raises(HTTPException) as exc:
+        await CursorPagination().paginate_queryset(
+            Item.all(), make_request(cursor="not-a-cursor")
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_limit_offset_pagination(items):
+    paginator = LimitOffsetPagination()
+
+    page = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, offset=3)
+    )
+    assert [i.qty for i in page["results"]] == [3, 4, 5]
+    assert (page["previous"], page["next"]) == (0, 6)
+
+    page = await paginator.paginate_queryset(
+        Item.all(), make_request(limit=3, offset=6)
+    )
+    assert [i.qty for i in page["results"]] == [6]
+    assert page["next"] is None
+
+
+def test_envelope_model_is_reused():
+    from pydantic import BaseModel
+
+    class ItemSchema(BaseModel):
+        name: str
+
+    paginator = CursorPagination()
+    envelope = paginator.get_envelope_model(ItemSchema)
+
+    assert envelope is paginator.get_envelope_model(ItemSchema)
+    assert set(envelope.model_fields) == {"results", "next", "previous"}
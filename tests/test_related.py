@@ -0,0 +1,127 @@
+import logging
+
+import pytest
+import pytest_asyncio
+from tortoise.backends.sqlite.client import SqliteClient
+
+from fastapi_manager.db.querylog import (
+    detect_n_plus_one,
+    normalize_sql,
+    record_queries,
+)
+from fastapi_manager.db.related import RelatedPlan, infer_related_plan
+from fastapi_manager.router import path
+from fastapi_manager.schemas import schemas
+from fastapi_manager.services import BaseService
+from fastapi_manager.viewsets import ReadOnlyModelViewSet
+from tests.conftest import EventViewSet, count_queries
+from tests.db.models import CompactItem, Event
+
+
+class CompactItemService(BaseService[CompactItem]):
+    model = CompactItem
+
+
+class CompactItemViewSet(ReadOnlyModelViewSet):
+    service = CompactItemService()
+    pagination_class = None
+
+
+@pytest_asyncio.fixture
+async def client(make_client):
+    return await make_client(
+        path("/items", CompactItemViewSet),
+        path("/events", EventViewSet),
+    )
+
+
+def test_infer_plan_from_response_model(orm):
+    assert infer_related_plan(CompactItem, schemas.get(CompactItem)) == RelatedPlan(
+        select_related=["owner"]
+    )
+    assert infer_related_plan(Event, schemas.get(Event)) == RelatedPlan(
+        prefetch_related=["compact_items"]
+    )
+    assert not infer_related_plan(
+        CompactItem, schemas.get(CompactItem, exclude=["owner"])
+    )
+
+
+def test_plan_merge():
+    plan = RelatedPlan(["owner"]) | RelatedPlan(["owner"], ["owner", "tags"])
+
+    assert plan == RelatedPlan(["owner"], ["tags"])
+
+
+@pytest.mark.asyncio
+async def test_list_loads_foreign_keys_with_rows(client):
+    events = [await Event.create(title=f"e{i}", rank=i) for i in range(3)]
+    for event in events:
+        await CompactItem.create(name=event.title, owner=event)
+
+    with count_queries() as execute_query:
+        response = await client.get("/items/")
+
+    assert response.status_code == 200
+    assert [row["owner"]["title"] for row in response.json()] == ["e0", "e1", "e2"]
+    assert execute_query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_list_prefetches_reverse_relations(client):
+    events = [await Event.create(title=f"e{i}", rank=i) for i in range(3)]
+    for event in events:
+        await CompactItem.create(name="a", owner=event)
+        await CompactItem.create(name="b", owner=event)
+
+    with count_queries() as execute_query:
+        response = await client.get("/events/")
+
+    assert response.status_code == 200
+    assert [len(row["compact_items"]) for row in response.json()] == [2, 2, 2]
+    assert execute_query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieve_fetches_plan(client):
+    event = await Event.create(title="e", rank=1)
+    item = await CompactItem.create(name="a", owner=event)
+
+    response = await client.get(f"/items/{item.id}")
+
+    assert response.json()["owner"]["title"] == "e"
+
+
+@pytest.mark.asyncio
+async def test_service_declared_plan(orm):
+    class Service(BaseService[CompactItem]):
+        model = CompactItem
+        select_related = ("owner",)
+
+    event = await Event.create(title="e", rank=1)
+    await CompactItem.create(name="a", owner=event)
+
+    rows = await Service().select(None)
+
+    assert rows[0].owner.title == "e"
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT * FROM t WHERE id=5 AND name='it''s' AND pk IN (1,2,3)"
+    ) == normalize_sql("SELECT * FROM t WHERE id=7 AND name='x' AND pk IN (4)")
+
+
+@pytest.mark.asyncio
+async def test_n_plus_one_detector_logs_repeated_queries(orm, caplog):
+    record_queries(SqliteClient)
+    events = [await Event.create(title=f"e{i}", rank=i) for i in range(3)]
+
+    with caplog.at_level(logging.WARNING, logger="tortoise"):
+        with detect_n_plus_one(2, "GET /events") as queries:
+            for event in events:
+                await CompactItem.filter(owner_id=event.id)
+            await Event.all()
+
+    assert sorted(queries.values()) == [1, 3]
+    assert "Possible N+1 in GET /events: 3 similar queries" in caplog.text
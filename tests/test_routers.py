@@ -0,0 +1,110 @@
+import pytest
+import pytest_asyncio
+from tortoise import Tortoise, connections
+from tortoise.exceptions import ConfigurationError
+from tortoise.transactions import in_transaction
+from tortoise.utils import get_schema_sql
+
+from fastapi_manager.db.connection import DBConnector
+from fastapi_manager.db.routers import (
+    LEAST_OUTSTANDING,
+    ReplicaRouter,
+    ReplicaSet,
+    configure_replicas,
+    primary_after_write,
+)
+from tests.db.models import MODELS, Item
+
+MEMORY = {
+    "engine": "tortoise.backends.sqlite",
+    "credentials": {"file_path": ":memory:"},
+}
+
+
+@pytest_asyncio.fixture
+async def replicated_orm():
+    """
+    Primary and two replicas, separate in memory databases,
+    each replica has one item named after its alias
+    """
+    config, replicas = DBConnector._get_connections_config(
+        {"default": {**MEMORY, "replicas": [MEMORY, MEMORY]}}
+    )
+    await connections._init(config, False)
+    configure_replicas(replicas)
+    Tortoise._init_routers([ReplicaRouter])
+    Tortoise.apps = {"tests": {model.__name__: model for model in MODELS}}
+    for model in MODELS:
+        model._meta.default_connection = "default"
+    Tortoise._init_relations()
+    Tortoise._build_initial_querysets()
+    Tortoise._inited = True
+    await Tortoise.generate_schemas()
+    schema = get_schema_sql(connections.get("default"), safe=False)
+    for alias in replicas["default"].aliases:
+        await connections.get(alias).execute_script(schema)
+        await Item.create(name=alias, using_db=connections.get(alias))
+    yield replicas["default"]
+    await connections.close_all()
+    connections._db_config = None
+    configure_replicas({})
+    Tortoise._init_routers(None)
+    Tortoise.apps = {}
+    Tortoise._inited = False
+
+
+def test_connections_config_with_replicas():
+    config, replicas = DBConnector._get_connections_config(
+        {
+            "default": {**MEMORY, "replicas": ["sqlite://:memory:"]},
+            "other": "sqlite://:memory:",
+        }
+    )
+
+    assert set(config) == {"default", "default_replica_0", "other"}
+    assert "replicas" not in config["default"]
+    assert replicas["default"].aliases == ["default_replica_0"]
+    with pytest.raises(ConfigurationError):
+        DBConnector._get_connections_config(
+            {"default": {**MEMORY, "replicas": [MEMORY], "balancer": "random"}}
+        )
+
+
+@pytest.mark.asyncio
+async def test_reads_are_balanced_between_replicas(replicated_orm):
+    await Item.create(name="primary")
+
+    names = [(await Item.first()).name for _ in range(4)]
+
+    assert names == ["default_replica_0", "default_replica_1"] * 2
+    assert await Item.filter(name="primary").count() == 0
+
+
+@pytest.mark.asyncio
+async def test_request_reads_primary_after_write(replicated_orm):
+    with primary_after_write() as written:
+        assert (await Item.first()).name.startswith("default_replica")
+        await Item.create(name="primary")
+        assert (await Item.first()).name == "primary"
+        assert await Item.filter(name="primary").exists()
+
+    assert written == {"default"}
+    assert not await Item.filter(name="primary").exists()
+
+
+@pytest.mark.asyncio
+async def test_transaction_reads_primary(replicated_orm):
+    await Item.create(name="primary")
+
+    async with in_transaction("default"):
+        assert (await Item.first()).name == "primary"
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_balancer(replicated_orm):
+    replica_set = ReplicaSet(replicated_orm.aliases, LEAST_OUTSTANDING)
+    configure_replicas({"default": replica_set})
+    replica_set.outstanding["default_replica_0"] = 1
+
+    assert (await Item.first()).name == "default_replica_1"
+    assert replica_set.outstanding == {"default_replica_0": 1, "default_replica_1": 0}
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+
+from fastapi_manager.schemas import SchemaRegistry, schemas
+from tortoise.contrib.pydantic import pydantic_model_creator
+
+from tests.db.models import Event, Item, Product
+
+
+@pytest.fixture
+def registry():
+    schemas.clear()
+    yield schemas
+    schemas.clear()
+
+
+def test_registry_is_singleton():
+    assert SchemaRegistry() is schemas
+
+
+def test_schema_is_built_once(orm, registry):
+    first = registry.get(Item)
+
+    assert registry.get(Item) is first
+    assert registry.get(Event) is not first
+    assert registry.stats() == {"schemas": 2, "built": 2, "reused": 1}
+
+
+def test_schema_key_includes_options(orm, registry):
+    full = registry.get(Item)
+    short = registry.get(Item, exclude=("qty",))
+
+    assert short is not full
+    assert "qty" not in short.model_fields
+    assert registry.get(Item, exclude=["qty"]) is short
+
+
+def test_describe_is_cached_after_init(orm, registry):
+    with patch.object(Item, "_describe", wraps=Item._describe) as describe:
+        first = Item.describe()
+        assert first == Item.describe() and first is not Item.describe()
+        registry.get(Item, include=("name",))
+
+    # serializable=True and serializable=False for pydantic_model_creator
+    assert describe.call_count == 2
+
+
+def test_describe_is_not_cached_before_init(registry):
+    with patch.object(Item._meta, "_inited", False):
+        assert Item.describe() is not Item.describe()
+
+
+def test_described_readonly_fields_survive_schema_builds(orm, registry):
+    registry.get(Product)
+    registry.get(Product, exclude=("tags",))
+
+    fields = {field["name"]: field for field in Product.describe()["data_fields"]}
+    assert fields["created_at"]["constraints"]["readOnly"]
+    schema = pydantic_model_creator(Product, name="ProductIn", exclude_readonly=True)
+    assert "created_at" not in schema.model_fields
@@ -0,0 +1,45 @@
+import json
+from decimal import Decimal
+
+import pytest
+from tortoise.exceptions import ConfigurationError
+
+from fastapi_manager.schemas import schemas
+from fastapi_manager.serializers import ModelSerializer, build_encoder
+from tests.db.models import Item, Kind, Product
+
+
+@pytest.mark.asyncio
+async def test_serializer_matches_pydantic_output(orm):
+    await Product.create(name="a", price=Decimal("1.50"), kind=Kind.GAME, tags=["x"])
+    product = await Product.get(name="a")
+    schema = schemas.get(Product)
+
+    serializer = ModelSerializer(Product, schema)
+
+    assert json.loads(serializer.dumps_row(product)) == json.loads(
+        schema.model_validate(product).model_dump_json()
+    )
+
+
+@pytest.mark.asyncio
+async def test_serializer_encodes_lists_and_envelopes(orm):
+    items = [await Item.create(name=f"item{i}", qty=i) for i in range(3)]
+    serializer = ModelSerializer(Item, schemas.get(Item))
+
+    data = json.loads(serializer.dumps({"results": items, "next": None}))
+
+    assert data == {
+        "results": [{"id": i.id, "name": i.name, "qty": i.qty} for i in items],
+        "next": None,
+    }
+
+
+def test_encoder_is_built_once_per_field_set(orm):
+    assert build_encoder(Item, ("id", "name")) is build_encoder(Item, ("id", "name"))
+    assert build_encoder(Item, ("id",)) is not build_encoder(Item, ("id", "name"))
+
+
+def test_encoder_rejects_not_db_fields(orm):
+    with pytest.raises(ConfigurationError):
+        build_encoder(Item, ("id", "something"))
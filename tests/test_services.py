@@ -0,0 +1,125 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+from tortoise.signals import Signals
+
+from fastapi_manager.services import BaseService
+from tests.conftest import count_queries
+from tests.db.models import Article, Item
+
+
+class ItemService(BaseService[Item]):
+    model = Item
+
+
+class ArticleService(BaseService[Article]):
+    model = Article
+
+
+class InStockService(ItemService):
+    def get_queryset(self, request):
+        return self.model.filter(qty__gt=0)
+
+
+class ForbiddenService(ItemService):
+    async def get(self, pk, request):
+        raise HTTPException(status_code=403)
+
+
+@pytest.mark.asyncio
+async def test_update_is_single_statement(orm):
+    item = await Item.create(name="item", qty=1)
+
+    with count_queries() as execute_query:
+        updated = await ItemService().update(
+            item.id, {"id": 100, "qty": 2, "unknown": 1}, request=None
+        )
+
+    assert execute_query.call_count == 1
+    assert "RETURNING" in execute_query.call_args.args[1]
+    assert (updated.id, updated.name, updated.qty) == (item.id, "item", 2)
+    assert (await Item.get(pk=item.id)).qty == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_is_single_statement(orm):
+    item = await Item.create(name="item")
+
+    with count_queries() as execute_query:
+        deleted = await ItemService().delete(item.id, request=None)
+
+    assert execute_query.call_count == 1
+    assert deleted.name == "item"
+    assert not await Item.exists(pk=item.id)
+
+
+@pytest.mark.asyncio
+async def test_missing_row_is_not_found(orm):
+    service = ItemService()
+
+    for write in (service.update(1, {"qty": 1}, None), service.delete(1, None)):
+        with pytest.raises(HTTPException) as error:
+            await write
+        assert error.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_scoped_service_writes_only_its_rows(orm):
+    hidden = await Item.create(name="hidden", qty=0)
+    item = await Item.create(name="item", qty=1)
+    service = InStockService()
+
+    for write in (
+        service.update(hidden.id, {"name": "changed"}, None),
+        service.update(hidden.id, {}, None),
+        service.delete(hidden.id, None),
+    ):
+        with pytest.raises(HTTPException) as error:
+            await write
+        assert error.value.status_code == 404
+    for write in (
+        ForbiddenService().update(item.id, {"name": "changed"}, None),
+        ForbiddenService().delete(item.id, None),
+    ):
+        with pytest.raises(HTTPException) as error:
+            await write
+        assert error.value.status_code == 403
+
+    assert (await service.update(item.id, {"qty": 2}, None)).qty == 2
+    await service.delete(item.id, None)
+    assert await Item.all().values_list("name", flat=True) == ["hidden"]
+
+
+@pytest.mark.asyncio
+async def test_save_listeners_fall_back_to_save(orm):
+    item = await Item.create(name="item", qty=1)
+    listener = AsyncMock()
+    Item.register_listener(Signals.post_save, listener)
+    try:
+        updated = await ItemService().update(item.id, {"qty": 2}, request=None)
+    finally:
+        Item._listeners[Signals.post_save].pop(Item)
+
+    listener.assert_awaited_once()
+    assert listener.await_args.args[-1] == ["qty"]
+    assert updated.qty == 2
+
+
+@pytest.mark.asyncio
+async def test_update_refreshes_auto_now_fields(orm):
+    article = await Article.create(title="a")
+    service = ArticleService()
+
+    updated = await service.update(article.id, {"title": "b"}, request=None)
+    assert updated.modified_at > article.modified_at
+    assert (await Article.get(pk=article.id)).modified_at == updated.modified_at
+
+    listener = AsyncMock()
+    Article.register_listener(Signals.post_save, listener)
+    try:
+        saved = await service.update(article.id, {"title": "c"}, request=None)
+    finally:
+        Article._listeners[Signals.post_save].pop(Article)
+    assert saved.modified_at > updated.modified_at
+    assert sorted(listener.await_args.args[-1]) == ["modified_at", "title"]
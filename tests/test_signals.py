@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from fastapi_manager.db import signals
+from fastapi_manager.db.signals import (
+    BatchSignals,
+    each_instance,
+    gather_limited,
+    post_bulk_delete,
+    post_bulk_save,
+    pre_bulk_delete,
+    pre_bulk_save,
+)
+from tests.db.models import Invoice, Item
+
+
+@pytest_asyncio.fixture
+async def calls(orm):
+    calls = []
+
+    async def record(name, sender, instances, *args):
+        calls.append((name, sender, sorted(i.name for i in instances), args[-1]))
+
+    @pre_bulk_save(Item)
+    async def pre_save(sender, instances, using_db, update_fields):
+        await record("pre_save", sender, instances, update_fields)
+
+    @post_bulk_save(Item)
+    async def post_save(sender, instances, created, using_db, update_fields):
+        await record("post_save", sender, instances, (created, update_fields))
+
+    @pre_bulk_delete(Item)
+    async def pre_delete(sender, instances, using_db):
+        await record("pre_delete", sender, instances, None)
+
+    @post_bulk_delete(Item)
+    async def post_delete(sender, instances, using_db):
+        await record("post_delete", sender, instances, None)
+
+    yield calls
+    for listeners in signals._batch_listeners.values():
+        listeners.pop(Item, None)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_sends_batch(calls):
+    await Item.bulk_create([Item(name="a"), Item(name="b")])
+
+    assert calls == [
+        ("pre_save", Item, ["a", "b"], None),
+        ("post_save", Item, ["a", "b"], (True, None)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_sends_batch(calls):
+    items = [await Item.create(name=name) for name in "ab"]
+    for item in items:
+        item.qty = 5
+
+    await Item.bulk_update(items, fields=["qty"])
+
+    assert calls == [
+        ("pre_save", Item, ["a", "b"], ["qty"]),
+        ("post_save", Item, ["a", "b"], (False, ["qty"])),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queryset_update_sends_matched_rows(calls):
+    for name in "abc":
+        await Item.create(name=name)
+
+    count = await Item.filter(name__in=["a", "b"]).update(qty=3)
+
+    assert count == 2
+    assert calls == [
+        ("pre_save", Item, ["a", "b"], ["qty"]),
+        ("post_save", Item, ["a", "b"], (False, ["qty"])),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queryset_update_post_save_gets_updated_rows(calls):
+    await Item.create(name="a")
+    seen = []
+
+    @post_bulk_save(Item)
+    async def qty(sender, instances, created, using_db, update_fields):
+        seen.extend(instance.qty for instance in instances)
+
+    await Item.filter(name="a").update(qty=7)
+
+    assert seen == [7]
+
+
+@pytest.mark.asyncio
+async def test_queryset_delete_sends_deleted_rows(calls):
+    for name in "abc":
+        await Item.create(name=name)
+
+    await Item.filter(name="c").delete()
+
+    assert calls == [
+        ("pre_delete", Item, ["c"], None),
+        ("post_delete", Item, ["c"], None),
+    ]
+    assert await Item.all().count() == 2
+
+
+@pytest.mark.asyncio
+async def test_without_listeners_queries_are_plain(orm):
+    # no listeners, no extra SELECT around statement
+    query = Item.filter(name="a").update(qty=1)
+    assert type(query).__name__ == "UpdateQuery"
+    query = Item.bulk_create([Item(name="a")])
+    assert type(query).__name__ == "BulkCreateQuery"
+
+
+@pytest.mark.asyncio
+async def test_each_instance_adapter(orm):
+    seen = []
+
+    async def on_saved(sender, instance, created, using_db, update_fields):
+        seen.append((instance.name, created))
+
+    post_bulk_save(Item)(each_instance(on_saved))
+    try:
+        await Item.bulk_create([Item(name="a"), Item(name="b")])
+    finally:
+        signals._batch_listeners[BatchSignals.post_save].pop(Item)
+
+    assert sorted(seen) == [("a", True), ("b", True)]
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_bounds_concurrency():
+    running = peak = 0
+
+    async def task(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return i
+
+    assert await gather_limited((task(i) for i in range(10)), 3) == list(range(10))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_async_defaults_resolved_before_pre_save(orm):
+    numbers = []
+
+    @pre_bulk_save(Invoice)
+    async def check(sender, instances, using_db, update_fields):
+        numbers.extend(instance.number for instance in instances)
+
+    try:
+        await Invoice.bulk_create([Invoice(), Invoice()])
+    finally:
+        signals._batch_listeners[BatchSignals.pre_save].pop(Invoice)
+
+    assert len(numbers) == 2 and None not in numbers
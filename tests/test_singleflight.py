@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from tortoise.transactions import in_transaction
+
+from fastapi_manager.db.singleflight import SingleFlightClient, single_flight
+from tests.conftest import count_queries
+from tests.db.models import Event, Item
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    single_flight.reset()
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_are_coalesced(orm):
+    await Event.create(title="a", rank=1)
+
+    with count_queries() as execute_query:
+        results = await asyncio.gather(*[Event.filter(rank__gte=1) for _ in range(3)])
+
+    assert execute_query.call_count == 1
+    assert single_flight.stats() == {"leaders": 1, "coalesced": 2}
+    # rows are shared, instances are not
+    assert [len(events) for events in results] == [1, 1, 1]
+    assert results[0][0] is not results[1][0]
+
+
+@pytest.mark.asyncio
+async def test_different_parameters_are_not_coalesced(orm):
+    await Event.create(title="a", rank=1)
+
+    with count_queries() as execute_query:
+        await asyncio.gather(Event.filter(rank=1), Event.filter(rank=2))
+
+    assert execute_query.call_count == 2
+    assert single_flight.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_and_opted_out_models_are_not_coalesced(orm):
+    event = await Event.create(title="a", rank=1)
+    await Item.create(name="a")
+
+    assert isinstance(Event.filter(id=event.id)._choose_db(), SingleFlightClient)
+    assert isinstance(Event.all()._db, SingleFlightClient)
+    assert not isinstance(Item.filter(name="a")._choose_db(), SingleFlightClient)
+
+    await asyncio.gather(
+        *[Event.filter(id=event.id).update(rank=2) for _ in range(2)],
+        Item.filter(name="a"),
+        Item.filter(name="a"),
+    )
+    assert single_flight.stats() == {"leaders": 0, "coalesced": 0}
+    assert (await Event.get(id=event.id)).rank == 2
+
+
+@pytest.mark.asyncio
+async def test_no_coalescing_in_transaction(orm):
+    async with in_transaction():
+        await Event.create(title="a", rank=1)
+        assert not isinstance(Event.filter(rank=1)._choose_db(), SingleFlightClient)
+        assert await Event.filter(rank=1).count() == 1
+
+    assert single_flight.leaders == 0
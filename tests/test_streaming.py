@@ -0,0 +1,136 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from tortoise.backends.asyncpg import AsyncpgDBClient
+from tortoise.exceptions import ConfigurationError
+from tortoise.queryset import QuerySet
+
+from fastapi_manager.db.iterators import iterate_chunks
+from fastapi_manager.responses import (
+    JSONArrayStreamingResponse,
+    ModelStreamingResponse,
+    NDJSONStreamingResponse,
+)
+from fastapi_manager.router import path
+from tests.conftest import EventViewSet
+from tests.db.models import CompactItem, Event, Item
+
+
+async def as_chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def read_body(response):
+    return b"".join([part async for part in response.body_iterator])
+
+
+def encode(row):
+    return json.dumps(row).encode()
+
+
+class StreamedEventViewSet(EventViewSet):
+    streaming_formats = ("ndjson",)
+    ordering_fields = ("rank", "id")
+
+
+@pytest_asyncio.fixture
+async def items(orm):
+    return [await Item.create(name=f"item{i}", qty=i) for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_iterate_chunks_by_pk_windows(items):
+    chunks = [chunk async for chunk in iterate_chunks(Item.filter(qty__gte=1), 3)]
+
+    assert [len(chunk) for chunk in chunks] == [3, 3]
+    assert [item.qty for chunk in chunks for item in chunk] == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_iterate_chunks_keeps_ordering(orm):
+    ranks = [5, 3, 3, 9, 1, 3, 7]
+    events = [await Event.create(title=f"e{i}", rank=r) for i, r in enumerate(ranks)]
+
+    # Meta.ordering is -rank, ties are walked by primary key
+    chunks = [chunk async for chunk in iterate_chunks(Event.all(), 2)]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+    titles = [event.title for chunk in chunks for event in chunk]
+    assert titles == "e3 e6 e0 e5 e2 e1 e4".split()
+
+    queryset = Event.filter(rank__lte=5).order_by("rank", "-id")
+    chunks = [chunk async for chunk in iterate_chunks(queryset, 2)]
+    assert [event.id for chunk in chunks for event in chunk] == [
+        events[i].id for i in (4, 5, 2, 1, 0)
+    ]
+
+    with pytest.raises(ConfigurationError):
+        await iterate_chunks(CompactItem.all().order_by("owner__rank"), 2).__anext__()
+
+
+@pytest.mark.asyncio
+async def test_stream_list_ordering(make_client):
+    client = await make_client(path("/events", StreamedEventViewSet))
+    for i, rank in enumerate([2, 9, 5]):
+        await Event.create(title=f"e{i}", rank=rank)
+
+    response = await client.get("/events/", params={"stream": "ndjson"})
+    titles = [json.loads(line)["title"] for line in response.text.splitlines()]
+    assert titles == ["e1", "e2", "e0"]
+
+    params = {"stream": "ndjson", "ordering": "rank"}
+    response = await client.get("/events/", params=params)
+    titles = [json.loads(line)["title"] for line in response.text.splitlines()]
+    assert titles == ["e0", "e2", "e1"]
+
+
+@pytest.mark.asyncio
+async def test_iterate_chunks_uses_server_side_cursor_on_asyncpg(orm):
+    cursor = MagicMock()
+    cursor.fetch = AsyncMock(
+        side_effect=[
+            [{"id": 1, "name": "a", "qty": 1}, {"id": 2, "name": "b", "qty": 2}],
+            [{"id": 3, "name": "c", "qty": 3}],
+            [],
+        ]
+    )
+    connection = MagicMock()
+    connection.cursor = AsyncMock(return_value=cursor)
+    db = MagicMock(spec=AsyncpgDBClient)
+    db.acquire_connection.return_value.__aenter__.return_value = connection
+
+    queryset = Item.all()
+    with patch.object(QuerySet, "_choose_db", return_value=db), patch.object(
+        QuerySet, "sql", return_value="SELECT ..."
+    ):
+        chunks = [chunk async for chunk in iterate_chunks(queryset, 2)]
+
+    assert [[item.name for item in chunk] for chunk in chunks] == [["a", "b"], ["c"]]
+    assert all(item._saved_in_db for chunk in chunks for item in chunk)
+    connection.transaction.assert_called_once()
+    connection.cursor.assert_awaited_once_with("SELECT ...")
+    cursor.fetch.assert_awaited_with(2)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_streaming_response():
+    response = NDJSONStreamingResponse(as_chunks([1, 2], [], [3]), encode)
+
+    assert response.media_type == "application/x-ndjson"
+    assert await read_body(response) == b"1\n2\n3\n"
+
+
+@pytest.mark.asyncio
+async def test_json_array_streaming_response():
+    response = JSONArrayStreamingResponse(as_chunks([{"a": 1}], [{"a": 2}]), encode)
+    assert json.loads(await read_body(response)) == [{"a": 1}, {"a": 2}]
+
+    empty = JSONArrayStreamingResponse(as_chunks(), encode)
+    assert await read_body(empty) == b"[]"
+
+
+def test_streaming_response_is_abstract():
+    with pytest.raises(TypeError):
+        ModelStreamingResponse(as_chunks(), encode)